@@ -0,0 +1,54 @@
+"""
+Per token cost of decoding and verifying a JWT token: the former path (header decoded by hand, then jwt.decode parsing
+the whole token again) versus the single pass pipeline of python_falcon_authenticator.utils_jwt.
+
+python -m benchmarks.jwt_decoding
+"""
+import json
+import time
+import timeit
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from python_falcon_authenticator.utils_cryptography import base64url_decode
+from python_falcon_authenticator.utils_jwt import parse_token, verify_signature, validate_claims
+
+AUDIENCE = "CliEnTiD"
+ISSUER = "https://oauth.auth.com/"
+
+
+def former_pipeline(token, public_key):
+    header64, _, _ = token.split(".")
+    json.loads(base64url_decode(header64))
+    return jwt.decode(token, public_key, audience=AUDIENCE, issuer=ISSUER, algorithms=['RS256'])
+
+
+def single_pass_pipeline(token, public_key):
+    parsed = parse_token(token)
+    verify_signature(parsed, public_key, ('RS256',))
+    validate_claims(parsed.payload, audience=AUDIENCE, issuer=ISSUER)
+    return parsed.payload
+
+
+def parse_only_pipeline(token, public_key):
+    return parse_token(token).payload
+
+
+def main(number: int = 2000, repeat: int = 5):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    public_key = private_key.public_key()
+    token = jwt.encode({'iss': ISSUER, 'aud': AUDIENCE, 'sub': "user", 'exp': int(time.time()) + 3600,
+                        'groups': [f"group-{i}" for i in range(50)]},
+                       private_key, algorithm='RS256', headers={'kid': "kid"})
+
+    results = {}
+    for pipeline in (former_pipeline, single_pass_pipeline, parse_only_pipeline):
+        timings = timeit.repeat(lambda: pipeline(token, public_key), number=number, repeat=repeat)
+        results[pipeline.__name__] = {'us_per_token': min(timings) / number * 1e6}
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
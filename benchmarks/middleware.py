@@ -0,0 +1,163 @@
+"""
+Per request overhead of the PythonFalconAuthenticator middleware, driving a falcon.App with falcon.testing: the skip
+path of resource_auth_config, Basic success and failure, JWT with warm and cold key caches, JWT with an unknown key
+id, and chains of several authenticators. JWKS are served by a local StubIdentityProvider.
+
+Results (throughput, p50/p99 latency per scenario) are printed, or written with --output, as JSON to be compared
+between versions.
+
+python -m benchmarks.middleware --requests 2000 --output middleware.json
+"""
+import argparse
+import base64
+import json
+import platform
+import statistics
+import sys
+import time
+
+import falcon
+import falcon.testing
+
+from python_falcon_authenticator import PythonFalconAuthenticator
+from python_falcon_authenticator.authenticators.jwt import Authenticator as JwtAuthenticator
+from python_falcon_authenticator.authenticators.static_basic import Authenticator as BasicAuthenticator
+from python_falcon_authenticator.decorators import resource_auth_config
+from python_falcon_authenticator.jwks import JwksKeyStore
+from python_falcon_authenticator.testing import StubIdentityProvider
+from python_falcon_authenticator.utils.route_requests_with_responder import RouterWithRequestResponder
+
+CLIENT_ID = "CliEnTiD"
+
+
+def basic(username, password):
+    return {'Authorization': 'Basic ' + base64.b64encode(f"{username}:{password}".encode('utf8')).decode('ascii')}
+
+
+def bearer(token):
+    return {'Authorization': f'Bearer {token}'}
+
+
+@resource_auth_config(skip_responders=['on_get_public'])
+class Resource:
+    def on_get(self, req, resp):
+        resp.media = {"hello": "world"}
+
+    def on_get_public(self, req, resp):
+        resp.media = {"hello": "world"}
+
+
+class Scenario:
+    """requests sent to one middleware configuration. prepare is called before each request, outside the timings"""
+    def __init__(self, name, authenticators, path, headers=None, expected_status=200, prepare=None):
+        self.name = name
+        self.path = path
+        self.headers = headers
+        self.expected_status = expected_status
+        self.prepare = prepare
+
+        app = falcon.App(middleware=[PythonFalconAuthenticator(authenticators)], router=RouterWithRequestResponder())
+        app.add_route("/resource", Resource())
+        app.add_route("/resource/public", Resource(), suffix="public")
+        self.client = falcon.testing.TestClient(app)
+
+    def request(self):
+        result = self.client.simulate_get(self.path, headers=self.headers)
+        if result.status_code != self.expected_status:
+            raise AssertionError(f"{self.name}: expected status {self.expected_status} but got {result.status}")
+
+    def run(self, requests: int, warmup: int) -> dict:
+        for _ in range(warmup):
+            if self.prepare:
+                self.prepare()
+            self.request()
+
+        latencies = []
+        for _ in range(requests):
+            if self.prepare:
+                self.prepare()
+            start = time.perf_counter()
+            self.request()
+            latencies.append(time.perf_counter() - start)
+
+        latencies.sort()
+        return {
+            'requests': requests,
+            'throughput_rps': requests / sum(latencies),
+            'mean_us': statistics.fmean(latencies) * 1e6,
+            'p50_us': percentile(latencies, 50) * 1e6,
+            'p99_us': percentile(latencies, 99) * 1e6,
+        }
+
+
+def percentile(sorted_values, p: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p / 100))]
+
+
+def scenarios(idp: StubIdentityProvider):
+    basic_authenticator = BasicAuthenticator(username="username", password="Passw0rd")
+    other_basic_authenticator = BasicAuthenticator(username="other", password="Passw0rd")
+
+    warm_jwt = JwtAuthenticator(client_id=CLIENT_ID, oauth_domain=idp.issuer)
+    warm_jwt.prewarm()
+    cold_jwt = JwtAuthenticator(client_id=CLIENT_ID, oauth_domain=idp.issuer)
+
+    def reset_key_store():
+        cold_jwt.key_store = JwksKeyStore(oidc_uri=idp.oidc_uri)
+
+    token = idp.issue_token(audience=CLIENT_ID, sub="user")
+    # signed with a key the identity provider never publishes
+    unknown_kid = idp.add_key()
+    unknown_kid_token = idp.issue_token(audience=CLIENT_ID, kid=unknown_kid, sub="user")
+    idp.private_keys.pop(unknown_kid)
+
+    return [
+        Scenario("skip", basic_authenticator, "/resource/public"),
+        Scenario("basic_success", basic_authenticator, "/resource", basic("username", "Passw0rd")),
+        Scenario("basic_failure", basic_authenticator, "/resource", basic("username", "wrong"), 401),
+        Scenario("jwt_warm", warm_jwt, "/resource", bearer(token)),
+        Scenario("jwt_cold", cold_jwt, "/resource", bearer(token), prepare=reset_key_store),
+        Scenario("jwt_unknown_kid", warm_jwt, "/resource", bearer(unknown_kid_token), 401),
+        Scenario("chain_basic_fallthrough", [basic_authenticator, other_basic_authenticator], "/resource",
+                 basic("other", "Passw0rd")),
+        Scenario("chain_basic_jwt", [basic_authenticator, other_basic_authenticator, warm_jwt], "/resource",
+                 bearer(token)),
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000, help="number of timed requests per scenario")
+    parser.add_argument('--warmup', type=int, default=100, help="number of untimed requests per scenario")
+    parser.add_argument('--cold-requests', type=int, default=100, help="number of timed requests of jwt_cold")
+    parser.add_argument('--scenario', action='append', help="only run the given scenario(s)")
+    parser.add_argument('--output', help="file the JSON results are written to, instead of stdout")
+    args = parser.parse_args(argv)
+
+    with StubIdentityProvider() as idp:
+        results = {}
+        for scenario in scenarios(idp):
+            if args.scenario and scenario.name not in args.scenario:
+                continue
+
+            # every cold request fetches the OIDC metadata and the JWKS from the stub
+            cold = scenario.prepare is not None
+            results[scenario.name] = scenario.run(args.cold_requests if cold else args.requests,
+                                                  min(args.warmup, 10) if cold else args.warmup)
+
+    report = {
+        'python': platform.python_version(),
+        'falcon': falcon.__version__,
+        'scenarios': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
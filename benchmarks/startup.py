@@ -0,0 +1,86 @@
+"""
+Startup cost of the package: import time and resident memory (max RSS) of a fresh interpreter importing and
+configuring each authenticator, along with the peer dependencies loaded at that point.
+
+python -m benchmarks.startup --runs 5 --output startup.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+
+PEER_DEPENDENCIES = ('falcon', 'jwt', 'cryptography', 'requests', 'httpx')
+
+# scenario => code run by the interpreter, timed after its own startup
+SCENARIOS = {
+    'baseline': "",
+    'falcon': "import falcon",
+    'package': "import python_falcon_authenticator",
+    'middleware': "from python_falcon_authenticator import PythonFalconAuthenticator",
+    'static_basic': "from python_falcon_authenticator.authenticators.static_basic import Authenticator\n"
+                    "Authenticator(username='username', password='Passw0rd')",
+    'jwt': "from python_falcon_authenticator.authenticators.jwt import Authenticator\n"
+           "Authenticator(client_id='CliEnTiD', oauth_domain='https://oauth.auth.com/')",
+    'jwt_verification_ready': "from python_falcon_authenticator.authenticators.jwt import Authenticator\n"
+                              "from python_falcon_authenticator.utils_cryptography import cryptography_tables\n"
+                              "from python_falcon_authenticator.utils_jwt import get_algorithms\n"
+                              "Authenticator(client_id='CliEnTiD', oauth_domain='https://oauth.auth.com/')"
+                              ".key_store.http_client\n"
+                              "get_algorithms(), cryptography_tables()",
+}
+
+PROBE = """
+import json, resource, sys, time
+started_at = time.perf_counter()
+exec(compile({code!r}, '<scenario>', 'exec'))
+seconds = time.perf_counter() - started_at
+max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+# kilobytes on Linux, bytes on macOS
+max_rss_mb = max_rss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+print(json.dumps({{'ms': seconds * 1000, 'max_rss_mb': max_rss_mb,
+                  'loaded': [name for name in {peer_dependencies!r} if name in sys.modules]}}))
+"""
+
+
+def measure(code: str) -> dict:
+    output = subprocess.run([sys.executable, '-c', PROBE.format(code=code, peer_dependencies=PEER_DEPENDENCIES)],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help="number of interpreters started per scenario")
+    parser.add_argument('--scenario', action='append', help="only run the given scenario(s)")
+    parser.add_argument('--output', help="file the JSON results are written to, instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, code in SCENARIOS.items():
+        if args.scenario and name not in args.scenario:
+            continue
+
+        runs = [measure(code) for _ in range(args.runs)]
+        results[name] = {
+            'import_ms': statistics.median(run['ms'] for run in runs),
+            'max_rss_mb': statistics.median(run['max_rss_mb'] for run in runs),
+            'loaded_peer_dependencies': runs[-1]['loaded'],
+        }
+
+    report = {
+        'python': platform.python_version(),
+        'scenarios': results,
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
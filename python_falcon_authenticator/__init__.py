@@ -1,3 +1,26 @@
-from .python_falcon_authenticator import PythonFalconAuthenticator
-from .authenticators import BaseAuthenticator
-from .resource_auth_config import ResourceAuthConfig
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .python_falcon_authenticator import PythonFalconAuthenticator
+    from .authenticators import BaseAuthenticator, BaseAsyncAuthenticator
+    from .resource_auth_config import ResourceAuthConfig
+
+# exported name => module, imported on first access
+_LAZY_EXPORTS = {
+    'PythonFalconAuthenticator': '.python_falcon_authenticator',
+    'BaseAuthenticator': '.authenticators',
+    'BaseAsyncAuthenticator': '.authenticators',
+    'ResourceAuthConfig': '.resource_auth_config',
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    from .utils.lazy_exports import load_lazy_export
+
+    return load_lazy_export(__name__, globals(), _LAZY_EXPORTS, name)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,120 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Mapping, Optional
+
+from .claims import VerifiedClaims
+
+logger = logging.getLogger(__name__)
+
+
+def hash_api_key(key: str) -> str:
+    """SHA-256 digest (hex) of an API key, as stored in an ApiKeyStore"""
+    return hashlib.sha256(key.encode('utf8')).hexdigest()
+
+
+def load_api_keys(path) -> dict:
+    """digest => VerifiedClaims index of a JSON file mapping SHA-256 digests (hex) of API keys to claims"""
+    with open(path, encoding='utf8') as f:
+        content = json.load(f)
+
+    if not isinstance(content, dict):
+        raise ValueError(f"Expected a JSON dictionary of API key digests in {path}")
+
+    index = {}
+    for digest, claims in content.items():
+        if not isinstance(claims, dict):
+            raise ValueError(f"Expected a JSON dictionary of claims for API key digest '{digest}' in {path}")
+        index[_digest_bytes(digest)] = VerifiedClaims(claims)
+
+    return index
+
+
+def _digest_bytes(digest: str) -> bytes:
+    try:
+        digest_bytes = bytes.fromhex(digest)
+    except (TypeError, ValueError):
+        digest_bytes = b''
+
+    if len(digest_bytes) != hashlib.sha256().digest_size:
+        raise ValueError(f"Malformed API key digest '{digest}': expected a SHA-256 hex digest")
+    return digest_bytes
+
+
+def _file_version(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class ApiKeyStore:
+    """
+    API keys, indexed by their SHA-256 digest, mapped to the claims of the client they identify. Looking up a key costs
+    one digest and one dict lookup whatever the number of keys, and only the digests of the keys are stored.
+
+    keys = ApiKeyStore.from_file("api_keys.json")  # {"<sha256 hex digest of the key>": {"sub": "billing"}, ...}
+    keys = ApiKeyStore.from_keys({"s3cr3t-k3y": {"sub": "billing", "scope": "invoices:read"}})
+    keys.watch(interval=5)  # reload the file in the background when it changes
+    """
+    def __init__(self, digests: Mapping[str, dict] = None, path: str = None):
+        # replaced as a whole on reload, so that a lookup sees either the former or the new keys
+        self.index = {_digest_bytes(digest): VerifiedClaims(claims) for digest, claims in (digests or {}).items()}
+        self.path = path
+        self._version = None
+        self._watcher = None
+        self._stop = threading.Event()
+
+    @classmethod
+    def from_file(cls, path) -> 'ApiKeyStore':
+        store = cls(path=path)
+        store._version = _file_version(path)
+        store.index = load_api_keys(path)
+        return store
+
+    @classmethod
+    def from_keys(cls, keys: Mapping[str, dict]) -> 'ApiKeyStore':
+        return cls({hash_api_key(key): claims for key, claims in keys.items()})
+
+    def lookup(self, key: str) -> Optional[VerifiedClaims]:
+        """claims of the client identified by an API key, or None for an unknown key"""
+        # only the digest of the key drives the lookup, so its timing tells nothing usable about the stored keys
+        return self.index.get(hashlib.sha256(key.encode('utf8')).digest())
+
+    def reload(self) -> bool:
+        """reload the file of the store if it changed since it was loaded. A file that can't be loaded is ignored"""
+        try:
+            version = _file_version(self.path)
+            if version == self._version:
+                return False
+
+            index = load_api_keys(self.path)
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable API keys file %s: %s", self.path, e)
+            return False
+
+        self.index, self._version = index, version
+        return True
+
+    def watch(self, interval: float = 5) -> 'ApiKeyStore':
+        """reload the file of the store every `interval` seconds, from a background thread, when it changes"""
+        assert self.path is not None, "Only a store loaded from a file can be watched"
+
+        if self._watcher is None:
+            self._stop.clear()
+            self._watcher = threading.Thread(target=self._watch, args=(interval,), daemon=True)
+            self._watcher.start()
+        return self
+
+    def stop(self):
+        if self._watcher is not None:
+            self._stop.set()
+            self._watcher.join()
+            self._watcher = None
+
+    def _watch(self, interval: float):
+        while not self._stop.wait(interval):
+            self.reload()
+
+    def __len__(self):
+        return len(self.index)
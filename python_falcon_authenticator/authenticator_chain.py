@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable, Optional
+
+import falcon
+
+from .authenticators.base_async_authenticator import BaseAsyncAuthenticator
+from .authenticators.base_authenticator import get_authorization_header, parse_authorization_header
+from .authenticators.scheme_authenticator import SchemeAuthenticator
+from .instrumentation import Instrumentation, NO_INSTRUMENTATION
+
+if TYPE_CHECKING:
+    from .python_falcon_authenticator import Authenticator
+
+# How a candidate authenticator is called
+_CALL_AUTHENTICATE = 0
+_CALL_AUTHENTICATE_CREDENTIALS = 1
+_CALL_AUTHENTICATE_ASYNC = 2
+_CALL_AUTHENTICATE_CREDENTIALS_ASYNC = 3
+
+
+class AuthenticatorChain:
+    """
+    Ordered authenticators, indexed by the Authorization scheme they handle.
+
+    The Authorization header is parsed once per request, and only the authenticators handling its scheme (plus the
+    ones not bound to any scheme) are tried, in order. A request that fails is rejected with the error the first
+    authenticator of the chain would have raised, as if every authenticator had been tried.
+    """
+    def __init__(self, authenticators: Iterable[Authenticator]):
+        self.authenticators = tuple(authenticators)
+        self.instrumentation = NO_INSTRUMENTATION
+
+        schemes = {scheme for authenticator in self.authenticators if isinstance(authenticator, SchemeAuthenticator)
+                   for scheme in authenticator.schemes}
+        self._by_scheme = {scheme: self._index(scheme) for scheme in schemes}
+        # missing Authorization header, or scheme not handled by any authenticator
+        self._fallback = self._index(None)
+
+    def authenticate(self, req, resp, resource, params) -> bool:
+        with self.instrumentation.stage(req, 'header'):
+            scheme, credentials = self._parse(req)
+        candidates, first_skipped = self._by_scheme.get(scheme, self._fallback)
+
+        error_position, error = None, None
+        for position, authenticator, call in candidates:
+            try:
+                if call == _CALL_AUTHENTICATE_CREDENTIALS or call == _CALL_AUTHENTICATE_CREDENTIALS_ASYNC:
+                    authenticated = authenticator.authenticate_credentials(req, resp, resource, params, credentials)
+                else:
+                    authenticated = authenticator.authenticate(req, resp, resource, params)
+
+                if authenticated:
+                    return True
+            except (falcon.HTTPUnauthorized, falcon.HTTPForbidden) as e:
+                if error is None:
+                    error_position, error = position, e
+
+        self._raise_first_error(scheme, first_skipped, error_position, error)
+        return False
+
+    async def authenticate_async(self, req, resp, resource, params) -> bool:
+        with self.instrumentation.stage(req, 'header'):
+            scheme, credentials = self._parse(req)
+        candidates, first_skipped = self._by_scheme.get(scheme, self._fallback)
+
+        error_position, error = None, None
+        for position, authenticator, call in candidates:
+            try:
+                if call == _CALL_AUTHENTICATE_CREDENTIALS_ASYNC:
+                    authenticated = await authenticator.authenticate_credentials_async(
+                        req, resp, resource, params, credentials)
+                elif call == _CALL_AUTHENTICATE_ASYNC:
+                    authenticated = await authenticator.authenticate_async(req, resp, resource, params)
+                elif call == _CALL_AUTHENTICATE_CREDENTIALS:
+                    authenticated = authenticator.authenticate_credentials(req, resp, resource, params, credentials)
+                else:
+                    authenticated = authenticator.authenticate(req, resp, resource, params)
+
+                if authenticated:
+                    return True
+            except (falcon.HTTPUnauthorized, falcon.HTTPForbidden) as e:
+                if error is None:
+                    error_position, error = position, e
+
+        self._raise_first_error(scheme, first_skipped, error_position, error)
+        return False
+
+    def set_instrumentation(self, instrumentation: Instrumentation):
+        """instrument the chain and each of its authenticators"""
+        self.instrumentation = instrumentation
+        for authenticator in self.authenticators:
+            if hasattr(authenticator, 'set_instrumentation'):
+                authenticator.set_instrumentation(instrumentation)
+
+    @staticmethod
+    def _parse(req):
+        authorization = get_authorization_header(req)
+        if authorization is None:
+            return None, None
+
+        return parse_authorization_header(authorization)
+
+    def _index(self, scheme: Optional[str]):
+        """authenticators to try for a scheme, with the position of the first authenticator skipped (if any)"""
+        candidates, first_skipped = [], None
+        for position, authenticator in enumerate(self.authenticators):
+            is_async = isinstance(authenticator, BaseAsyncAuthenticator)
+
+            if not isinstance(authenticator, SchemeAuthenticator):
+                call = _CALL_AUTHENTICATE_ASYNC if is_async else _CALL_AUTHENTICATE
+            elif scheme in authenticator.schemes:
+                call = _CALL_AUTHENTICATE_CREDENTIALS_ASYNC \
+                    if is_async and hasattr(authenticator, 'authenticate_credentials_async') \
+                    else _CALL_AUTHENTICATE_CREDENTIALS
+            else:
+                if first_skipped is None:
+                    first_skipped = position
+                continue
+
+            candidates.append((position, authenticator, call))
+
+        return tuple(candidates), first_skipped
+
+    def _raise_first_error(self, scheme, first_skipped, error_position, error):
+        # a skipped authenticator would have rejected the scheme of the request
+        if first_skipped is not None and (error is None or first_skipped < error_position):
+            raise self.authenticators[first_skipped].scheme_error(scheme)
+
+        if error is not None:
+            raise error
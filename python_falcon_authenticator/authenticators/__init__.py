@@ -1 +1,26 @@
-from .base_authenticator import BaseAuthenticator
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .base_authenticator import BaseAuthenticator
+    from .base_async_authenticator import BaseAsyncAuthenticator
+    from .scheme_authenticator import SchemeAuthenticator
+
+# exported name => module, imported on first access. Authenticators themselves are imported from their own module
+# (e.g. python_falcon_authenticator.authenticators.jwt), along with their peer dependencies
+_LAZY_EXPORTS = {
+    'BaseAuthenticator': '.base_authenticator',
+    'BaseAsyncAuthenticator': '.base_async_authenticator',
+    'SchemeAuthenticator': '.scheme_authenticator',
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    from ..utils.lazy_exports import load_lazy_export
+
+    return load_lazy_export(__name__, globals(), _LAZY_EXPORTS, name)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,78 @@
+from typing import Iterable, Optional
+
+import falcon
+
+from .base_authenticator import BaseAuthenticator
+from .error_codes import EMPTY_AUTHORIZATION_HEADER_CREDENTIALS, MISSING_AUTHORIZATION_HEADER, WRONG_CREDENTIALS
+from .jwt import default_context_builder
+from .scheme_authenticator import SchemeAuthenticator
+from ..api_key_store import ApiKeyStore
+from ..claims import CLAIMS_CONTEXT_ATTR
+
+
+class ApiKeyVerification:
+    """lookup of API keys in an ApiKeyStore, shared by the API key authenticators"""
+    def __init__(self, keys: ApiKeyStore = None, keys_path: str = None, reload_interval: Optional[float] = 5,
+                 context_builder=None):
+        if (keys is None) == (keys_path is None):
+            raise ValueError("Either an API key store or the path of a keys file is required, but not both")
+
+        # an empty store is a store all the same
+        self.keys = keys if keys is not None else ApiKeyStore.from_file(keys_path)
+        if keys_path is not None and reload_interval:
+            self.keys.watch(reload_interval)
+        self.context_builder = context_builder or default_context_builder
+
+    def verify_api_key(self, req, key: Optional[str]) -> bool:
+        if not key:
+            raise falcon.HTTPUnauthorized(title="API key is empty", code=EMPTY_AUTHORIZATION_HEADER_CREDENTIALS)
+
+        with self.instrumentation.stage(req, 'verify'):
+            verified = self.keys.lookup(key)
+        if verified is None:
+            raise falcon.HTTPUnauthorized(title="Unknown API key", code=WRONG_CREDENTIALS)
+
+        with self.instrumentation.stage(req, 'context_builder'):
+            self.context_builder(req.context, verified.payload)
+        setattr(req.context, CLAIMS_CONTEXT_ATTR, verified)
+        return True
+
+
+class Authenticator(ApiKeyVerification, SchemeAuthenticator):
+    """
+    Authenticator of the API keys held by the Authorization header (`Authorization: ApiKey <key>`)
+
+    Authenticator(keys_path="api_keys.json")
+    """
+    schemes = ('apikey',)
+
+    def __init__(self, keys: ApiKeyStore = None, keys_path: str = None, reload_interval: Optional[float] = 5,
+                 context_builder=None, schemes: Iterable[str] = None):
+        super().__init__(keys, keys_path, reload_interval, context_builder)
+        if schemes is not None:
+            self.schemes = tuple(scheme.lower() for scheme in schemes)
+
+    def authenticate_credentials(self, req, resp, resource, params, credentials: str) -> bool:
+        return self.verify_api_key(req, credentials)
+
+
+class HeaderAuthenticator(ApiKeyVerification, BaseAuthenticator):
+    """
+    Authenticator of the API keys held by a dedicated header
+
+    HeaderAuthenticator(keys_path="api_keys.json", header="X-API-Key")
+    """
+    def __init__(self, keys: ApiKeyStore = None, keys_path: str = None, reload_interval: Optional[float] = 5,
+                 context_builder=None, header: str = "X-API-Key"):
+        super().__init__(keys, keys_path, reload_interval, context_builder)
+        self.header = header
+
+    def authenticate(self, req, resp, resource, params) -> bool:
+        # WSGI (upper case header names) or ASGI (lower case header names) request
+        key = req.headers.get(self.header.upper())
+        if key is None:
+            key = req.headers.get(self.header.lower())
+        if key is None:
+            raise falcon.HTTPUnauthorized(title=f"Missing {self.header} Header", code=MISSING_AUTHORIZATION_HEADER)
+
+        return self.verify_api_key(req, key.strip())
@@ -1,10 +1,29 @@
+from typing import Iterable
+
 from .jwt import Authenticator as JwtAuthenticator
+from .multi_issuer import Authenticator as MultiIssuerAuthenticator
+
+DEFAULT_OAUTH_DOMAIN_TEMPLATE = "https://login.microsoftonline.com/${TENANT_ID}/v2.0"
 
 
 class Authenticator(JwtAuthenticator):
-    DEFAULT_OAUTH_DOMAIN_TEMPLATE = "https://login.microsoftonline.com/${TENANT_ID}/v2.0"
+    DEFAULT_OAUTH_DOMAIN_TEMPLATE = DEFAULT_OAUTH_DOMAIN_TEMPLATE
 
     def __init__(self, tenant_id, **kwargs):
         oauth_domain = self.DEFAULT_OAUTH_DOMAIN_TEMPLATE.replace('${TENANT_ID}', str(tenant_id))
 
         super().__init__(oauth_domain=oauth_domain, **kwargs)
+
+
+class MultiTenantAuthenticator(MultiIssuerAuthenticator):
+    """
+    Azure Active Directory authenticator of the tokens of several tenants: the given `tenant_ids` only, or any tenant
+    if None
+    """
+    DEFAULT_OAUTH_DOMAIN_TEMPLATE = DEFAULT_OAUTH_DOMAIN_TEMPLATE
+
+    def __init__(self, client_id, tenant_ids: Iterable[str] = None, **kwargs):
+        tenant_ids = None if tenant_ids is None else frozenset(map(str, tenant_ids))
+
+        super().__init__(client_id, issuer_templates=[self.DEFAULT_OAUTH_DOMAIN_TEMPLATE],
+                         tenant_filter=None if tenant_ids is None else tenant_ids.__contains__, **kwargs)
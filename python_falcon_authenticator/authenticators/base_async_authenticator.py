@@ -0,0 +1,14 @@
+from abc import ABC, abstractmethod
+
+from ..instrumentation import Instrumentation, NO_INSTRUMENTATION
+
+
+class BaseAsyncAuthenticator(ABC):
+    instrumentation: Instrumentation = NO_INSTRUMENTATION
+
+    def set_instrumentation(self, instrumentation: Instrumentation):
+        self.instrumentation = instrumentation
+
+    @abstractmethod
+    async def authenticate_async(self, req, resp, resource, params) -> bool:
+        pass
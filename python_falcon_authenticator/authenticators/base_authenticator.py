@@ -1,7 +1,28 @@
 from abc import ABC, abstractmethod
+from typing import Optional, Tuple
+
+from ..instrumentation import Instrumentation, NO_INSTRUMENTATION
+
+
+def get_authorization_header(req) -> Optional[str]:
+    """Authorization header of a WSGI (upper case header names) or ASGI (lower case header names) request"""
+    headers = req.headers
+    authorization = headers.get('AUTHORIZATION')
+    return headers.get('authorization') if authorization is None else authorization
+
+
+def parse_authorization_header(authorization: str) -> Tuple[str, str]:
+    """split an Authorization header into its lower cased scheme and its credentials"""
+    scheme, _, credentials = authorization.strip().partition(' ')
+    return scheme.lower(), credentials.strip()
 
 
 class BaseAuthenticator(ABC):
+    instrumentation: Instrumentation = NO_INSTRUMENTATION
+
+    def set_instrumentation(self, instrumentation: Instrumentation):
+        self.instrumentation = instrumentation
+
     @abstractmethod
     def authenticate(self, req, resp, resource, params) -> bool:
         pass
@@ -3,3 +3,13 @@ UNEXPECTED_AUTHORIZATION_HEADER_TYPE = "e00002"
 EMPTY_AUTHORIZATION_HEADER_CREDENTIALS = "e00003"
 BAD_AUTHORIZATION_HEADER_CREDENTIALS = "e00004"
 WRONG_CREDENTIALS = "e00005"
+BAD_TOKEN_FORMAT = "e00006"
+UNEXPECTED_TOKEN_ALGORITHM = "e00007"
+UNKNOWN_TOKEN_KEY = "e00008"
+BAD_TOKEN_SIGNATURE = "e00009"
+EXPIRED_TOKEN = "e00010"
+BAD_TOKEN_CLAIMS = "e00011"
+UNKNOWN_TOKEN_ISSUER = "e00012"
+INACTIVE_TOKEN = "e00013"
+INSUFFICIENT_SCOPE = "e00014"
+TOO_MANY_FAILED_ATTEMPTS = "e00015"
@@ -0,0 +1,123 @@
+import hashlib
+import time
+
+import falcon
+
+from .error_codes import EMPTY_AUTHORIZATION_HEADER_CREDENTIALS, INACTIVE_TOKEN, BAD_TOKEN_CLAIMS
+from .jwt import default_context_builder
+from .scheme_authenticator import SchemeAuthenticator
+from ..claims import CLAIMS_CONTEXT_ATTR, VerifiedClaims
+from ..http_client import HttpClient, IdpRequestError, default_http_client
+from ..utils.optional_dependencies import require
+from ..utils.single_flight import SingleFlight
+from ..utils.ttl_lru_cache import TtlLruCache
+
+# cached introspection result of a token that isn't active
+_INACTIVE = False
+
+
+class Authenticator(SchemeAuthenticator):
+    """
+    Authenticator of (opaque) bearer tokens validated by the (RFC 7662) introspection endpoint of an identity provider.
+
+    The claims of an active token are cached until the token expires (`exp`), at most `cache_max_ttl` seconds, and
+    inactive tokens are remembered `inactive_cache_ttl` seconds. Concurrent introspections of a same token are
+    collapsed into a single request.
+
+    > Following peer dependency is required to use that authenticator:
+    > * [requests](https://pypi.org/project/requests/)
+    """
+    schemes = ('bearer',)
+
+    def __init__(self, introspection_uri: str, client_id: str = None, client_secret: str = None, audience: str = None,
+                 context_builder=None, cache_size: int = 4096, cache_max_ttl: float = 300,
+                 inactive_cache_ttl: float = 10, token_type_hint: str = "access_token",
+                 http_client: HttpClient = None):
+        require('requests', feature="Introspection authenticator")
+
+        self.introspection_uri = introspection_uri
+        # client_secret_basic authentication of this resource server
+        self.auth = (client_id, client_secret) if client_id is not None else None
+        self.audience = audience
+        self.context_builder = context_builder or default_context_builder
+        self.token_type_hint = token_type_hint
+        self._http_client = http_client
+
+        # token digest => claims of an active token, or _INACTIVE
+        self.cache = TtlLruCache(cache_size) if cache_size else None
+        self.cache_max_ttl = cache_max_ttl
+        self.inactive_cache_ttl = inactive_cache_ttl
+        self.introspections = SingleFlight()
+
+    @property
+    def http_client(self) -> HttpClient:
+        if self._http_client is None:
+            self._http_client = default_http_client()
+        return self._http_client
+
+    def authenticate_credentials(self, req, resp, resource, params, credentials: str) -> bool:
+        if not credentials:
+            raise falcon.HTTPUnauthorized(title="Authorization Bearer token is empty",
+                                          code=EMPTY_AUTHORIZATION_HEADER_CREDENTIALS)
+
+        verified = self.get_claims(req, credentials)
+        if verified is _INACTIVE:
+            raise falcon.HTTPUnauthorized(title="Token is not active", code=INACTIVE_TOKEN)
+        self.validate_audience(verified.payload.get('aud'))
+
+        with self.instrumentation.stage(req, 'context_builder'):
+            self.context_builder(req.context, verified.payload)
+        setattr(req.context, CLAIMS_CONTEXT_ATTR, verified)
+        return True
+
+    def get_claims(self, req, token: str):
+        """VerifiedClaims of an active token, or _INACTIVE"""
+        token_digest = hashlib.sha256(token.encode('utf8')).digest()
+
+        if self.cache is not None:
+            claims = self.cache.get(token_digest)
+            self.instrumentation.increment('auth_cache_total', cache='introspection',
+                                           result='miss' if claims is None else 'hit')
+            if claims is not None:
+                return claims
+
+        with self.instrumentation.stage(req, 'introspection'):
+            return self.introspections.do(token_digest, lambda: self.introspect(token_digest, token))
+
+    def introspect(self, token_digest: bytes, token: str):
+        data = {'token': token}
+        if self.token_type_hint:
+            data['token_type_hint'] = self.token_type_hint
+
+        body, _ = self.http_client.post_form(self.introspection_uri, data, auth=self.auth,
+                                             error_title="Failed to introspect token")
+        if not isinstance(body, dict):
+            raise IdpRequestError(title="Failed to introspect token",
+                                  description=f"Expected a JSON dictionary from {self.introspection_uri} but got: "
+                                              f"{str(body)[:1000]}")
+
+        now = time.time()
+        exp = body.get('exp')
+        if body.get('active') is not True or (isinstance(exp, (int, float)) and exp <= now):
+            self.cache_claims(token_digest, _INACTIVE, now + self.inactive_cache_ttl)
+            return _INACTIVE
+
+        expires_at = now + self.cache_max_ttl
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp)
+        verified = VerifiedClaims(body)
+        self.cache_claims(token_digest, verified, expires_at)
+        return verified
+
+    def validate_audience(self, aud):
+        if self.audience is None:
+            return
+
+        if aud != self.audience and not (isinstance(aud, list) and self.audience in aud):
+            raise falcon.HTTPUnauthorized(title=f"Token audience (aud) must be {self.audience} but found '{aud}' "
+                                                f"instead",
+                                          code=BAD_TOKEN_CLAIMS)
+
+    def cache_claims(self, token_digest: bytes, claims, expires_at: float):
+        if self.cache is not None:
+            self.cache.set(token_digest, claims, expires_at)
@@ -1,147 +1,208 @@
-import base64
-import json
+import asyncio
+import concurrent.futures
+import hashlib
+import time
 import urllib.parse
+from typing import Iterable
 
 import falcon
-import jwt
-import requests
 
-from .base_authenticator import BaseAuthenticator
-from ..utils_cryptography import jwk_to_public_key
+from .base_async_authenticator import BaseAsyncAuthenticator
+from .error_codes import BAD_TOKEN_FORMAT, UNKNOWN_TOKEN_KEY
+from .scheme_authenticator import SchemeAuthenticator
+from ..claims import CLAIMS_CONTEXT_ATTR, VerifiedClaims
+from ..http_client import HttpClient
+from ..instrumentation import Instrumentation
+from ..jwks import JwksKeyStore
+from ..utils.optional_dependencies import require
+from ..utils.ttl_lru_cache import TtlLruCache
+from ..utils_cryptography import SUPPORTED_ALGORITHMS
+from ..utils_jwt import ParsedToken, parse_token, verify_signature, validate_claims, get_algorithms
 
 
 def default_context_builder(context, jwt_body):
     context.user_id = jwt_body.get('sub')
 
 
-class JwkServerException(Exception):
-    pass
+class Authenticator(SchemeAuthenticator):
+    # https://forums.aws.amazon.com/message.jspa?messageID=773958
+    schemes = ('bearer',)
 
-
-# noinspection PyBroadException
-def safe_get_jwt_body_attr(body64, attr):
-    try:
-        return json.loads(base64.b64decode(body64)).get(attr)
-    except:
-        return None
-
-
-class Authenticator(BaseAuthenticator):
-    def __init__(self, client_id, oauth_domain, context_builder=None, oidc_uri: str = None):
+    def __init__(self, client_id, oauth_domain, context_builder=None, oidc_uri: str = None,
+                 token_cache_size: int = 0, token_cache_max_ttl: float = 300, key_store: JwksKeyStore = None,
+                 algorithms: Iterable[str] = SUPPORTED_ALGORITHMS, leeway: float = 0, jwks_snapshot_path: str = None,
+                 http_client: HttpClient = None):
         assert isinstance(client_id, str)
+        # imported on first use only
+        require('jwt', package='PyJWT', feature="JWT authenticator")
+        require('cryptography', feature="JWT authenticator")
 
         self.client_id = client_id
         self.oauth_domain = oauth_domain
         self.context_builder = context_builder or default_context_builder
         self.oidc_uri = oidc_uri or urllib.parse.urljoin(self.oauth_domain, '.well-known/openid-configuration')
+        self.algorithms = tuple(algorithms)
+        self.leeway = leeway
+
+        self.key_store = key_store or self.create_key_store(snapshot_path=jwks_snapshot_path, http_client=http_client)
+
+        # verified token digest => its VerifiedClaims, expiring at the token 'exp' or after token_cache_max_ttl seconds
+        self.token_cache = TtlLruCache(token_cache_size) if token_cache_size else None
+        self.token_cache_max_ttl = token_cache_max_ttl
+
+    def authenticate_credentials(self, req, resp, resource, params, credentials: str) -> bool:
+        token = credentials
+        instrumentation = self.instrumentation
+
+        token_digest, verified = self.get_cached_claims(token)
+        if verified is None:
+            with instrumentation.stage(req, 'parse'):
+                parsed = self.parse_token(token)
+            verified = VerifiedClaims(self.verify_parsed_token(req, parsed))
+            self.cache_claims(token_digest, verified)
+
+        with instrumentation.stage(req, 'context_builder'):
+            self.context_builder(req.context, verified.payload)
+        setattr(req.context, CLAIMS_CONTEXT_ATTR, verified)
+        return True
+
+    def create_key_store(self, **kwargs) -> JwksKeyStore:
+        if kwargs.get('http_client') is None:
+            require('requests', feature="JWT authenticator")
 
-        self.jwks_uri = None  # could try self.oauth_domain + .well-known/jwks.json
-        self.jwks = {}
-        self.public_keys = {}
+        return JwksKeyStore(oidc_uri=self.oidc_uri, **kwargs)
 
-    def authenticate(self, req, resp, resource, params) -> bool:
-        # Ensure Authorization header
-        if 'AUTHORIZATION' not in req.headers:
-            raise falcon.HTTPUnauthorized(title="Missing Authorization Header")
+    def set_instrumentation(self, instrumentation: Instrumentation):
+        super().set_instrumentation(instrumentation)
+        self.key_store.instrumentation = instrumentation
 
-        authorization = req.headers['AUTHORIZATION']
+    def get_cached_claims(self, token):
+        """return the digest of the token and its VerifiedClaims if already verified"""
+        if self.token_cache is None:
+            return None, None
 
-        # Ensure Bearer Authorization
-        bearer_prefix = 'Bearer '
-        # https://forums.aws.amazon.com/message.jspa?messageID=773958
-        if not authorization.startswith(bearer_prefix):
-            raise falcon.HTTPUnauthorized("Authorization must be of type Bearer")
+        # Already verified token => skip decoding and signature verification
+        token_digest = hashlib.sha256(token.encode('utf8')).digest()
+        verified = self.token_cache.get(token_digest)
+        self.instrumentation.increment('auth_cache_total', cache='token', result='miss' if verified is None else 'hit')
+        return token_digest, verified
 
-        # Ensure JWT formatting
-        token = authorization[len(bearer_prefix):]
-        try:
-            [header64, body64, signature] = token.split(".")
-        except ValueError:
-            raise falcon.HTTPUnauthorized("Authorization Bearer must be a three part JWT token")
+    def cache_claims(self, token_digest, verified: VerifiedClaims):
+        if self.token_cache is not None:
+            exp = verified.payload.get('exp')
+            expires_at = time.time() + self.token_cache_max_ttl
+            if isinstance(exp, (int, float)):
+                expires_at = min(expires_at, exp)
+            self.token_cache.set(token_digest, verified, expires_at)
 
-        # Decode base 64 encoded JWT header
-        try:
-            header = json.loads(base64.b64decode(header64))
-        except json.JSONDecodeError:
-            raise falcon.HTTPUnauthorized("Unable to parse JWT header. It must be a base64 encoded JSON dictionary")
+    @staticmethod
+    def parse_token(token) -> ParsedToken:
+        parsed = parse_token(token)
 
         # Ensure key id is in JWT header
-        if 'kid' not in header:
-            raise falcon.HTTPUnauthorized("Missing 'kid' in JWT header")
-
-        public_key = self.get_public_key(header['kid'])
-
-        issuer = self.oauth_domain
-        audience = self.client_id
-
-        try:
-            decoded = jwt.decode(token, public_key, audience=audience, issuer=issuer, algorithms='RS256')
-        except jwt.exceptions.ExpiredSignatureError:
-            raise falcon.HTTPUnauthorized("Token expired (exp)")
-        except jwt.exceptions.InvalidSignatureError:
-            raise falcon.HTTPUnauthorized("Bad token signature")
-        except jwt.exceptions.InvalidAudienceError:
-            raise falcon.HTTPUnauthorized(f"Token audience (aud) must be {audience} "
-                                          f"but found '{safe_get_jwt_body_attr(body64, 'aud')}' instead")
-        except jwt.exceptions.InvalidIssuerError:
-            raise falcon.HTTPUnauthorized(f"Token issuer (iss) must be '{issuer}' "
-                                          f"but found '{safe_get_jwt_body_attr(body64, 'iss')}' instead")
-
-        self.context_builder(req.context, decoded)
-        return True
+        if parsed.kid is None:
+            raise falcon.HTTPUnauthorized(title="Missing 'kid' in JWT header", code=BAD_TOKEN_FORMAT)
 
-    def get_public_key(self, kid):
-        if kid not in self.public_keys:
-            jwk = self.get_jwk(kid)
+        return parsed
+
+    def verify_parsed_token(self, req, parsed: ParsedToken) -> dict:
+        """look the public key of a parsed token up, then verify its signature and claims"""
+        with self.instrumentation.stage(req, 'key_lookup'):
+            public_key = self.get_public_key(parsed.kid)
+        with self.instrumentation.stage(req, 'verify'):
+            return self.verify_token(parsed, public_key)
 
-            if jwk is None:
-                # TODO maybe it happens because the token is outdated => check first that date
-                raise falcon.HTTPUnauthorized(f"Could not find JWK with id '{kid}' within available JWKs")
+    def verify_token(self, parsed: ParsedToken, public_key) -> dict:
+        """verify the signature and the claims of a parsed token, and return its payload"""
+        verify_signature(parsed, public_key, self.algorithms)
+        validate_claims(parsed.payload, audience=self.client_id, issuer=self.oauth_domain, leeway=self.leeway)
+        return parsed.payload
+
+    def get_public_key(self, kid):
+        public_key = self.key_store.get_public_key(kid)
 
-            self.public_keys[kid] = jwk_to_public_key(jwk)
+        if public_key is None:
+            # TODO maybe it happens because the token is outdated => check first that date
+            raise falcon.HTTPUnauthorized(title=f"Could not find JWK with id '{kid}' within available JWKs",
+                                          code=UNKNOWN_TOKEN_KEY)
 
-        return self.public_keys[kid]
+        return public_key
 
     def get_jwk(self, kid):
-        if kid not in self.jwks:
-            self.refresh_jwks()
+        return self.key_store.get_jwk(kid)
 
-        return self.jwks.get(kid, None)
+    def prewarm(self):
+        """
+        fetch the JWKS and build the public key of each JWK, so that no request pays for it (nor for the import of the
+        peer dependencies)
+        """
+        get_algorithms()
+        self.key_store.prewarm()
 
     def refresh_jwks(self):
-        jwks_uri = self.get_jwks_uri()
-        resp = requests.get(jwks_uri)
+        self.key_store.refresh()
 
-        if not resp.ok:
-            raise falcon.HTTPInternalServerError(
-                "Failed to load JWKS",
-                description=f"Couldn't load JWKS from {jwks_uri}. Got {resp.status_code} response: {resp.text}"
-            )
+    def get_jwks_uri(self):
+        return self.key_store.get_jwks_uri()
+
+
+class AsyncAuthenticator(Authenticator, BaseAsyncAuthenticator):
+    """
+    JWT authenticator for falcon.asgi.App: keys are discovered and refreshed with a non-blocking HTTP client, and the
+    signature verification can be offloaded to a thread pool (`offload_verification`) to keep the event loop free.
+
+    > Following peer dependency is required to use that authenticator:
+    > * [httpx](https://pypi.org/project/httpx/)
+    """
+    def __init__(self, client_id, oauth_domain, offload_verification: bool = False,
+                 executor: concurrent.futures.Executor = None, **kwargs):
+        super().__init__(client_id, oauth_domain, **kwargs)
+
+        self.offload_verification = offload_verification
+        # None => default executor of the event loop
+        self.executor = executor
+
+    def create_key_store(self, **kwargs) -> JwksKeyStore:
+        from ..jwks.async_key_store import AsyncJwksKeyStore
+
+        return AsyncJwksKeyStore(oidc_uri=self.oidc_uri, **kwargs)
+
+    async def authenticate_async(self, req, resp, resource, params) -> bool:
+        return await self.authenticate_credentials_async(req, resp, resource, params, self.get_credentials(req))
+
+    async def authenticate_credentials_async(self, req, resp, resource, params, credentials: str) -> bool:
+        token = credentials
+        instrumentation = self.instrumentation
+
+        token_digest, verified = self.get_cached_claims(token)
+        if verified is None:
+            with instrumentation.stage(req, 'parse'):
+                parsed = self.parse_token(token)
+            with instrumentation.stage(req, 'key_lookup'):
+                public_key = await self.get_public_key_async(parsed.kid)
+            with instrumentation.stage(req, 'verify'):
+                if self.offload_verification:
+                    decoded = await asyncio.get_running_loop().run_in_executor(
+                        self.executor, self.verify_token, parsed, public_key)
+                else:
+                    decoded = self.verify_token(parsed, public_key)
+            verified = VerifiedClaims(decoded)
+            self.cache_claims(token_digest, verified)
+
+        with instrumentation.stage(req, 'context_builder'):
+            self.context_builder(req.context, verified.payload)
+        setattr(req.context, CLAIMS_CONTEXT_ATTR, verified)
+        return True
 
-        # TODO also print nice error when not JSON
-        resp = resp.json()
-        self.jwks = {}
-        for _ in resp.get('keys', []):
-            self.jwks[_['kid']] = _
+    async def prewarm_async(self):
+        get_algorithms()
+        await self.key_store.prewarm_async()
 
-    def get_jwks_uri(self):
-        if self.jwks_uri is None:
-            # TODO what if request fails (not only response NOK but connectivity error)
-            resp = requests.get(self.oidc_uri)
-
-            if not resp.ok:
-                raise falcon.HTTPInternalServerError(
-                    f"Failed to discover JWK uri loading OIDC (OpenID Configuration)",
-                    description=f"Tried to load from {self.oidc_uri} bot got response {resp.status_code}: {str(resp.text)}")
-
-            # TODO what if not JSON? => cover that case too
-            resp = resp.json()
-            if 'jwks_uri' not in resp:
-                raise falcon.HTTPInternalServerError(
-                    f"Attribute 'jwks_uri' not found in OIDC (OpenID Configuration)",
-                    description=f"Successfully loaded OIDC configuration, but not able to foind jwks uri attribute"
-                                f" within the response returned: {resp}")
-
-            self.jwks_uri = resp['jwks_uri']
-
-        return self.jwks_uri
+    async def get_public_key_async(self, kid):
+        public_key = await self.key_store.get_public_key_async(kid)
+
+        if public_key is None:
+            raise falcon.HTTPUnauthorized(title=f"Could not find JWK with id '{kid}' within available JWKs",
+                                          code=UNKNOWN_TOKEN_KEY)
+
+        return public_key
@@ -0,0 +1,176 @@
+import re
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+import falcon
+
+from .error_codes import UNKNOWN_TOKEN_ISSUER
+from .jwt import Authenticator as JwtAuthenticator, default_context_builder
+from .scheme_authenticator import SchemeAuthenticator
+from ..claims import CLAIMS_CONTEXT_ATTR, VerifiedClaims
+from ..instrumentation import Instrumentation
+from ..utils.ttl_lru_cache import TtlLruCache
+
+TENANT_ID_PLACEHOLDER = "${TENANT_ID}"
+
+
+def compile_issuer_template(template: str):
+    """regular expression of the issuers matching a template, capturing its ${TENANT_ID}"""
+    assert TENANT_ID_PLACEHOLDER in template, f"Expected {TENANT_ID_PLACEHOLDER} in issuer template {template}"
+
+    return re.compile(re.escape(template).replace(re.escape(TENANT_ID_PLACEHOLDER), r"(?P<tenant_id>[A-Za-z0-9._-]+)"))
+
+
+class Authenticator(SchemeAuthenticator):
+    """
+    JWT authenticator of the tokens of several issuers. The (not yet verified) `iss` claim of a token is read once to
+    find its issuer, and the token is then verified by the authenticator of that issuer only, with its own keys.
+
+    `issuers` are accepted upfront. An issuer matching one of the `issuer_templates` (e.g.
+    `https://login.microsoftonline.com/${TENANT_ID}/v2.0`) is admitted on its first token that verifies, if accepted
+    by `tenant_filter`. At most `max_tenants` admitted issuers (with their keys) are kept, the least recently used ones
+    being forgotten first.
+
+    Since the issuer of a token isn't verified yet when it is read, the authenticator of a tenant not admitted yet is
+    kept as a candidate (at most `max_tenants` of them, apart from the admitted ones), reused by its next tokens until
+    one of them verifies. A candidate is created at most once every `min_admission_interval` seconds per tenant, and a
+    tenant whose discovery or key set fetch failed is rejected without any network call for `rejected_tenant_ttl`
+    seconds (at most `max_tenants` of them being remembered). Tokens that don't verify reject nothing but themselves,
+    so that forged tokens naming a tenant can't lock it out.
+
+    Other keyword arguments (e.g. `algorithms`, `leeway`, `http_client`) are given to the jwt.Authenticator of each
+    issuer, except for `key_store` and `jwks_snapshot_path` that are specific to an issuer.
+    """
+    schemes = ('bearer',)
+
+    # same token cache as the one of a single issuer authenticator
+    get_cached_claims = JwtAuthenticator.get_cached_claims
+    cache_claims = JwtAuthenticator.cache_claims
+
+    def __init__(self, client_id, issuers: Iterable[str] = (), issuer_templates: Iterable[str] = (),
+                 tenant_filter: Callable[[str], bool] = None, max_tenants: int = 100, context_builder=None,
+                 token_cache_size: int = 0, token_cache_max_ttl: float = 300, min_admission_interval: float = 1,
+                 rejected_tenant_ttl: float = 60, **kwargs):
+        assert isinstance(client_id, str)
+        assert 'key_store' not in kwargs and 'jwks_snapshot_path' not in kwargs, \
+            "Each issuer has its own keys: neither a key store nor a JWKS snapshot can be shared by issuers"
+
+        self.client_id = client_id
+        self.context_builder = context_builder or default_context_builder
+        self.tenant_filter = tenant_filter
+        self.issuer_kwargs = kwargs
+
+        # issuer => authenticator, for the issuers accepted upfront
+        self.issuers = {issuer: self.create_issuer_authenticator(issuer) for issuer in issuers}
+        self.issuer_templates = tuple(compile_issuer_template(template) for template in issuer_templates)
+        assert self.issuers or self.issuer_templates, "Either issuers or issuer templates are required"
+
+        # issuer => authenticator, for the issuers admitted from a template
+        self.tenants = TtlLruCache(max_tenants)
+        # issuer => authenticator, for the issuers none of whose tokens verified yet
+        self.candidates = TtlLruCache(max_tenants)
+        # issuer => True, for the issuers whose candidate was created less than min_admission_interval seconds ago
+        self.admission_attempts = TtlLruCache(max_tenants)
+        # issuer => True, for the issuers whose discovery or key set fetch failed
+        self.rejected_tenants = TtlLruCache(max_tenants)
+        self.min_admission_interval = min_admission_interval
+        self.rejected_tenant_ttl = rejected_tenant_ttl
+        self._tenants_lock = threading.Lock()
+
+        self.token_cache = TtlLruCache(token_cache_size) if token_cache_size else None
+        self.token_cache_max_ttl = token_cache_max_ttl
+
+    def authenticate_credentials(self, req, resp, resource, params, credentials: str) -> bool:
+        token = credentials
+
+        token_digest, verified = self.get_cached_claims(token)
+        if verified is None:
+            with self.instrumentation.stage(req, 'parse'):
+                parsed = JwtAuthenticator.parse_token(token)
+            verified = VerifiedClaims(self.verify_issuer_token(req, parsed))
+            self.cache_claims(token_digest, verified)
+
+        with self.instrumentation.stage(req, 'context_builder'):
+            self.context_builder(req.context, verified.payload)
+        setattr(req.context, CLAIMS_CONTEXT_ATTR, verified)
+        return True
+
+    def verify_issuer_token(self, req, parsed) -> dict:
+        """decoded payload of a token, verified by the authenticator of its issuer"""
+        issuer = parsed.payload.get('iss')
+
+        authenticator = self.issuers.get(issuer)
+        if authenticator is None and isinstance(issuer, str) and self.issuer_templates:
+            authenticator = self.tenants.get(issuer)
+            if authenticator is None:
+                return self.admit_tenant(req, issuer, parsed)
+
+        if authenticator is None:
+            raise self.unknown_issuer_error(issuer)
+
+        return authenticator.verify_parsed_token(req, parsed)
+
+    def admit_tenant(self, req, issuer: str, parsed) -> dict:
+        """verify the token of an issuer matching a template, admitting that issuer only if the token verifies"""
+        tenant_id = self.match_tenant(issuer)
+        if tenant_id is None or (self.tenant_filter is not None and not self.tenant_filter(tenant_id)) \
+                or self.rejected_tenants.get(issuer) is not None:
+            raise self.unknown_issuer_error(issuer)
+
+        with self._tenants_lock:
+            # admitted, or being tried, by another thread meanwhile
+            authenticator = self.tenants.get(issuer) or self.candidates.get(issuer)
+            if authenticator is None:
+                if self.admission_attempts.get(issuer) is not None:
+                    raise self.unknown_issuer_error(issuer)
+
+                now = time.time()
+                self.admission_attempts.set(issuer, True, now + self.min_admission_interval)
+                authenticator = self.create_issuer_authenticator(issuer)
+                self.candidates.set(issuer, authenticator, float('inf'))
+
+        try:
+            decoded = authenticator.verify_parsed_token(req, parsed)
+        except falcon.HTTPInternalServerError:
+            # discovery or key set fetch failed (IdpRequestError, or unexpected OIDC/JWKS document)
+            with self._tenants_lock:
+                if self.candidates.get(issuer) is authenticator:
+                    self.candidates.pop(issuer)
+                    if self.tenants.get(issuer) is None:
+                        self.rejected_tenants.set(issuer, True, time.time() + self.rejected_tenant_ttl)
+            raise
+        # any other error (bad signature, expired token, ...) only rejects the token: the candidate is kept
+
+        with self._tenants_lock:
+            if self.candidates.get(issuer) is authenticator:
+                self.candidates.pop(issuer)
+            if self.tenants.get(issuer) is None:
+                self.tenants.set(issuer, authenticator, float('inf'))
+
+        return decoded
+
+    @staticmethod
+    def unknown_issuer_error(issuer) -> falcon.HTTPError:
+        return falcon.HTTPUnauthorized(title=f"Token issuer (iss) '{issuer}' is not accepted",
+                                       code=UNKNOWN_TOKEN_ISSUER)
+
+    def match_tenant(self, issuer: str) -> Optional[str]:
+        for template in self.issuer_templates:
+            match = template.fullmatch(issuer)
+            if match is not None:
+                return match.group('tenant_id')
+
+        return None
+
+    def create_issuer_authenticator(self, issuer: str) -> JwtAuthenticator:
+        authenticator = JwtAuthenticator(client_id=self.client_id, oauth_domain=issuer, **self.issuer_kwargs)
+        authenticator.set_instrumentation(self.instrumentation)
+        return authenticator
+
+    def set_instrumentation(self, instrumentation: Instrumentation):
+        super().set_instrumentation(instrumentation)
+        for authenticator in self.issuers.values():
+            authenticator.set_instrumentation(instrumentation)
+        # admitted tenants are forgotten, to be admitted again with that instrumentation
+        self.tenants.clear()
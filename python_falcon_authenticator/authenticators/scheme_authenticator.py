@@ -0,0 +1,44 @@
+from abc import abstractmethod
+from typing import Optional, Tuple
+
+import falcon
+
+from .base_authenticator import BaseAuthenticator, get_authorization_header, parse_authorization_header
+from .error_codes import MISSING_AUTHORIZATION_HEADER, UNEXPECTED_AUTHORIZATION_HEADER_TYPE
+
+
+class SchemeAuthenticator(BaseAuthenticator):
+    """
+    Authenticator of the credentials held by the Authorization header, for the (lower cased) `schemes` it declares.
+
+    PythonFalconAuthenticator parses the Authorization header once and only calls `authenticate_credentials` of the
+    authenticators handling its scheme. Called directly, `authenticate` does the same for this authenticator only.
+    """
+    schemes: Tuple[str, ...] = ()
+
+    def authenticate(self, req, resp, resource, params) -> bool:
+        return self.authenticate_credentials(req, resp, resource, params, self.get_credentials(req))
+
+    def get_credentials(self, req) -> str:
+        authorization = get_authorization_header(req)
+        if authorization is None:
+            raise self.scheme_error(None)
+
+        scheme, credentials = parse_authorization_header(authorization)
+        if scheme not in self.schemes:
+            raise self.scheme_error(scheme)
+
+        return credentials
+
+    @abstractmethod
+    def authenticate_credentials(self, req, resp, resource, params, credentials: str) -> bool:
+        pass
+
+    def scheme_error(self, scheme: Optional[str]) -> falcon.HTTPError:
+        """error of a request without Authorization header (scheme is None) or of a scheme not handled"""
+        if scheme is None:
+            return falcon.HTTPUnauthorized(title="Missing Authorization Header",
+                                           code=MISSING_AUTHORIZATION_HEADER)
+
+        return falcon.HTTPUnauthorized(title=f"Authorization must be of type {self.schemes[0].capitalize()}",
+                                       code=UNEXPECTED_AUTHORIZATION_HEADER_TYPE)
@@ -1,40 +1,80 @@
 import falcon
 import base64
+import hashlib
+import hmac
+import os
+import time
 
-from .base_authenticator import BaseAuthenticator
-from .error_codes import MISSING_AUTHORIZATION_HEADER, UNEXPECTED_AUTHORIZATION_HEADER_TYPE, WRONG_CREDENTIALS, \
-    BAD_AUTHORIZATION_HEADER_CREDENTIALS
+from .error_codes import WRONG_CREDENTIALS, BAD_AUTHORIZATION_HEADER_CREDENTIALS, \
+    EMPTY_AUTHORIZATION_HEADER_CREDENTIALS
+from .scheme_authenticator import SchemeAuthenticator
+from ..credential_store import CredentialStore
+from ..utils.ttl_lru_cache import TtlLruCache
 
 
-class Authenticator(BaseAuthenticator):
-    def __init__(self, username: str, password: str):
+class Authenticator(SchemeAuthenticator):
+    schemes = ('basic',)
+
+    def __init__(self, username: str = None, password: str = None, credentials: CredentialStore = None,
+                 verification_cache_size: int = 1024, verification_cache_ttl: float = 300):
+        assert credentials is not None or username is not None, "Either a username or a credential store is required"
+
         self.username = username
         self.password = password
+        self.credentials = credentials
 
-    def authenticate(self, req, resp, resource, params) -> bool:
-        # Ensure Authorization header
-        if 'AUTHORIZATION' not in req.headers:
-            raise falcon.HTTPUnauthorized(title="Missing Authorization Header",
-                                          code=MISSING_AUTHORIZATION_HEADER)
-
-        authorization = req.headers['AUTHORIZATION']
+        # keyed digest of successfully verified credentials => True, to skip the password hashing of repeated requests
+        self.verification_cache = TtlLruCache(verification_cache_size) \
+            if credentials is not None and verification_cache_size else None
+        self.verification_cache_ttl = verification_cache_ttl
+        self._verification_cache_key = os.urandom(32)
 
-        # Ensure Bearer Authorization
-        bearer_prefix = 'Basic '
-        if not authorization.startswith(bearer_prefix):
-            raise falcon.HTTPUnauthorized(title=f"Authorization must be of type {bearer_prefix[:-1]}",
-                                          code=UNEXPECTED_AUTHORIZATION_HEADER_TYPE)
+    def authenticate_credentials(self, req, resp, resource, params, credentials: str) -> bool:
+        if not credentials:
+            raise falcon.HTTPUnauthorized(title="Authorization Basic credentials are empty",
+                                          code=EMPTY_AUTHORIZATION_HEADER_CREDENTIALS)
 
         try:
-            username_password_b64 = authorization[len(bearer_prefix):]
-            username_password = base64.b64decode(username_password_b64).decode('utf8')
-            [username, password] = username_password.split(":")
+            username_password = base64.b64decode(credentials).decode('utf8')
+            # RFC 7617: the user-id can't contain a colon, the password can
+            username, separator, password = username_password.partition(":")
+            if not separator:
+                raise ValueError("missing ':' separator")
         except ValueError:
             raise falcon.HTTPUnauthorized(title="Authorization Basic must be base64 encoded <login>:<password> string",
                                           code=BAD_AUTHORIZATION_HEADER_CREDENTIALS)
 
-        if username != self.username or password != self.password:
+        with self.instrumentation.stage(req, 'verify'):
+            verified = self.verify(username, password)
+
+        if not verified:
             raise falcon.HTTPUnauthorized(title="Wrong username or password",
                                           code=WRONG_CREDENTIALS)
 
         return True
+
+    def verify(self, username: str, password: str) -> bool:
+        if self.credentials is None:
+            # compare both fields whatever the first result, in constant time
+            username_ok = hmac.compare_digest(username.encode('utf8'), self.username.encode('utf8'))
+            password_ok = hmac.compare_digest(password.encode('utf8'), (self.password or "").encode('utf8'))
+            return username_ok and password_ok
+
+        encoded = self.credentials.get_hash(username)
+        if encoded is None or self.verification_cache is None:
+            return self.credentials.verify(username, password)
+
+        # the stored hash is part of the key, so that a changed password invalidates the cached verifications
+        digest = hmac.new(self._verification_cache_key,
+                          b"\0".join((username.encode('utf8'), encoded.encode('utf8'), password.encode('utf8'))),
+                          hashlib.sha256).digest()
+        if self.verification_cache.get(digest) is not None:
+            self.instrumentation.increment('auth_cache_total', cache='credentials', result='hit')
+            return True
+        self.instrumentation.increment('auth_cache_total', cache='credentials', result='miss')
+
+        if not self.credentials.verify(username, password):
+            return False
+
+        self.verification_cache.set(digest, True, time.time() + self.verification_cache_ttl)
+        return True
@@ -0,0 +1,126 @@
+from collections.abc import Mapping
+from typing import Iterable, Optional
+
+# request context attribute holding the VerifiedClaims of the authenticated request, if any
+CLAIMS_CONTEXT_ATTR = "auth_claims"
+# request context attribute holding the ClaimsView of the authenticated request, for routes using claims views
+CLAIMS_VIEW_CONTEXT_ATTR = "claims"
+
+
+def convert_claim(value):
+    """read-only flavour of a claim value: lists become tuples and dictionaries ClaimsView"""
+    if isinstance(value, list):
+        return tuple(convert_claim(item) for item in value)
+    if isinstance(value, dict):
+        return ClaimsView(value)
+
+    return value
+
+
+class ClaimsView(Mapping):
+    """
+    Read-only view of the claims of a verified token, restricted to the claims of a projection (if any). A claim is
+    converted on first access only, so that claims never read (e.g. large group lists) are never copied.
+
+    req.context.claims['sub']
+    req.context.claims.groups  # ('admins', ...)
+    """
+    __slots__ = ('_payload', '_names', '_converted')
+
+    def __init__(self, payload: dict, names: Optional[frozenset] = None):
+        self._payload = payload
+        self._names = names
+        self._converted = {}
+
+    def __getitem__(self, name):
+        try:
+            return self._converted[name]
+        except KeyError:
+            pass
+
+        if self._names is not None and name not in self._names:
+            raise KeyError(name)
+
+        value = self._converted[name] = convert_claim(self._payload[name])
+        return value
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(f"Token has no '{name}' claim")
+
+    def __iter__(self):
+        if self._names is None:
+            return iter(self._payload)
+
+        return (name for name in self._payload if name in self._names)
+
+    def __len__(self):
+        if self._names is None:
+            return len(self._payload)
+
+        return sum(1 for name in self._names if name in self._payload)
+
+    def __repr__(self):
+        return f"ClaimsView({sorted(self)})"
+
+
+class VerifiedClaims:
+    """
+    Claims of a verified token, as kept in the token caches of the authenticators, along with what is derived from
+    them once per token rather than once per request (e.g. the bitmask of the scopes they grant)
+    """
+    __slots__ = ('payload', '_scope_mask', '_views')
+
+    def __init__(self, payload: dict):
+        self.payload = payload
+        # (vocabulary, vocabulary size, mask), replaced as a whole since it is shared by the threads using the token
+        self._scope_mask = (None, -1, 0)
+        # projection (None for all the claims) => ClaimsView
+        self._views = {}
+
+    def scope_mask(self, vocabulary) -> int:
+        """bitmask of the scopes granted over a vocabulary, converted again only if the vocabulary grew"""
+        cached_vocabulary, cached_size, mask = self._scope_mask
+        size = len(vocabulary)
+        if cached_vocabulary is not vocabulary or cached_size != size:
+            # the size is read before converting, so that bits added meanwhile get the mask converted again
+            mask = vocabulary.claims_mask(self.payload)
+            self._scope_mask = (vocabulary, size, mask)
+
+        return mask
+
+    def view(self, projection: Optional[frozenset] = None) -> ClaimsView:
+        """read-only view of the claims (of a projection), shared by the requests of a same token"""
+        view = self._views.get(projection)
+        if view is None:
+            view = self._views[projection] = ClaimsView(self.payload, projection)
+
+        return view
+
+
+class ClaimsViewChain:
+    """authenticators of a route whose requests get a (projected) ClaimsView of their verified claims"""
+    def __init__(self, chain, projection: Optional[Iterable[str]] = None):
+        self.chain = chain
+        self.projection = frozenset(projection) if projection is not None else None
+
+    def authenticate(self, req, resp, resource, params) -> bool:
+        authenticated = self.chain.authenticate(req, resp, resource, params)
+        self.set_view(req)
+        return authenticated
+
+    async def authenticate_async(self, req, resp, resource, params) -> bool:
+        authenticated = await self.chain.authenticate_async(req, resp, resource, params)
+        self.set_view(req)
+        return authenticated
+
+    def set_view(self, req):
+        # authenticators without claims (e.g. Basic) leave an empty view
+        verified = getattr(req.context, CLAIMS_CONTEXT_ATTR, None)
+        view = ClaimsView({}) if verified is None else verified.view(self.projection)
+        setattr(req.context, CLAIMS_VIEW_CONTEXT_ATTR, view)
@@ -0,0 +1,140 @@
+import base64
+import hashlib
+import hmac
+import os
+from typing import Mapping, Optional
+
+PBKDF2_SHA256 = "pbkdf2_sha256"
+SCRYPT = "scrypt"
+
+DEFAULT_PBKDF2_ITERATIONS = 600000
+DEFAULT_SCRYPT_N, DEFAULT_SCRYPT_R, DEFAULT_SCRYPT_P = 2 ** 14, 8, 1
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.b64encode(data).decode('ascii')
+
+
+def hash_password(password: str, algorithm: str = PBKDF2_SHA256, salt: bytes = None, **params) -> str:
+    """
+    salted hash of a password, encoded as "pbkdf2_sha256$<iterations>$<salt>$<hash>"
+    or "scrypt$<n>$<r>$<p>$<salt>$<hash>" (salt and hash being base64 encoded)
+    """
+    salt = salt or os.urandom(16)
+
+    if algorithm == PBKDF2_SHA256:
+        iterations = params.get('iterations', DEFAULT_PBKDF2_ITERATIONS)
+        digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf8'), salt, iterations)
+        return f"{PBKDF2_SHA256}${iterations}${_b64encode(salt)}${_b64encode(digest)}"
+
+    if algorithm == SCRYPT:
+        n, r, p = params.get('n', DEFAULT_SCRYPT_N), params.get('r', DEFAULT_SCRYPT_R), params.get('p', DEFAULT_SCRYPT_P)
+        digest = hashlib.scrypt(password.encode('utf8'), salt=salt, n=n, r=r, p=p, maxmem=256 * n * r + 2 ** 20)
+        return f"{SCRYPT}${n}${r}${p}${_b64encode(salt)}${_b64encode(digest)}"
+
+    raise ValueError(f"Unsupported password hash algorithm '{algorithm}'")
+
+
+def check_password_hash(encoded: str):
+    """raise ValueError if a hash isn't encoded as by hash_password"""
+    algorithm, _, _ = encoded.partition('$')
+    fields = encoded.split('$')
+
+    if algorithm == PBKDF2_SHA256:
+        expected_fields, parameters = 4, fields[1:2]
+    elif algorithm == SCRYPT:
+        expected_fields, parameters = 6, fields[1:4]
+    else:
+        raise ValueError(f"Unsupported password hash algorithm '{algorithm}'")
+
+    if len(fields) != expected_fields:
+        raise ValueError(f"Malformed password hash: expected {expected_fields} '$' separated fields for {algorithm}")
+    if not all(parameter.isdigit() for parameter in parameters):
+        raise ValueError(f"Malformed password hash: non numeric {algorithm} parameters")
+
+    try:
+        for data in fields[-2:]:
+            base64.b64decode(data, validate=True)
+    except ValueError as e:
+        raise ValueError(f"Malformed password hash: {e}")
+
+
+def verify_password(password: str, encoded: str) -> bool:
+    """check, in constant time, a password against a hash encoded by hash_password"""
+    algorithm, _, _ = encoded.partition('$')
+
+    try:
+        if algorithm == PBKDF2_SHA256:
+            _, iterations, salt, digest = encoded.split('$')
+            expected = hash_password(password, PBKDF2_SHA256, base64.b64decode(salt), iterations=int(iterations))
+        elif algorithm == SCRYPT:
+            _, n, r, p, salt, digest = encoded.split('$')
+            expected = hash_password(password, SCRYPT, base64.b64decode(salt), n=int(n), r=int(r), p=int(p))
+        else:
+            raise ValueError(f"Unsupported password hash algorithm '{algorithm}'")
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Malformed password hash: {e}")
+
+    return hmac.compare_digest(expected.encode('ascii'), encoded.encode('ascii'))
+
+
+class CredentialStore:
+    """
+    Usernames mapped to salted password hashes (see hash_password).
+
+    credentials = CredentialStore.from_file("users.txt")  # one "<username>:<hash>" line per user
+    credentials = CredentialStore.from_passwords({"raphaeljoie": "Passw0rd"})
+    credentials.verify("raphaeljoie", "Passw0rd")
+    """
+    def __init__(self, hashes: Mapping[str, str] = None):
+        self.hashes = dict(hashes or {})
+        for username, encoded in self.hashes.items():
+            try:
+                check_password_hash(encoded)
+            except ValueError as e:
+                raise ValueError(f"Password hash of '{username}': {e}")
+        # verified against for unknown users, so that they take as long to reject as wrong passwords
+        self._dummy_hash = None
+
+    @classmethod
+    def from_file(cls, path) -> 'CredentialStore':
+        hashes = {}
+        with open(path, encoding='utf8') as f:
+            for line_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    username, separator, encoded = line.partition(':')
+                    try:
+                        if not separator:
+                            raise ValueError("expected a '<username>:<hash>' line")
+                        check_password_hash(encoded)
+                    except ValueError as e:
+                        raise ValueError(f"{path}:{line_number}: {e}")
+                    hashes[username] = encoded
+
+        return cls(hashes)
+
+    @classmethod
+    def from_passwords(cls, passwords: Mapping[str, str], algorithm: str = PBKDF2_SHA256,
+                       **params) -> 'CredentialStore':
+        return cls({username: hash_password(password, algorithm, **params)
+                    for username, password in passwords.items()})
+
+    def get_hash(self, username: str) -> Optional[str]:
+        return self.hashes.get(username)
+
+    def set_password(self, username: str, password: str, algorithm: str = PBKDF2_SHA256, **params):
+        self.hashes[username] = hash_password(password, algorithm, **params)
+
+    def verify(self, username: str, password: str) -> bool:
+        encoded = self.hashes.get(username)
+        if encoded is None:
+            if self._dummy_hash is None:
+                self._dummy_hash = hash_password("")
+            verify_password(password, self._dummy_hash)
+            return False
+
+        return verify_password(password, encoded)
+
+    def __len__(self):
+        return len(self.hashes)
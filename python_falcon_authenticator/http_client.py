@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
+import falcon
+
+from .utils.optional_dependencies import import_optional
+
+if TYPE_CHECKING:
+    import requests
+
+
+class IdpRequestError(falcon.HTTPInternalServerError):
+    """failed request to an identity provider"""
+
+
+class IdpConnectionError(IdpRequestError):
+    """identity provider unreachable, or not answering within the timeouts"""
+
+
+class IdpResponseError(IdpRequestError):
+    """identity provider answering with a non successful status"""
+
+
+class IdpInvalidJsonError(IdpRequestError):
+    """identity provider answering with a body that isn't JSON"""
+
+
+class HttpClient:
+    """
+    HTTP client for the calls to identity providers: connections are pooled and kept alive, every request is bounded by
+    a connect and a read timeout, and connection errors or 429/5xx responses are retried with exponential backoff
+    (regardless of their Retry-After header).
+
+    http_client = HttpClient(connect_timeout=2, read_timeout=5, retries=3)
+    body, headers = http_client.get_json("https://oauth.auth.com/.well-known/openid-configuration")
+
+    > Following peer dependency is required to use that client (imported when the client is created):
+    > * [requests](https://pypi.org/project/requests/)
+    """
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, session: requests.Session = None, connect_timeout: float = 3.05, read_timeout: float = 10,
+                 retries: int = 2, backoff_factor: float = 0.2, pool_maxsize: int = 10):
+        self._requests = import_optional('requests', feature="HttpClient")
+        self.timeout = (connect_timeout, read_timeout)
+        self.session = session or self.create_session(retries, backoff_factor, pool_maxsize)
+
+    @classmethod
+    def create_session(cls, retries: int, backoff_factor: float, pool_maxsize: int) -> requests.Session:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        # Retry-After is ignored: it may ask for hours, during which the request (and every request waiting for the
+        # same fetch) would be blocked. Retries are only delayed by the (short) exponential backoff
+        retry = Retry(total=retries, backoff_factor=backoff_factor, status_forcelist=cls.RETRY_STATUSES,
+                      allowed_methods=frozenset({'GET'}), raise_on_status=False, respect_retry_after_header=False)
+        adapter = HTTPAdapter(pool_maxsize=pool_maxsize, max_retries=retry)
+
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def get_json(self, uri: str, error_title: str = None):
+        """GET a JSON document. Return its decoded body and the response headers"""
+        return self.request_json('GET', uri, error_title=error_title)
+
+    def post_form(self, uri: str, data: dict, auth=None, error_title: str = None):
+        """POST a form, and return the decoded JSON body and the headers of the response. POST isn't retried"""
+        return self.request_json('POST', uri, error_title=error_title, data=data, auth=auth,
+                                 headers={'Accept': "application/json"})
+
+    def request_json(self, method: str, uri: str, error_title: str = None, **kwargs):
+        error_title = error_title or f"Failed to load {uri}"
+
+        try:
+            resp = self.session.request(method, uri, timeout=self.timeout, **kwargs)
+        except self._requests.RequestException as e:
+            raise IdpConnectionError(title=error_title, description=f"Couldn't reach {uri}: {e}")
+
+        if not resp.ok:
+            raise IdpResponseError(title=error_title,
+                                   description=f"Tried to load from {uri} but got response {resp.status_code}: "
+                                               f"{resp.text[:1000]}")
+
+        try:
+            return resp.json(), resp.headers
+        except ValueError:
+            raise IdpInvalidJsonError(title=error_title,
+                                      description=f"Expected a JSON response from {uri} but got "
+                                                  f"'{resp.headers.get('Content-Type')}': {resp.text[:1000]}")
+
+    def close(self):
+        self.session.close()
+
+
+_default_http_client = None
+_default_http_client_lock = threading.Lock()
+
+
+def default_http_client() -> HttpClient:
+    """HttpClient shared by every authenticator not given its own"""
+    global _default_http_client
+
+    if _default_http_client is None:
+        with _default_http_client_lock:
+            if _default_http_client is None:
+                _default_http_client = HttpClient()
+
+    return _default_http_client
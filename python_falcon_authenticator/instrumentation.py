@@ -0,0 +1,195 @@
+import bisect
+import threading
+import time
+from typing import Dict, Iterable, Tuple
+
+import falcon
+
+# stage of a request => seconds spent in it, as collected on req.context for the Server-Timing header
+TIMINGS_CONTEXT_ATTR = "auth_timings"
+
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class _NullStage:
+    """stage timer of the disabled instrumentation: does nothing, and is shared"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class Instrumentation:
+    """
+    Receiver of the metrics of the middleware, the authenticators and the key stores:
+
+    * `auth_requests_total` counter, labelled by `outcome` (success, failure, skipped) and error `code`
+    * `auth_cache_total` counter, labelled by `cache` (token, credentials) and `result` (hit, miss)
+    * `auth_jwks_fetches_total` counter, labelled by `outcome` (success, failure)
+    * `auth_request_seconds` histogram of the authentication of a request
+    * `auth_stage_seconds` histogram, labelled by `stage` (header, parse, key_lookup, verify, context_builder)
+    * `auth_jwks_fetch_seconds` histogram
+
+    That base class is disabled and does nothing. Subclass it (with `enabled = True`) to forward the metrics to any
+    other metrics or tracing library, or use `Metrics`.
+    """
+    enabled = False
+
+    def increment(self, name: str, value: float = 1, **labels):
+        pass
+
+    def observe(self, name: str, seconds: float, **labels):
+        pass
+
+    def stage(self, req, stage: str):
+        """context manager timing a stage of the authentication of a request"""
+        return _NULL_STAGE
+
+
+NO_INSTRUMENTATION = Instrumentation()
+
+
+class _Stage:
+    __slots__ = ('instrumentation', 'req', 'stage', 'started_at')
+
+    def __init__(self, instrumentation: Instrumentation, req, stage: str):
+        self.instrumentation = instrumentation
+        self.req = req
+        self.stage = stage
+
+    def __enter__(self):
+        self.started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        seconds = time.perf_counter() - self.started_at
+        self.instrumentation.observe('auth_stage_seconds', seconds, stage=self.stage)
+        record_timing(self.req, self.stage, seconds)
+        return False
+
+
+def record_timing(req, stage: str, seconds: float):
+    context = req.context
+    timings = getattr(context, TIMINGS_CONTEXT_ATTR, None)
+    if timings is None:
+        timings = {}
+        setattr(context, TIMINGS_CONTEXT_ATTR, timings)
+
+    timings[stage] = timings.get(stage, 0) + seconds
+
+
+def server_timing(timings: Dict[str, float]) -> str:
+    """Server-Timing header value of the timings of a request, in milliseconds"""
+    return ", ".join(f"auth-{stage.replace('_', '-')};dur={seconds * 1000:.3f}" for stage, seconds in timings.items())
+
+
+class _Histogram:
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self, buckets: int):
+        # one more bucket for +Inf
+        self.counts = [0] * (buckets + 1)
+        self.sum = 0.0
+        self.count = 0
+
+
+class Metrics(Instrumentation):
+    """
+    In memory counters and histograms, rendered in the Prometheus text exposition format.
+
+    metrics = Metrics()
+    app = falcon.App(middleware=[PythonFalconAuthenticator(authenticator, instrumentation=metrics)])
+    app.add_route("/metrics", PrometheusResource(metrics))
+    """
+    enabled = True
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+
+        # (name, sorted labels) => value
+        self.counters: Dict[Tuple[str, tuple], float] = {}
+        self.histograms: Dict[Tuple[str, tuple], _Histogram] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        bucket = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = _Histogram(len(self.buckets))
+            histogram.counts[bucket] += 1
+            histogram.sum += seconds
+            histogram.count += 1
+
+    def stage(self, req, stage: str):
+        return _Stage(self, req, stage)
+
+    def get_counter(self, name: str, **labels) -> float:
+        return self.counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def get_histogram_count(self, name: str, **labels) -> int:
+        histogram = self.histograms.get((name, tuple(sorted(labels.items()))))
+        return 0 if histogram is None else histogram.count
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted((key, (list(h.counts), h.sum, h.count)) for key, h in self.histograms.items())
+
+        lines = []
+        for name in sorted({name for (name, _), _ in counters}):
+            lines.append(f"# TYPE {name} counter")
+            lines.extend(f"{name}{_labels(labels)} {_number(value)}"
+                         for (counter_name, labels), value in counters if counter_name == name)
+
+        for name in sorted({name for (name, _), _ in histograms}):
+            lines.append(f"# TYPE {name} histogram")
+            for (histogram_name, labels), (counts, total, count) in histograms:
+                if histogram_name != name:
+                    continue
+
+                cumulated = 0
+                for le, bucket_count in zip((*map(_number, self.buckets), "+Inf"), counts):
+                    cumulated += bucket_count
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', le),))} {cumulated}")
+                lines.append(f"{name}_sum{_labels(labels)} {_number(total)}")
+                lines.append(f"{name}_count{_labels(labels)} {count}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in labels)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(labels, escaped)) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class PrometheusResource:
+    """falcon.App resource exposing Metrics in the Prometheus text format"""
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self, metrics: Metrics):
+        self.metrics = metrics
+
+    def on_get(self, req, resp):
+        resp.content_type = self.CONTENT_TYPE
+        resp.text = self.metrics.render_prometheus()
+        resp.status = falcon.HTTP_200
@@ -0,0 +1,27 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .key_store import JwksKeyStore
+    from .shared import SharedKeyStoreBackend, MmapSharedBackend, RedisSharedBackend
+    from .snapshot import JwksSnapshot
+
+# exported name => module, imported on first access
+_LAZY_EXPORTS = {
+    'JwksKeyStore': '.key_store',
+    'SharedKeyStoreBackend': '.shared',
+    'MmapSharedBackend': '.shared',
+    'RedisSharedBackend': '.shared',
+    'JwksSnapshot': '.snapshot',
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    from ..utils.lazy_exports import load_lazy_export
+
+    return load_lazy_export(__name__, globals(), _LAZY_EXPORTS, name)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,157 @@
+import asyncio
+import time
+
+from .key_store import JwksKeyStore
+from ..http_client import IdpConnectionError, IdpResponseError, IdpInvalidJsonError
+from ..utils.optional_dependencies import import_optional
+
+httpx = import_optional('httpx', feature="AsyncJwksKeyStore")
+
+
+class AsyncJwksKeyStore(JwksKeyStore):
+    """
+    JwksKeyStore fetching keys with a non-blocking HTTP client, for use on an asyncio event loop (e.g. falcon.asgi.App).
+
+    Caching, background refresh, single-flight and unknown key id rules are the ones of JwksKeyStore. The blocking
+    methods inherited from JwksKeyStore remain usable outside the event loop.
+
+    > Following peer dependency is required to use that key store:
+    > * [httpx](https://pypi.org/project/httpx/)
+    """
+    def __init__(self, oidc_uri: str = None, jwks_uri: str = None, async_http_client: httpx.AsyncClient = None,
+                 connect_timeout: float = 3.05, read_timeout: float = 10, retries: int = 2, **kwargs):
+        super().__init__(oidc_uri=oidc_uri, jwks_uri=jwks_uri, **kwargs)
+
+        # pooled keep-alive connections, connection failures being retried
+        self.async_http_client = async_http_client or httpx.AsyncClient(
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            transport=httpx.AsyncHTTPTransport(retries=retries))
+        self._async_flight = None
+
+    async def get_public_key_async(self, kid):
+        if self.shared is not None and self.clock() >= self.shared_checked_at + self.shared_poll_interval:
+            # checked once per interval, however many requests are awaiting it
+            self.shared_checked_at = self.clock()
+            await asyncio.get_running_loop().run_in_executor(None, self.sync_shared)
+
+        if self.jwks and self.clock() >= self.refresh_at:
+            self.refresh_in_background_async()
+
+        public_key = self.public_keys.get(kid)
+        if public_key is None:
+            jwk = await self.get_jwk_async(kid)
+            if jwk is None:
+                return None
+
+            public_key = self.build_public_key(jwk)
+            if public_key is not None:
+                self.public_keys[kid] = public_key
+
+        return public_key
+
+    async def prewarm_async(self):
+        if not self.jwks:
+            await self.refresh_async()
+
+        self.public_keys = self.build_public_keys(self.jwks, self.public_keys)
+
+    async def get_jwk_async(self, kid):
+        seen_at = self.clock()
+        jwk, refresh = self.lookup_jwk(kid, self._async_flight is not None)
+        if refresh:
+            await self.refresh_async()
+            jwk = self.lookup_refreshed_jwk(kid, seen_at)
+
+        return jwk
+
+    async def refresh_async(self):
+        """fetch the key set, or wait for the refresh already in flight"""
+        # shield the shared fetch from the cancellation of any single waiting request
+        await asyncio.shield(self._start_async_flight())
+
+    def refresh_in_background_async(self):
+        flight = self._start_async_flight()
+        # the error is logged by refresh_failed, only mark it as retrieved
+        flight.add_done_callback(lambda done: done.cancelled() or done.exception())
+
+    async def get_jwks_uri_async(self):
+        if self.jwks_uri_expired():
+            oidc, headers = await self.get_json_async(
+                self.oidc_uri, error_title="Failed to discover JWK uri loading OIDC (OpenID Configuration)")
+            self.set_oidc(oidc, headers)
+
+        return self.jwks_uri
+
+    async def fetch_jwks_async(self):
+        jwks_uri = await self.get_jwks_uri_async()
+        jwks, headers = await self.get_json_async(jwks_uri, error_title="Failed to load JWKS")
+
+        self.set_jwks(jwks, headers)
+        if self.snapshot is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self.save_snapshot)
+
+    async def update_jwks_async(self):
+        if self.shared is None:
+            await self.fetch_jwks_async()
+            return
+
+        # the shared backend may block (e.g. network calls to Redis)
+        loop = asyncio.get_running_loop()
+        claimed = await loop.run_in_executor(None, self.claim_shared_refresh)
+        if claimed is None:
+            return
+
+        try:
+            if not claimed:
+                deadline = time.monotonic() + self.shared_wait
+                while time.monotonic() < deadline:
+                    await asyncio.sleep(min(0.05, self.shared_wait))
+                    if await loop.run_in_executor(None, self.sync_shared):
+                        return
+
+            await self.fetch_jwks_async()
+            await loop.run_in_executor(None, self.publish_shared)
+        finally:
+            if claimed:
+                await loop.run_in_executor(None, self.shared.release_refresh)
+
+    async def get_json_async(self, uri: str, error_title: str):
+        try:
+            resp = await self.async_http_client.get(uri)
+        except httpx.HTTPError as e:
+            raise IdpConnectionError(title=error_title, description=f"Couldn't reach {uri}: {e}")
+
+        if not resp.is_success:
+            raise IdpResponseError(title=error_title,
+                                   description=f"Tried to load from {uri} but got response {resp.status_code}: "
+                                               f"{resp.text[:1000]}")
+
+        try:
+            return resp.json(), resp.headers
+        except ValueError:
+            raise IdpInvalidJsonError(title=error_title,
+                                      description=f"Expected a JSON response from {uri} but got "
+                                                  f"'{resp.headers.get('Content-Type')}': {resp.text[:1000]}")
+
+    async def aclose(self):
+        await self.async_http_client.aclose()
+
+    def _start_async_flight(self) -> asyncio.Future:
+        if self._async_flight is None:
+            self.refresh_attempted_at = self.clock()
+            self._async_flight = asyncio.ensure_future(self._run_async_flight(self.refresh_attempted_at))
+
+        return self._async_flight
+
+    async def _run_async_flight(self, attempted_at: float):
+        started_at = time.perf_counter()
+        try:
+            await self.update_jwks_async()
+            self.refresh_succeeded_at = attempted_at
+            self.fetch_done(started_at)
+        except Exception as e:
+            self.refresh_failed(e)
+            self.fetch_done(started_at, failed=True)
+            raise
+        finally:
+            self._async_flight = None
@@ -0,0 +1,497 @@
+import logging
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import falcon
+
+from ..http_client import HttpClient, default_http_client
+from ..instrumentation import NO_INSTRUMENTATION
+from .shared import SharedKeyStoreBackend
+from .snapshot import JwksSnapshot
+from ..utils.ttl_lru_cache import TtlLruCache
+from ..utils_cryptography import jwk_to_public_key
+
+logger = logging.getLogger(__name__)
+
+
+def http_cache_ttl(headers, now: float) -> Optional[float]:
+    """
+    Number of seconds a response may be cached according to its `Cache-Control` (or `Expires`) headers,
+    None when the response does not tell
+    """
+    cache_control = headers.get('Cache-Control')
+    if cache_control:
+        directives = {}
+        for directive in cache_control.split(','):
+            name, _, value = directive.strip().partition('=')
+            directives[name.lower()] = value.strip('"')
+
+        if 'no-store' in directives or 'no-cache' in directives:
+            return 0
+
+        for name in ('s-maxage', 'max-age'):
+            try:
+                max_age = int(directives[name])
+            except (KeyError, ValueError):
+                continue
+
+            try:
+                age = int(headers.get('Age', 0))
+            except ValueError:
+                age = 0
+
+            return max_age - age
+
+    expires = headers.get('Expires')
+    if expires:
+        try:
+            return parsedate_to_datetime(expires).timestamp() - now
+        except (TypeError, ValueError):
+            # RFC 7234: invalid Expires (like "0") means already expired
+            return 0
+
+    return None
+
+
+class _Flight:
+    def __init__(self, started_at: float):
+        self.done = threading.Event()
+        self.error = None
+        self.started_at = started_at
+
+
+class JwksKeyStore:
+    """
+    Thread-safe store of the public keys published by the JWKS endpoint of an identity provider.
+
+    The key set is cached as long as allowed by the `Cache-Control`/`Expires` headers of the JWKS response (bounded
+    by `min_ttl` and `max_ttl`), and refreshed in the background `refresh_ahead` seconds before it expires. Stale keys
+    keep being served while the key set is revalidated, and concurrent refreshes are collapsed into a single request.
+    A request thread only waits for the network when the key it is looking for isn't available at all.
+
+    Key ids still unknown after a refresh are remembered for `unknown_kid_ttl` seconds (in a cache bounded to
+    `unknown_kid_cache_size` entries) and rejected without any network call, and a refresh caused by an unknown key id
+    happens at most once every `min_refresh_interval` seconds. A key id first seen after the last refresh started is
+    only rejected until the next refresh allowed, which checks it.
+
+    With `prewarm`, the public keys of a key set are all built as soon as it is fetched (in the background when it is
+    refreshed) rather than on the first request using each of them.
+
+    With a `snapshot_path`, every fetched key set is persisted on local disk, and a new store starts from the
+    persisted one (if not older than `max_snapshot_age`): keys are available without network call, and revalidated
+    in the background once expired.
+
+    With a `shared_backend`, the key set is shared by the key stores of several processes: a single process fetches
+    it and publishes it, the other ones pick it up from the backend (polled at most every `shared_poll_interval`
+    seconds) without network call. A process needing the key set while another one is fetching it waits up to
+    `shared_wait` seconds for it to be published, then fetches it on its own.
+
+    key_store = JwksKeyStore(oidc_uri="https://oauth.auth.com/.well-known/openid-configuration")
+    public_key = key_store.get_public_key(kid)
+    """
+    def __init__(self, oidc_uri: str = None, jwks_uri: str = None, default_ttl: float = 3600, min_ttl: float = 60,
+                 max_ttl: float = 86400, refresh_ahead: float = 60, min_refresh_interval: float = 30,
+                 unknown_kid_cache_size: int = 1024, unknown_kid_ttl: float = 300, prewarm: bool = False,
+                 snapshot_path: str = None, max_snapshot_age: float = 7 * 86400, http_client: HttpClient = None,
+                 shared_backend: SharedKeyStoreBackend = None, shared_poll_interval: float = 1,
+                 shared_wait: float = 5, clock=time.time):
+        assert oidc_uri or jwks_uri, "Either an OIDC uri or a JWKS uri is required"
+
+        self.oidc_uri = oidc_uri
+        self.jwks_uri = jwks_uri
+        self.default_ttl = default_ttl
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.refresh_ahead = refresh_ahead
+        self.min_refresh_interval = min_refresh_interval
+        self.unknown_kid_ttl = unknown_kid_ttl
+        self.prewarm_keys = prewarm
+        # created on first fetch, so that a store restored from a snapshot or a shared backend may never need it
+        self._http_client = http_client
+        self.clock = clock
+        self.instrumentation = NO_INSTRUMENTATION
+
+        # unknown key id => True. Its hits and misses count the lookups of unknown key ids
+        self.unknown_kids = TtlLruCache(unknown_kid_cache_size, clock=clock)
+
+        # an explicit JWKS uri is never rediscovered
+        self.jwks_uri_expires_at = float('inf') if jwks_uri else 0
+
+        self.oidc = None
+        self.jwks = {}
+        self.public_keys = {}
+        self.fetched_at = None
+        self.expires_at = 0
+        self.refresh_at = 0
+        self.refresh_attempted_at = None
+        # start of the last successful refresh: key ids first seen before it were checked against the key set
+        self.refresh_succeeded_at = None
+
+        self._lock = threading.Lock()
+        self._flight = None
+
+        self.snapshot = JwksSnapshot(snapshot_path) if snapshot_path else None
+        self.max_snapshot_age = max_snapshot_age
+        if self.snapshot is not None:
+            self.restore(self.snapshot.load())
+
+        self.shared = shared_backend
+        self.shared_poll_interval = shared_poll_interval
+        self.shared_wait = shared_wait
+        # version of the shared key set last loaded or published
+        self.shared_version = 0
+        self.shared_checked_at = 0
+        self._shared_lock = threading.Lock()
+        if self.shared is not None:
+            self.sync_shared()
+
+    @property
+    def http_client(self) -> HttpClient:
+        if self._http_client is None:
+            self._http_client = default_http_client()
+        return self._http_client
+
+    def get_public_key(self, kid):
+        if self.shared is not None and self.clock() >= self.shared_checked_at + self.shared_poll_interval:
+            self.sync_shared()
+
+        if self.jwks and self.clock() >= self.refresh_at:
+            self.refresh_in_background()
+
+        public_key = self.public_keys.get(kid)
+        if public_key is None:
+            jwk = self.get_jwk(kid)
+            if jwk is None:
+                return None
+
+            public_key = self.build_public_key(jwk)
+            if public_key is not None:
+                self.public_keys[kid] = public_key
+
+        return public_key
+
+    def prewarm(self):
+        """fetch the key set if not available yet, and build all its public keys"""
+        if not self.jwks:
+            self.refresh()
+
+        self.public_keys = self.build_public_keys(self.jwks, self.public_keys)
+
+    def get_jwk(self, kid):
+        seen_at = self.clock()
+        jwk, refresh = self.lookup_jwk(kid, self._flight is not None)
+        if refresh:
+            self.refresh()
+            jwk = self.lookup_refreshed_jwk(kid, seen_at)
+
+        return jwk
+
+    def lookup_jwk(self, kid, refresh_in_flight: bool):
+        """
+        look a key up without any network call. Return the JWK (or None) and whether the key set must be refreshed
+        before giving up on that key id
+        """
+        jwk = self.jwks.get(kid)
+        if jwk is not None:
+            return jwk, False
+
+        if self.unknown_kids.get(kid) is not None:
+            return None, False
+
+        # Unknown key (or no key at all yet) => wait for the key set to be fetched, unless it just was
+        if refresh_in_flight or self.refresh_attempted_at is None \
+                or self.clock() - self.refresh_attempted_at >= self.min_refresh_interval:
+            return None, True
+
+        self.remember_unknown_kid(kid, self.clock())
+        return None, False
+
+    def lookup_refreshed_jwk(self, kid, seen_at: float):
+        jwk = self.jwks.get(kid)
+        if jwk is None:
+            self.remember_unknown_kid(kid, seen_at)
+
+        return jwk
+
+    def remember_unknown_kid(self, kid, seen_at: float):
+        """
+        reject a key id without any network call: for `unknown_kid_ttl` seconds once a refresh started after it was
+        first seen didn't find it, else only until the next refresh allowed, which checks it (e.g. a key rotated in just
+        after the last refresh)
+        """
+        if self.refresh_succeeded_at is not None and self.refresh_succeeded_at >= seen_at:
+            expires_at = self.clock() + self.unknown_kid_ttl
+        else:
+            expires_at = (self.refresh_attempted_at or seen_at) + self.min_refresh_interval
+        self.unknown_kids.set(kid, True, expires_at)
+
+    @property
+    def unknown_kid_hits(self) -> int:
+        return self.unknown_kids.hits
+
+    @property
+    def unknown_kid_misses(self) -> int:
+        return self.unknown_kids.misses
+
+    def refresh(self):
+        """fetch the key set, or wait for the refresh already in flight"""
+        flight, leader = self._start_flight()
+        if leader:
+            self._run_flight(flight)
+        else:
+            flight.done.wait()
+
+        if flight.error is not None:
+            raise flight.error
+
+    def refresh_in_background(self):
+        flight, leader = self._start_flight()
+        if leader:
+            threading.Thread(target=self._run_flight, args=(flight,), daemon=True).start()
+
+    def get_jwks_uri(self):
+        if self.jwks_uri_expired():
+            oidc, headers = self.http_client.get_json(
+                self.oidc_uri, error_title="Failed to discover JWK uri loading OIDC (OpenID Configuration)")
+            self.set_oidc(oidc, headers)
+
+        return self.jwks_uri
+
+    def fetch_jwks(self):
+        jwks_uri = self.get_jwks_uri()
+        jwks, headers = self.http_client.get_json(jwks_uri, error_title="Failed to load JWKS")
+
+        self.set_jwks(jwks, headers)
+        self.save_snapshot()
+
+    def update_jwks(self):
+        """fetch the key set, unless another process sharing it just did"""
+        if self.shared is None:
+            self.fetch_jwks()
+            return
+
+        claimed = self.claim_shared_refresh()
+        if claimed is None:
+            return
+
+        try:
+            if not claimed:
+                deadline = time.monotonic() + self.shared_wait
+                while time.monotonic() < deadline:
+                    time.sleep(min(0.05, self.shared_wait))
+                    if self.sync_shared():
+                        return
+
+            # fetching process gone, or too slow
+            self.fetch_jwks()
+            self.publish_shared()
+        finally:
+            if claimed:
+                self.shared.release_refresh()
+
+    def claim_shared_refresh(self) -> Optional[bool]:
+        """
+        None if another process published an unexpired key set, else whether this process is the one to fetch it (False
+        when another process already is)
+        """
+        if self.sync_shared():
+            return None
+
+        if not self.shared.acquire_refresh():
+            return False
+
+        # published between the first check and the lease
+        if self.sync_shared():
+            self.shared.release_refresh()
+            return None
+
+        return True
+
+    def sync_shared(self) -> bool:
+        """load the key set published by another process, if any. Return whether an unexpired key set was loaded"""
+        # a single thread loads it, the other ones keep using the current key set
+        if not self._shared_lock.acquire(blocking=False):
+            return False
+
+        try:
+            self.shared_checked_at = self.clock()
+            if self.shared.get_version() == self.shared_version:
+                return False
+
+            published = self.shared.load()
+            if published is None:
+                return False
+
+            version, state = published
+            self.shared_version = version
+            return self.restore(state) and self.expires_at > self.clock()
+        except Exception as e:
+            logger.warning("Failed to load shared JWKS: %s", e)
+            return False
+        finally:
+            self._shared_lock.release()
+
+    def publish_shared(self):
+        try:
+            self.shared_version = self.shared.store(self.get_state())
+        except Exception as e:
+            logger.warning("Failed to publish shared JWKS: %s", e)
+
+    def jwks_uri_expired(self) -> bool:
+        return self.jwks_uri is None or self.clock() >= self.jwks_uri_expires_at
+
+    def set_oidc(self, oidc: dict, headers=None):
+        if not isinstance(oidc, dict) or 'jwks_uri' not in oidc:
+            raise falcon.HTTPInternalServerError(
+                title=f"Attribute 'jwks_uri' not found in OIDC (OpenID Configuration)",
+                description=f"Successfully loaded OIDC configuration, but not able to foind jwks uri attribute"
+                            f" within the response returned: {oidc}")
+
+        self.oidc = oidc
+        self.jwks_uri = oidc['jwks_uri']
+        self.jwks_uri_expires_at = self.clock() + self._ttl(headers or {})
+
+    def set_jwks(self, jwks: dict, headers=None):
+        now = self.clock()
+        ttl = self._ttl(headers or {})
+
+        if not isinstance(jwks, dict) or not isinstance(jwks.get('keys', []), list):
+            raise falcon.HTTPInternalServerError(
+                title="Failed to load JWKS",
+                description=f"Expected a JSON dictionary with a 'keys' list as JWKS but got: {str(jwks)[:1000]}")
+
+        keys = {_['kid']: _ for _ in jwks.get('keys', []) if isinstance(_, dict) and 'kid' in _}
+        # keep the public keys already converted from an unchanged JWK
+        public_keys = {kid: public_key for kid, public_key in self.public_keys.items()
+                       if kid in keys and keys[kid] == self.jwks.get(kid)}
+        if self.prewarm_keys:
+            public_keys = self.build_public_keys(keys, public_keys)
+
+        self.jwks, self.public_keys = keys, public_keys
+        self.fetched_at = now
+        self.expires_at = now + ttl
+        self.refresh_at = now + max(ttl - self.refresh_ahead, ttl / 2)
+
+    def get_state(self) -> dict:
+        """OIDC metadata and key set, as persisted in snapshots"""
+        return {
+            'oidc': self.oidc,
+            'jwks_uri': self.jwks_uri,
+            'jwks_uri_expires_at': self.jwks_uri_expires_at,
+            'jwks': {'keys': list(self.jwks.values())},
+            'fetched_at': self.fetched_at,
+            'expires_at': self.expires_at,
+        }
+
+    def restore(self, state: Optional[dict]) -> bool:
+        """start from a persisted state, unless older than max_snapshot_age. Return whether it was restored"""
+        if not state:
+            return False
+
+        if not _is_valid_state(state):
+            logger.warning("Ignoring persisted JWKS state of unexpected format")
+            return False
+
+        if not state['jwks_uri'] or self.clock() - state['fetched_at'] > self.max_snapshot_age:
+            return False
+
+        # an explicit JWKS uri prevails
+        if self.jwks_uri is None or self.jwks_uri_expires_at != float('inf'):
+            self.oidc = state.get('oidc')
+            self.jwks_uri = state['jwks_uri']
+            self.jwks_uri_expires_at = state.get('jwks_uri_expires_at') or 0
+
+        keys = {_['kid']: _ for _ in state['jwks']['keys'] if 'kid' in _}
+        public_keys = {kid: public_key for kid, public_key in self.public_keys.items()
+                       if kid in keys and keys[kid] == self.jwks.get(kid)}
+        self.public_keys = self.build_public_keys(keys, public_keys) if self.prewarm_keys else public_keys
+        self.jwks = keys
+        self.fetched_at = state['fetched_at']
+        self.expires_at = state.get('expires_at') or 0
+        # expired => revalidated in the background on first use
+        self.refresh_at = max(self.fetched_at + (self.expires_at - self.fetched_at) / 2,
+                              self.expires_at - self.refresh_ahead)
+        return True
+
+    def save_snapshot(self):
+        if self.snapshot is None:
+            return
+
+        try:
+            self.snapshot.save(self.get_state())
+        except OSError as e:
+            logger.warning("Failed to save JWKS snapshot %s: %s", self.snapshot.path, e)
+
+    @staticmethod
+    def build_public_key(jwk):
+        try:
+            return jwk_to_public_key(jwk)
+        except ValueError as e:
+            # e.g. encryption key, or key type not supported => no token can be verified with it
+            logger.warning("Ignoring JWK '%s': %s", jwk.get('kid'), e)
+            return None
+
+    def build_public_keys(self, jwks: dict, public_keys: dict) -> dict:
+        """public keys of a key set, reusing the already built ones"""
+        public_keys = dict(public_keys)
+        for kid, jwk in jwks.items():
+            if kid not in public_keys:
+                public_key = self.build_public_key(jwk)
+                if public_key is not None:
+                    public_keys[kid] = public_key
+
+        return public_keys
+
+    def _ttl(self, headers) -> float:
+        ttl = http_cache_ttl(headers, self.clock())
+        return min(max(self.default_ttl if ttl is None else ttl, self.min_ttl), self.max_ttl)
+
+    def fetch_done(self, started_at: float, failed: bool = False):
+        self.instrumentation.increment('auth_jwks_fetches_total', outcome='failure' if failed else 'success')
+        self.instrumentation.observe('auth_jwks_fetch_seconds', time.perf_counter() - started_at)
+
+    def refresh_failed(self, error):
+        # retry later rather than on every request while the identity provider is failing
+        self.refresh_at = self.clock() + self.min_ttl
+        logger.warning("Failed to refresh JWKS from %s: %s", self.jwks_uri or self.oidc_uri, error)
+
+    def _start_flight(self):
+        with self._lock:
+            if self._flight is not None:
+                return self._flight, False
+
+            self.refresh_attempted_at = self.clock()
+            self._flight = _Flight(self.refresh_attempted_at)
+            return self._flight, True
+
+    def _run_flight(self, flight):
+        started_at = time.perf_counter()
+        try:
+            self.update_jwks()
+            self.refresh_succeeded_at = flight.started_at
+            self.fetch_done(started_at)
+        except Exception as e:
+            flight.error = e
+            self.refresh_failed(e)
+            self.fetch_done(started_at, failed=True)
+        finally:
+            with self._lock:
+                self._flight = None
+            flight.done.set()
+
+
+def _is_valid_state(state) -> bool:
+    """whether a persisted state (snapshot or shared) has the shape produced by JwksKeyStore.get_state"""
+    def is_number(value, optional=False):
+        return (optional and value is None) or (isinstance(value, (int, float)) and not isinstance(value, bool))
+
+    jwks = state.get('jwks') if isinstance(state, dict) else None
+    return (isinstance(jwks, dict) and isinstance(jwks.get('keys'), list)
+            and all(isinstance(_, dict) for _ in jwks['keys'])
+            and isinstance(state.get('jwks_uri'), (str, type(None)))
+            and isinstance(state.get('oidc'), (dict, type(None)))
+            and is_number(state.get('fetched_at'))
+            and is_number(state.get('expires_at'), optional=True)
+            and is_number(state.get('jwks_uri_expires_at'), optional=True))
@@ -0,0 +1,197 @@
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Optional, Tuple
+
+# seqlock sequence (odd while being written), version, payload length
+_HEADER = struct.Struct('<QQI')
+
+
+class SharedKeyStoreBackend(ABC):
+    """
+    Key set shared by the key stores of several processes (e.g. the workers of a pre-fork server): one process fetches
+    the key set and publishes it, the other ones load it from the backend rather than fetching it on their own.
+
+    Each published state gets a new version, that key stores poll to tell whether they are up to date.
+    """
+    @abstractmethod
+    def get_version(self) -> int:
+        """version of the published state, 0 if nothing was ever published. Called often: must be cheap"""
+
+    @abstractmethod
+    def load(self) -> Optional[Tuple[int, dict]]:
+        """version and state last published, or None"""
+
+    @abstractmethod
+    def store(self, state: dict) -> int:
+        """publish a state, and return its version"""
+
+    @abstractmethod
+    def acquire_refresh(self) -> bool:
+        """try to become the only process fetching the key set. Return False if another process already is"""
+
+    @abstractmethod
+    def release_refresh(self):
+        pass
+
+
+class MmapSharedBackend(SharedKeyStoreBackend):
+    """
+    Key set shared through a memory-mapped file, by the processes of a same host.
+
+    Readers never lock: the state is written between two increments of a sequence number (seqlock), and readers retry
+    when the sequence changed while they were reading, for at most `load_timeout` seconds (e.g. a writer that died
+    mid-write), after which nothing is loaded. Writers, and the process refreshing the key set, hold a lock on the file
+    (released by the system if that process dies). A backend created before a fork (e.g. gunicorn --preload) reopens
+    the locked files in each process, since locks belong to open files that a forked process shares with its parent.
+
+    > Only available on POSIX systems (fcntl)
+    """
+    def __init__(self, path: str, size: int = 1024 * 1024, load_timeout: float = 0.5):
+        import fcntl
+
+        self._fcntl = fcntl
+        self.path = path
+        self.size = size
+        self.load_timeout = load_timeout
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self._fd).st_size < size:
+            os.ftruncate(self._fd, size)
+        self._mmap = mmap.mmap(self._fd, size)
+        self._refresh_fd = os.open(path + '.lock', os.O_RDWR | os.O_CREAT, 0o600)
+        self._write_lock = threading.Lock()
+        # process the locked files were opened by
+        self._pid = os.getpid()
+
+    def get_version(self) -> int:
+        return _HEADER.unpack_from(self._mmap, 0)[1]
+
+    def load(self) -> Optional[Tuple[int, dict]]:
+        deadline = time.monotonic() + self.load_timeout
+        while True:
+            sequence, version, length = _HEADER.unpack_from(self._mmap, 0)
+            if sequence % 2 == 0:
+                payload = self._mmap[_HEADER.size:_HEADER.size + length]
+                if _HEADER.unpack_from(self._mmap, 0)[0] == sequence:
+                    break
+
+            # being written, or left half written by a writer that died: the key store fetches its own key set
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(0)
+
+        if version == 0:
+            return None
+
+        return version, json.loads(payload)
+
+    def store(self, state: dict) -> int:
+        payload = json.dumps(state).encode('utf8')
+        if _HEADER.size + len(payload) > self.size:
+            raise ValueError(f"Key set of {len(payload)} bytes doesn't fit in shared file {self.path} of {self.size} "
+                             f"bytes")
+
+        self._reopen_after_fork()
+        with self._write_lock:
+            self._fcntl.flock(self._fd, self._fcntl.LOCK_EX)
+            try:
+                sequence, version, _ = _HEADER.unpack_from(self._mmap, 0)
+                # a writer may have died mid-write, leaving an odd sequence
+                sequence += 1 if sequence % 2 == 0 else 2
+                _HEADER.pack_into(self._mmap, 0, sequence, version, 0)
+                self._mmap[_HEADER.size:_HEADER.size + len(payload)] = payload
+                _HEADER.pack_into(self._mmap, 0, sequence + 1, version + 1, len(payload))
+            finally:
+                self._fcntl.flock(self._fd, self._fcntl.LOCK_UN)
+
+        return version + 1
+
+    def acquire_refresh(self) -> bool:
+        self._reopen_after_fork()
+        try:
+            self._fcntl.flock(self._refresh_fd, self._fcntl.LOCK_EX | self._fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            return False
+
+    def release_refresh(self):
+        self._reopen_after_fork()
+        self._fcntl.flock(self._refresh_fd, self._fcntl.LOCK_UN)
+
+    def close(self):
+        self._mmap.close()
+        os.close(self._fd)
+        os.close(self._refresh_fd)
+
+    def _reopen_after_fork(self):
+        """
+        open the locked files again in a forked process: flock locks belong to the open file description, which a
+        forked process shares with its parent (so both would hold an "exclusive" lock)
+        """
+        if self._pid == os.getpid():
+            return
+
+        inherited = self._fd, self._refresh_fd
+        self._fd = os.open(self.path, os.O_RDWR)
+        self._refresh_fd = os.open(self.path + '.lock', os.O_RDWR | os.O_CREAT, 0o600)
+        # possibly held by a thread of the parent when it forked
+        self._write_lock = threading.Lock()
+        self._pid = os.getpid()
+        # the locks of the parent are kept: they are only released once all its descriptors are closed
+        for fd in inherited:
+            os.close(fd)
+
+
+class RedisSharedBackend(SharedKeyStoreBackend):
+    """
+    Key set shared through Redis, by processes of any host. `client` is a redis-py client, or any object implementing
+    its `get`, `set` (with `nx` and `ex`), `eval` and `delete` methods.
+
+    The process refreshing the key set holds a lease expiring after `lease_ttl` seconds.
+    """
+    # bumps the version and publishes the state (ARGV[1], as JSON) atomically: a process dying in between would leave
+    # the version ahead of the state, and other processes polling a version they can never load
+    STORE_SCRIPT = """
+local version = redis.call('INCR', KEYS[1])
+redis.call('SET', KEYS[2], '{"version": ' .. version .. ', "state": ' .. ARGV[1] .. '}')
+return version
+"""
+
+    def __init__(self, client, key: str = "python-falcon-authenticator:jwks", lease_ttl: float = 30):
+        self.client = client
+        self.key = key
+        self.version_key = f"{key}:version"
+        self.lease_key = f"{key}:lease"
+        self.lease_ttl = lease_ttl
+        self._lease_token = uuid.uuid4().hex
+
+    def get_version(self) -> int:
+        return int(self.client.get(self.version_key) or 0)
+
+    def load(self) -> Optional[Tuple[int, dict]]:
+        payload = self.client.get(self.key)
+        if payload is None:
+            return None
+
+        published = json.loads(payload)
+        return published['version'], published['state']
+
+    def store(self, state: dict) -> int:
+        return int(self.client.eval(self.STORE_SCRIPT, 2, self.version_key, self.key, json.dumps(state)))
+
+    def acquire_refresh(self) -> bool:
+        return bool(self.client.set(self.lease_key, self._lease_token, nx=True, ex=max(1, int(self.lease_ttl))))
+
+    def release_refresh(self):
+        token = self.client.get(self.lease_key)
+        if isinstance(token, bytes):
+            token = token.decode('utf8')
+        # the lease may have expired, and been acquired by another process
+        if token == self._lease_token:
+            self.client.delete(self.lease_key)
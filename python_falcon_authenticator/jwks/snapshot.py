@@ -0,0 +1,52 @@
+import json
+import logging
+import os
+import tempfile
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class JwksSnapshot:
+    """
+    Local file holding the OIDC metadata and the JWKS of a key store, with the time they were fetched and the time
+    they expire, so that a new process starts with the keys of its predecessors rather than with network calls.
+
+    The file is replaced atomically: readers see either the former or the new snapshot, never a partial one.
+    """
+    VERSION = 1
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Optional[dict]:
+        """the snapshot state, or None if there is no (readable) snapshot"""
+        try:
+            with open(self.path, encoding='utf8') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable JWKS snapshot %s: %s", self.path, e)
+            return None
+
+        if not isinstance(state, dict) or state.get('version') != self.VERSION:
+            logger.warning("Ignoring JWKS snapshot %s of unexpected format", self.path)
+            return None
+
+        return state
+
+    def save(self, state: dict):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(prefix='.jwks-', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf8') as f:
+                json.dump({**state, 'version': self.VERSION}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
@@ -1,41 +1,151 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Union, List
+import time
+from typing import TYPE_CHECKING, Union, List, Optional
 
 import falcon
+from falcon.constants import COMBINED_METHODS
 
+from .authenticator_chain import AuthenticatorChain
+from .claims import ClaimsViewChain
+from .instrumentation import Instrumentation, NO_INSTRUMENTATION, TIMINGS_CONTEXT_ATTR, record_timing, server_timing
 from .resource_auth_config import ResourceAuthConfig
+from .scopes import ScopedChain
+from .throttle import FailureThrottle, ThrottledChain
 
 if TYPE_CHECKING:
-    from .authenticators import BaseAuthenticator
+    from .authenticators import BaseAuthenticator, BaseAsyncAuthenticator
+
+    Authenticator = Union[BaseAuthenticator, BaseAsyncAuthenticator]
+
+# authenticators of a route, along with its claims view, the scopes it requires and the throttling of its clients
+RouteChain = Union[AuthenticatorChain, ClaimsViewChain, ScopedChain, ThrottledChain]
 
 
 class PythonFalconAuthenticator:
     RESOURCE_AUTH_CONFIG_ATTR = "auth_config"
 
-    def __init__(self, authenticators: Union[BaseAuthenticator, List[BaseAuthenticator]],
-                 exempt_routes=None, exempt_methods=None):
-        self.authenticators: List[BaseAuthenticator] = authenticators if isinstance(authenticators, list) else [authenticators]
+    def __init__(self, authenticators: Union[Authenticator, List[Authenticator]],
+                 exempt_routes=None, exempt_methods=None, instrumentation: Instrumentation = None,
+                 server_timing: bool = False, throttle: FailureThrottle = None, claims_view: bool = False):
+        self.authenticators: List[Authenticator] = authenticators if isinstance(authenticators, list) else [authenticators]
+        self.instrumentation = instrumentation or NO_INSTRUMENTATION
+        self.server_timing = server_timing
+        assert not server_timing or self.instrumentation.enabled, "Server-Timing requires an enabled instrumentation"
+        self.throttle = throttle
+        # give every authenticated request a ClaimsView, not only the ones of routes declaring the claims they need
+        self.claims_view = claims_view
+
+        self.chain = AuthenticatorChain(self.authenticators)
+        if instrumentation is not None:
+            self.chain.set_instrumentation(instrumentation)
+
+        # (id of resource, uri template, method) => chain of authenticators to try (along with the scopes the route
+        # requires, if any), None when authentication is skipped
+        self._route_decisions = {}
 
     def process_resource(self, req, resp, resource, params):
+        chain = self.get_route_chain(req, resource, params)
+        if not self.instrumentation.enabled:
+            if chain is not None:
+                chain.authenticate(req, resp, resource, params)
+            return
+
+        if chain is None:
+            self.instrumentation.increment('auth_requests_total', outcome='skipped')
+            return
+
+        started_at = time.perf_counter()
+        try:
+            chain.authenticate(req, resp, resource, params)
+        except falcon.HTTPError as e:
+            self.authentication_done(req, resp, started_at, e)
+            raise
+        self.authentication_done(req, resp, started_at)
+
+    async def process_resource_async(self, req, resp, resource, params):
+        """
+        falcon.asgi.App flavour of process_resource: authenticators implementing BaseAsyncAuthenticator are awaited,
+        the other ones are called as is
+        """
+        chain = self.get_route_chain(req, resource, params)
+        if not self.instrumentation.enabled:
+            if chain is not None:
+                await chain.authenticate_async(req, resp, resource, params)
+            return
+
+        if chain is None:
+            self.instrumentation.increment('auth_requests_total', outcome='skipped')
+            return
+
+        started_at = time.perf_counter()
+        try:
+            await chain.authenticate_async(req, resp, resource, params)
+        except falcon.HTTPError as e:
+            self.authentication_done(req, resp, started_at, e)
+            raise
+        self.authentication_done(req, resp, started_at)
+
+    def authentication_done(self, req, resp, started_at: float, error: falcon.HTTPError = None):
+        seconds = time.perf_counter() - started_at
+        if error is None:
+            self.instrumentation.increment('auth_requests_total', outcome='success')
+        else:
+            self.instrumentation.increment('auth_requests_total', outcome='failure', code=error.code or 'none')
+        self.instrumentation.observe('auth_request_seconds', seconds)
+
+        if self.server_timing:
+            record_timing(req, 'total', seconds)
+            # headers set before an error is raised are kept in the error response
+            resp.append_header('Server-Timing', server_timing(getattr(req.context, TIMINGS_CONTEXT_ATTR)))
+
+    def get_route_chain(self, req, resource, params) -> Optional[RouteChain]:
+        """
+        authenticators to try for the route of a request, or None when its authentication is skipped. The decision,
+        including the scopes required by the route, is taken once per resource, uri template and method, then looked up
+        """
+        key = (id(resource), req.uri_template, req.method)
+        try:
+            return self._route_decisions[key]
+        except KeyError:
+            pass
+
+        decision = None if self.should_skip(req, resource, params) else self.route_chain(req, resource)
+
+        # Without uri template, routes of a resource can't be told apart. Unknown methods aren't kept either, so
+        # that the table stays bounded by the routes of the app
+        if req.uri_template is not None and req.method in COMBINED_METHODS:
+            self._route_decisions[key] = decision
+
+        return decision
+
+    def route_chain(self, req, resource) -> RouteChain:
+        resource_auth_config = self.get_resource_auth_config(resource)
+        requirement, projection = None, None
+        if resource_auth_config is not None:
+            requirement, projection = resource_auth_config.scope_requirement(req), resource_auth_config.claims
+
+        chain = self.chain
+        if projection is not None or self.claims_view:
+            chain = ClaimsViewChain(chain, projection)
+        if requirement is not None:
+            chain = ScopedChain(chain, requirement)
+        return chain if self.throttle is None else ThrottledChain(chain, self.throttle)
+
+    def should_skip(self, req, resource, params) -> bool:
+        resource_auth_config = self.get_resource_auth_config(resource)
+        if resource_auth_config is not None:
+            return resource_auth_config.should_skip(req, params)
+
+        return False
+
+    def get_resource_auth_config(self, resource) -> Optional[ResourceAuthConfig]:
         if hasattr(resource, PythonFalconAuthenticator.RESOURCE_AUTH_CONFIG_ATTR):
             resource_auth_config = getattr(resource, self.RESOURCE_AUTH_CONFIG_ATTR)
             assert isinstance(resource_auth_config, ResourceAuthConfig), \
                 f"Expected {type(ResourceAuthConfig)} for authorization config of {resource} but " \
                 f"found {type(resource_auth_config)} type at attr {PythonFalconAuthenticator.RESOURCE_AUTH_CONFIG_ATTR}"
 
-            if resource_auth_config.should_skip(req, params):
-                return
-
-        errors = []
-        for authenticator in self.authenticators:
-            try:
-                if authenticator.authenticate(req, resp, resource, params):
-                    return
-            except falcon.HTTPUnauthorized as e:
-                errors.append(e)
-            except falcon.HTTPForbidden as e:
-                errors.append(e)
-
-        if len(errors):
-            raise errors[0]
+            return resource_auth_config
+
+        return None
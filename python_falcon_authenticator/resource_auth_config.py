@@ -1,24 +1,54 @@
-from typing import Optional, List
+from typing import Optional, List, Dict
+
+from .scopes import DEFAULT_VOCABULARY, ScopeRequirement, ScopeVocabulary
 
 
 class ResourceAuthConfig:
-    def __init__(self, skip_methods: Optional[List[str]], skip_uris=Optional[List[str]],
-                 skip_responders=Optional[List[str]]):
-        self.skip_methods = skip_methods or []
-        self.skip_uris = skip_uris or []
-        self.skip_responders = skip_responders or []
+    def __init__(self, skip_methods: Optional[List[str]] = None, skip_uris: Optional[List[str]] = None,
+                 skip_responders: Optional[List[str]] = None, required_scopes: Optional[List[str]] = None,
+                 responder_scopes: Optional[Dict[str, List[str]]] = None,
+                 scope_vocabulary: ScopeVocabulary = DEFAULT_VOCABULARY, claims: Optional[List[str]] = None):
+        self.skip_methods = frozenset(method.upper() for method in skip_methods or [])
+        self.skip_uris = frozenset(skip_uris or [])
+        self.skip_responders = frozenset(skip_responders or [])
 
-    def should_skip(self, req, params: Optional[dict] = None) -> bool:
-        if req.uri_template in self.skip_uris:
-            return True
-        if req.method.upper() in self.skip_methods:
-            return True
+        # compiled once, when the resource is declared
+        self.required_scopes = ScopeRequirement(required_scopes, scope_vocabulary) if required_scopes else None
+        self.responder_scopes = {responder: ScopeRequirement(scopes, scope_vocabulary)
+                                 for responder, scopes in (responder_scopes or {}).items()}
+
+        # claims exposed by the ClaimsView of the requests, None for all of them
+        self.claims = frozenset(claims) if claims is not None else None
 
-        if len(self.skip_responders) and not hasattr(req, 'responder'):
+    def should_skip(self, req, params: Optional[dict] = None) -> bool:
+        # name recorded by the router when the route was added (see RouterWithRequestResponder)
+        responder = getattr(req, 'responder', None)
+        if responder is None and len(self.skip_responders) and not self.should_skip_route(req.uri_template, req.method):
             raise Exception(f"for using 'skip_responders' option, Falcon must be configured with a 'router' that fills"
                             " the 'responder' attribute of the 'req' object.")
 
-        if hasattr(req, 'responder') and req.responder in self.skip_responders:
+        return self.should_skip_route(req.uri_template, req.method, responder)
+
+    def should_skip_route(self, uri_template: Optional[str], method: str, responder: Optional[str] = None) -> bool:
+        """skip decision of a route, given the uri template it was added with, the HTTP method and the responder name"""
+        if uri_template in self.skip_uris:
+            return True
+        if method.upper() in self.skip_methods:
             return True
 
-        return False
+        return responder is not None and responder in self.skip_responders
+
+    def scope_requirement(self, req) -> Optional[ScopeRequirement]:
+        """scopes required by the resource and by the responder of a request, if any"""
+        if not self.responder_scopes:
+            return self.required_scopes
+
+        if not hasattr(req, 'responder'):
+            raise Exception(f"for using 'responder_scopes' option, Falcon must be configured with a 'router' that "
+                            "fills the 'responder' attribute of the 'req' object.")
+
+        requirement = self.responder_scopes.get(req.responder)
+        if requirement is None or self.required_scopes is None:
+            return requirement or self.required_scopes
+
+        return self.required_scopes | requirement
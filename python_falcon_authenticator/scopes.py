@@ -0,0 +1,102 @@
+import threading
+from typing import Iterable, Tuple
+
+import falcon
+
+from .authenticators.error_codes import INSUFFICIENT_SCOPE
+from .claims import CLAIMS_CONTEXT_ATTR
+
+# claims holding the scopes, roles, groups or permissions granted by a token: either a space delimited string
+# (OAuth2 'scope') or a list of strings
+SCOPE_CLAIMS = ('scope', 'scp', 'roles', 'groups', 'permissions')
+
+
+class ScopeVocabulary:
+    """
+    Bit index of each scope used by a requirement. Scopes of tokens outside of that vocabulary are ignored, since no
+    requirement depends on them
+    """
+    def __init__(self, scope_claims: Iterable[str] = SCOPE_CLAIMS):
+        self.scope_claims = tuple(scope_claims)
+        self.bits = {}
+        self._lock = threading.Lock()
+
+    def mask(self, scopes: Iterable[str]) -> int:
+        """bitmask of scopes, adding them to the vocabulary if needed"""
+        mask = 0
+        for scope in scopes:
+            bit = self.bits.get(scope)
+            if bit is None:
+                with self._lock:
+                    bit = self.bits.setdefault(scope, len(self.bits))
+            mask |= 1 << bit
+
+        return mask
+
+    def claims_mask(self, claims: dict) -> int:
+        """bitmask of the (known) scopes granted by claims"""
+        bits, mask = self.bits, 0
+        for claim in self.scope_claims:
+            values = claims.get(claim)
+            if isinstance(values, str):
+                values = values.split()
+            elif not isinstance(values, list):
+                continue
+
+            for value in values:
+                bit = bits.get(value)
+                if bit is not None:
+                    mask |= 1 << bit
+
+        return mask
+
+    def scopes(self, mask: int) -> Tuple[str, ...]:
+        return tuple(scope for scope, bit in self.bits.items() if mask >> bit & 1)
+
+    def __len__(self):
+        return len(self.bits)
+
+
+DEFAULT_VOCABULARY = ScopeVocabulary()
+
+
+class ScopeRequirement:
+    """scopes that must all be granted, compiled into a bitmask"""
+    __slots__ = ('vocabulary', 'mask')
+
+    def __init__(self, scopes: Iterable[str], vocabulary: ScopeVocabulary = DEFAULT_VOCABULARY):
+        self.vocabulary = vocabulary
+        self.mask = vocabulary.mask(scopes)
+
+    def __or__(self, other: 'ScopeRequirement') -> 'ScopeRequirement':
+        assert self.vocabulary is other.vocabulary, "Requirements of different vocabularies can't be combined"
+
+        requirement = ScopeRequirement((), self.vocabulary)
+        requirement.mask = self.mask | other.mask
+        return requirement
+
+    def check(self, req):
+        claims = getattr(req.context, CLAIMS_CONTEXT_ATTR, None)
+        granted = 0 if claims is None else claims.scope_mask(self.vocabulary)
+
+        if granted & self.mask != self.mask:
+            missing = self.vocabulary.scopes(self.mask & ~granted)
+            raise falcon.HTTPForbidden(title=f"Missing required scope(s): {', '.join(missing)}",
+                                       code=INSUFFICIENT_SCOPE)
+
+
+class ScopedChain:
+    """authenticators of a route whose authenticated requests must also be granted required scopes"""
+    def __init__(self, chain, requirement: ScopeRequirement):
+        self.chain = chain
+        self.requirement = requirement
+
+    def authenticate(self, req, resp, resource, params) -> bool:
+        self.chain.authenticate(req, resp, resource, params)
+        self.requirement.check(req)
+        return True
+
+    async def authenticate_async(self, req, resp, resource, params) -> bool:
+        await self.chain.authenticate_async(req, resp, resource, params)
+        self.requirement.check(req)
+        return True
@@ -0,0 +1,192 @@
+"""
+Helpers to test services secured with this package without reaching a real identity provider.
+
+> Following peer dependencies are required to use that module:
+> * [cryptography](https://pypi.org/project/cryptography/)
+> * [jwt](https://pypi.org/project/jwt/)
+"""
+import base64
+import json
+import secrets
+import threading
+import time
+import urllib.parse
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+
+def int_to_base64url(value: int) -> str:
+    data = value.to_bytes((value.bit_length() + 7) // 8 or 1, 'big')
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def signing_algorithm(private_key) -> str:
+    if isinstance(private_key, ec.EllipticCurvePrivateKey):
+        return 'ES256'
+    if isinstance(private_key, ed25519.Ed25519PrivateKey):
+        return 'EdDSA'
+    return 'RS256'
+
+
+def public_jwk(kid: str, private_key) -> dict:
+    jwk = {'use': 'sig', 'alg': signing_algorithm(private_key), 'kid': kid}
+    public_key = private_key.public_key()
+
+    if isinstance(private_key, ec.EllipticCurvePrivateKey):
+        numbers = public_key.public_numbers()
+        size = (public_key.curve.key_size + 7) // 8
+        jwk.update({'kty': 'EC', 'crv': 'P-256',
+                    'x': base64.urlsafe_b64encode(numbers.x.to_bytes(size, 'big')).rstrip(b'=').decode('ascii'),
+                    'y': base64.urlsafe_b64encode(numbers.y.to_bytes(size, 'big')).rstrip(b'=').decode('ascii')})
+    elif isinstance(private_key, ed25519.Ed25519PrivateKey):
+        raw = public_key.public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+        jwk.update({'kty': 'OKP', 'crv': 'Ed25519', 'x': base64.urlsafe_b64encode(raw).rstrip(b'=').decode('ascii')})
+    else:
+        numbers = public_key.public_numbers()
+        jwk.update({'kty': 'RSA', 'n': int_to_base64url(numbers.n), 'e': int_to_base64url(numbers.e)})
+
+    return jwk
+
+
+class StubIdentityProvider:
+    """
+    Local OpenID provider serving an OIDC configuration and a JWKS over HTTP, and issuing JWT tokens signed with
+    locally generated keys, as well as opaque tokens validated by its (RFC 7662) introspection endpoint.
+
+    with StubIdentityProvider() as idp:
+        authenticator = JwtAuthenticator(client_id="CliEnTiD", oauth_domain=idp.issuer)
+        token = idp.issue_token(audience="CliEnTiD", sub="user")
+    """
+    OIDC_PATH = "/.well-known/openid-configuration"
+    JWKS_PATH = "/.well-known/jwks.json"
+    INTROSPECTION_PATH = "/oauth2/introspect"
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.private_keys = {}
+        self.jwks_headers = {}
+        self.jwks_delay = 0
+        self.introspection_delay = 0
+        # opaque token => claims
+        self.opaque_tokens = {}
+        self.request_counts = Counter()
+        self.add_key()
+
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def issuer(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    @property
+    def oidc_uri(self) -> str:
+        return self.issuer.rstrip('/') + self.OIDC_PATH
+
+    @property
+    def jwks_uri(self) -> str:
+        return self.issuer.rstrip('/') + self.JWKS_PATH
+
+    def add_key(self, kid: str = None, kty: str = 'RSA') -> str:
+        """add a RSA, EC (P-256) or OKP (Ed25519) signing key"""
+        kid = kid or str(uuid.uuid4())
+        if kty == 'EC':
+            self.private_keys[kid] = ec.generate_private_key(ec.SECP256R1())
+        elif kty == 'OKP':
+            self.private_keys[kid] = ed25519.Ed25519PrivateKey.generate()
+        else:
+            self.private_keys[kid] = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        return kid
+
+    def rotate_key(self) -> str:
+        self.private_keys.clear()
+        return self.add_key()
+
+    @property
+    def introspection_uri(self) -> str:
+        return self.issuer.rstrip('/') + self.INTROSPECTION_PATH
+
+    def jwks(self) -> dict:
+        return {'keys': [public_jwk(kid, private_key) for kid, private_key in self.private_keys.items()]}
+
+    def issue_token(self, audience: str, kid: str = None, expires_in: float = 3600, **claims) -> str:
+        kid = kid or next(iter(self.private_keys))
+        private_key = self.private_keys[kid]
+        payload = {'iss': self.issuer, 'aud': audience, 'iat': int(time.time()),
+                   'exp': int(time.time() + expires_in), **claims}
+        return jwt.encode(payload, private_key, algorithm=signing_algorithm(private_key), headers={'kid': kid})
+
+    def issue_opaque_token(self, audience: str = None, expires_in: float = 3600, **claims) -> str:
+        token = secrets.token_urlsafe(32)
+        self.opaque_tokens[token] = {'iss': self.issuer, 'aud': audience, 'iat': int(time.time()),
+                                     'exp': int(time.time() + expires_in), 'token_type': "Bearer", **claims}
+        return token
+
+    def introspect(self, token: str) -> dict:
+        claims = self.opaque_tokens.get(token)
+        if claims is None or claims['exp'] <= time.time():
+            return {'active': False}
+
+        return {'active': True, **{name: value for name, value in claims.items() if value is not None}}
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _handler_class(self):
+        idp = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                idp.request_counts[self.path] += 1
+
+                if self.path == idp.OIDC_PATH:
+                    self._send_json({'issuer': idp.issuer, 'jwks_uri': idp.jwks_uri,
+                                     'introspection_endpoint': idp.introspection_uri})
+                elif self.path == idp.JWKS_PATH:
+                    time.sleep(idp.jwks_delay)
+                    self._send_json(idp.jwks(), idp.jwks_headers)
+                else:
+                    self.send_error(404)
+
+            def do_POST(self):
+                idp.request_counts[self.path] += 1
+
+                if self.path == idp.INTROSPECTION_PATH:
+                    form = urllib.parse.parse_qs(self.rfile.read(int(self.headers.get('Content-Length', 0))).decode())
+                    time.sleep(idp.introspection_delay)
+                    self._send_json(idp.introspect(form.get('token', [""])[0]))
+                else:
+                    self.send_error(404)
+
+            def _send_json(self, body, headers=None):
+                data = json.dumps(body).encode('utf8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,115 @@
+import base64
+import binascii
+import math
+import threading
+import time
+from typing import Callable, Hashable, Optional
+
+import falcon
+
+from .authenticators.base_authenticator import get_authorization_header, parse_authorization_header
+from .authenticators.error_codes import TOO_MANY_FAILED_ATTEMPTS
+from .utils.ttl_lru_cache import TtlLruCache
+
+
+def client_ip(req) -> Optional[str]:
+    """throttle key of the address of the client (or of the last proxy) sending the request"""
+    return req.remote_addr
+
+
+def basic_username(req) -> Optional[str]:
+    """throttle key of the username of Basic credentials, if any"""
+    authorization = get_authorization_header(req)
+    if authorization is None:
+        return None
+
+    scheme, credentials = parse_authorization_header(authorization)
+    if scheme != 'basic':
+        return None
+
+    try:
+        return base64.b64decode(credentials).decode('utf8').partition(':')[0]
+    except (binascii.Error, ValueError):
+        return None
+
+
+class FailureThrottle:
+    """
+    Failed authentications per client key, counted by a token bucket of `max_failures` tokens refilled over `window`
+    seconds: a client is throttled once it failed `max_failures` times in a row, then gets one more attempt every
+    `window / max_failures` seconds.
+
+    Buckets are kept in a bounded LRU of `max_clients` keys, each one expiring once refilled, so that the memory used
+    doesn't depend on the traffic.
+
+    throttle = FailureThrottle(max_failures=10, window=60, key=client_ip)
+    """
+    def __init__(self, max_failures: int = 10, window: float = 60, key: Callable[[object], Hashable] = client_ip,
+                 max_clients: int = 10000, clock=time.time):
+        assert max_failures > 0, f"Expected a strictly positive number of failures but got {max_failures}"
+        assert window > 0, f"Expected a strictly positive window but got {window}"
+
+        self.max_failures = max_failures
+        self.window = window
+        self.key = key
+        self.clock = clock
+        # tokens regained per second
+        self.rate = max_failures / window
+
+        # client key => [tokens, updated_at], expiring once the bucket is full again
+        self.buckets = TtlLruCache(max_clients, clock=clock)
+        self._lock = threading.Lock()
+
+    def check(self, req):
+        """raise HTTPTooManyRequests if the client of a request is throttled"""
+        key = self.key(req)
+        if key is None:
+            return
+
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            return
+
+        tokens, updated_at = bucket
+        tokens += (self.clock() - updated_at) * self.rate
+        if tokens < 1:
+            raise falcon.HTTPTooManyRequests(title="Too many failed authentication attempts",
+                                             code=TOO_MANY_FAILED_ATTEMPTS,
+                                             retry_after=math.ceil((1 - tokens) / self.rate))
+
+    def record_failure(self, req):
+        key = self.key(req)
+        if key is None:
+            return
+
+        with self._lock:
+            now = self.clock()
+            bucket = self.buckets.get(key)
+            tokens = self.max_failures if bucket is None else \
+                min(self.max_failures, bucket[0] + (now - bucket[1]) * self.rate)
+
+            tokens -= 1
+            self.buckets.set(key, (tokens, now), now + (self.max_failures - tokens) / self.rate)
+
+
+class ThrottledChain:
+    """authenticators of a route whose clients are rejected, before any verification, once they failed too often"""
+    def __init__(self, chain, throttle: FailureThrottle):
+        self.chain = chain
+        self.throttle = throttle
+
+    def authenticate(self, req, resp, resource, params) -> bool:
+        self.throttle.check(req)
+        try:
+            return self.chain.authenticate(req, resp, resource, params)
+        except falcon.HTTPUnauthorized:
+            self.throttle.record_failure(req)
+            raise
+
+    async def authenticate_async(self, req, resp, resource, params) -> bool:
+        self.throttle.check(req)
+        try:
+            return await self.chain.authenticate_async(req, resp, resource, params)
+        except falcon.HTTPUnauthorized:
+            self.throttle.record_failure(req)
+            raise
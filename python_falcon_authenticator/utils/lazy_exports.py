@@ -0,0 +1,15 @@
+import importlib
+
+
+def load_lazy_export(package: str, namespace: dict, exports: dict, name: str):
+    """
+    module __getattr__ of a package whose exports are only imported on first access: import the module of an export,
+    and keep it in the package namespace so that the next accesses are plain lookups
+    """
+    module = exports.get(name)
+    if module is None:
+        raise AttributeError(f"module '{package}' has no attribute '{name}'")
+
+    value = getattr(importlib.import_module(module, package), name)
+    namespace[name] = value
+    return value
@@ -0,0 +1,31 @@
+import importlib
+import importlib.util
+
+
+class MissingDependencyError(ImportError):
+    """peer dependency of a feature not installed"""
+
+
+def _missing(module: str, package: str, feature: str) -> MissingDependencyError:
+    return MissingDependencyError(f"{feature} requires the '{package or module}' package, which is not installed. "
+                                  f"Install it with: pip install {package or module}", name=module)
+
+
+def require(module: str, package: str = None, feature: str = "This feature"):
+    """
+    check that a peer dependency is installed, without importing it: a missing dependency is reported when the
+    feature is configured, while the import cost is only paid on first use
+    """
+    if importlib.util.find_spec(module.partition('.')[0]) is None:
+        raise _missing(module, package, feature)
+
+
+def import_optional(module: str, package: str = None, feature: str = "This feature"):
+    """import a peer dependency, raising MissingDependencyError if not installed"""
+    try:
+        return importlib.import_module(module)
+    except ImportError as e:
+        if e.name is not None and module.partition('.')[0] != e.name.partition('.')[0]:
+            # a dependency of that dependency is missing: not the concern of this package
+            raise
+        raise _missing(module, package, feature) from e
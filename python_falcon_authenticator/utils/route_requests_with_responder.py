@@ -1,6 +1,38 @@
 import falcon
 
 
+class ResponderMap(dict):
+    """
+    Method map of a route (HTTP method => responder) recording the name of each responder as it is mapped, i.e. once
+    when the route is added rather than on every request
+    """
+    __slots__ = ('responder_names',)
+
+    def __init__(self, method_map: dict):
+        super().__init__()
+        self.responder_names = {}
+        for method, responder in method_map.items():
+            self[method] = responder
+
+    def __setitem__(self, method, responder):
+        super().__setitem__(method, responder)
+        self.responder_names[method] = getattr(responder, '__name__', None)
+
+
+def set_request_responder(req, method_map):
+    """populate req.responder with the name of the responder of the request method (if any)"""
+    responder_names = getattr(method_map, 'responder_names', None)
+    if responder_names is not None:
+        responder = responder_names.get(req.method)
+    else:
+        # route not added through a ResponderMap
+        responder = method_map.get(req.method)
+        responder = responder.__name__ if responder else None
+
+    if responder:
+        req.responder = responder
+
+
 def find_with_request_responder(original_find, router, uri, req=None):
     """
     Execute an original `find` function on a given router using provided argument according to Falcon doc,
@@ -10,39 +42,67 @@ def find_with_request_responder(original_find, router, uri, req=None):
     out = original_find(router, uri, req)
 
     if req and out:
-        responder = out[1].get(req.method)
-        if responder:
-            req.responder = responder.__name__
+        set_request_responder(req, out[1])
     return out
 
 
 class RouterWithRequestResponder(falcon.routing.DefaultRouter):
     """
+    Router populating req.responder with the name of the responder of each request, the names being recorded when
+    routes are added
+
     api = falcon.App(router=RouterWithRequestResponder())
     """
+    def map_http_methods(self, resource, **kwargs):
+        return ResponderMap(super().map_http_methods(resource, **kwargs))
+
     def find(self, uri, req=None):
-        return find_with_request_responder(super().find.__func__, self, uri, req)
+        out = super().find(uri, req)
+
+        if req is not None and out is not None:
+            responder = out[1].responder_names.get(req.method)
+            if responder:
+                req.responder = responder
+        return out
 
 
 def with_request_responder(router):
     """
     wrap the `find` method of a router around a new function that is calling the original function
-    then filling the req.responder property properly
+    then filling the req.responder property properly. Only the given router is modified: given a router class, a
+    subclass of it is returned, and a given router instance becomes an instance of that subclass
 
     api = falcon.App(router=with_request_responder(original_router))
     api = falcon.App(router=with_request_responder(falcon.routing.DefaultRouter()))
     """
-    # get Class from which the router was created
-    router_class = router if isinstance(router, type) else router.__class__
-    # extract the original "find" method to be wrapped
-    find_original = getattr(router_class, 'find')
+    if isinstance(router, type):
+        return _router_class_with_request_responder(router)
 
-    # define the new `find` method
-    def find(self, uri, req=None):
-        return find_with_request_responder(find_original.__call__, self, uri, req)
-
-    # replace the method with the new version
-    router_class.find = find
+    # routes already added keep their method maps, whose responder names are then read on each request
+    router.__class__ = _router_class_with_request_responder(router.__class__)
 
     # and return the modified router
     return router
+
+
+# router class => its subclass filling req.responder
+_router_classes = {}
+
+
+def _router_class_with_request_responder(router_class: type) -> type:
+    subclass = _router_classes.get(router_class)
+    if subclass is None:
+        # no __slots__ nor __dict__ added, so that instances of the router class can be turned into instances of it
+        methods = {
+            '__slots__': (),
+            'find': lambda self, uri, req=None: find_with_request_responder(router_class.find, self, uri, req),
+        }
+        if hasattr(router_class, 'map_http_methods'):
+            # routes added from now on record their responder names
+            methods['map_http_methods'] = lambda self, resource, **kwargs: ResponderMap(
+                router_class.map_http_methods(self, resource, **kwargs))
+
+        subclass = _router_classes[router_class] = type(f"{router_class.__name__}WithRequestResponder",
+                                                        (router_class,), methods)
+
+    return subclass
@@ -0,0 +1,63 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TtlLruCache:
+    """
+    Thread-safe mapping bounded in size (least recently used entries are evicted first) whose entries also expire
+    at an absolute timestamp given when they are set.
+
+    cache = TtlLruCache(max_size=1024)
+    cache.set(key, value, expires_at=time.time() + 60)
+    cache.get(key)  # value, or None once expired or evicted
+    """
+    def __init__(self, max_size: int, clock=time.time):
+        assert max_size > 0, f"Expected a strictly positive cache size but got {max_size}"
+
+        self.max_size = max_size
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at <= self.clock():
+                del self._entries[key]
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, expires_at: float):
+        if expires_at <= self.clock():
+            return
+
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -1,26 +1,101 @@
+"""
+JWK conversion and key type checks. The cryptography package is only imported on first use, so that importing an
+authenticator doesn't pay for it.
+
+> Following peer dependency is required to use that module:
+> * [cryptography](https://pypi.org/project/cryptography/)
+"""
 import base64
-import struct
 
-from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicNumbers
+from .utils.optional_dependencies import import_optional
+
+# signature algorithms (JWT 'alg' header) whose keys can be converted from JWKs
+SUPPORTED_ALGORITHMS = ('RS256', 'RS384', 'RS512', 'PS256', 'PS384', 'PS512', 'ES256', 'ES384', 'ES512', 'EdDSA')
+
+# tables of cryptography classes, built on first use
+_tables = None
+
+
+def cryptography_tables():
+    """EC curves, OKP key classes and signature algorithm => classes of the public keys it verifies with"""
+    global _tables
+
+    if _tables is None:
+        import_optional('cryptography', feature="JWT verification")
+        from cryptography.hazmat.primitives.asymmetric import ec
+        from cryptography.hazmat.primitives.asymmetric.ed448 import Ed448PublicKey
+        from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+        from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicKey
+
+        ec_curves = {
+            'P-256': ec.SECP256R1,
+            'P-384': ec.SECP384R1,
+            'P-521': ec.SECP521R1,
+        }
+        okp_curves = {
+            'Ed25519': Ed25519PublicKey,
+            'Ed448': Ed448PublicKey,
+        }
+        algorithm_key_classes = {
+            'RS256': RSAPublicKey,
+            'RS384': RSAPublicKey,
+            'RS512': RSAPublicKey,
+            'PS256': RSAPublicKey,
+            'PS384': RSAPublicKey,
+            'PS512': RSAPublicKey,
+            'ES256': ec.EllipticCurvePublicKey,
+            'ES384': ec.EllipticCurvePublicKey,
+            'ES512': ec.EllipticCurvePublicKey,
+            'EdDSA': (Ed25519PublicKey, Ed448PublicKey),
+        }
+        _tables = ec_curves, okp_curves, algorithm_key_classes
 
+    return _tables
 
-def intarr2long(arr):
-    return int(''.join(["%02x" % byte for byte in arr]), 16)
 
+def base64url_decode(data) -> bytes:
+    """decode base64url (RFC 7515) data, whose padding is usually stripped"""
+    if isinstance(data, bytes):
+        data = data.decode('ascii')
 
-def base64_to_long(data):
-    if isinstance(data, str):
-        data = data.encode("ascii")
+    return base64.urlsafe_b64decode(data + '=' * (-len(data) % 4))
 
-    # urlsafe_b64decode will happily convert b64encoded data
-    _d = base64.urlsafe_b64decode(bytes(data) + b'==')
-    return intarr2long(struct.unpack('%sB' % len(_d), _d))
+
+def base64_to_long(data) -> int:
+    return int.from_bytes(base64url_decode(data), 'big')
 
 
 def jwk_to_public_key(jwk):
-    exponent = base64_to_long(jwk['e'])
-    modulus = base64_to_long(jwk['n'])
-    numbers = RSAPublicNumbers(exponent, modulus)
+    """
+    public key of a RSA, EC (P-256, P-384, P-521) or OKP (Ed25519, Ed448) JWK. Raise ValueError for any other key
+    """
+    ec_curves, okp_curves, _ = cryptography_tables()
+    from cryptography.exceptions import UnsupportedAlgorithm
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicNumbers
+
+    kty = jwk.get('kty', 'RSA')
+
+    try:
+        if kty == 'RSA':
+            return RSAPublicNumbers(base64_to_long(jwk['e']), base64_to_long(jwk['n'])).public_key()
+
+        if kty == 'EC':
+            curve = ec_curves[jwk['crv']]()
+            # SEC1 uncompressed point, coordinates being already fixed size big endian integers
+            point = b'\x04' + base64url_decode(jwk['x']) + base64url_decode(jwk['y'])
+            return ec.EllipticCurvePublicKey.from_encoded_point(curve, point)
+
+        if kty == 'OKP':
+            return okp_curves[jwk['crv']].from_public_bytes(base64url_decode(jwk['x']))
+    except KeyError as e:
+        raise ValueError(f"Missing or unsupported JWK attribute {e} for key type '{kty}'")
+    except UnsupportedAlgorithm as e:
+        raise ValueError(f"Unsupported JWK: {e}")
+
+    raise ValueError(f"Unsupported JWK key type '{kty}'")
+
 
-    return numbers.public_key(backend=default_backend())
+def is_key_for_algorithm(public_key, alg: str) -> bool:
+    key_classes = cryptography_tables()[2].get(alg)
+    return key_classes is not None and isinstance(public_key, key_classes)
@@ -0,0 +1,117 @@
+import json
+import time
+from typing import Iterable
+
+import falcon
+
+from .authenticators.error_codes import BAD_TOKEN_FORMAT, UNEXPECTED_TOKEN_ALGORITHM, BAD_TOKEN_SIGNATURE, \
+    EXPIRED_TOKEN, BAD_TOKEN_CLAIMS
+from .utils.optional_dependencies import import_optional
+from .utils_cryptography import base64url_decode, is_key_for_algorithm
+
+# algorithm name => PyJWT algorithm, only used to verify signatures with already built public keys. Loaded on first use
+_algorithms = None
+
+
+def get_algorithms() -> dict:
+    global _algorithms
+
+    if _algorithms is None:
+        _algorithms = import_optional('jwt.algorithms', package='PyJWT',
+                                      feature="JWT verification").get_default_algorithms()
+
+    return _algorithms
+
+
+class ParsedToken:
+    """JWT token whose header and payload are decoded, but whose signature and claims are not verified yet"""
+    __slots__ = ('header', 'payload', 'signing_input', 'signature')
+
+    def __init__(self, header: dict, payload: dict, signing_input: bytes, signature: bytes):
+        self.header = header
+        self.payload = payload
+        self.signing_input = signing_input
+        self.signature = signature
+
+    @property
+    def kid(self):
+        return self.header.get('kid')
+
+    @property
+    def alg(self):
+        return self.header.get('alg')
+
+
+def parse_token(token: str) -> ParsedToken:
+    """split and decode a compact serialized JWT token, once"""
+    try:
+        header64, payload64, signature64 = token.split(".")
+    except ValueError:
+        raise falcon.HTTPUnauthorized(title="Authorization Bearer must be a three part JWT token",
+                                      code=BAD_TOKEN_FORMAT)
+
+    try:
+        header = json.loads(base64url_decode(header64))
+    except ValueError:
+        raise falcon.HTTPUnauthorized(title="Unable to parse JWT header. It must be a base64 encoded JSON dictionary",
+                                      code=BAD_TOKEN_FORMAT)
+
+    try:
+        payload = json.loads(base64url_decode(payload64))
+        signature = base64url_decode(signature64)
+    except ValueError:
+        raise falcon.HTTPUnauthorized(title="Unable to parse JWT payload. It must be a base64 encoded JSON dictionary",
+                                      code=BAD_TOKEN_FORMAT)
+
+    if not isinstance(header, dict) or not isinstance(payload, dict):
+        raise falcon.HTTPUnauthorized(title="JWT header and payload must be JSON dictionaries",
+                                      code=BAD_TOKEN_FORMAT)
+
+    return ParsedToken(header, payload, f"{header64}.{payload64}".encode('ascii'), signature)
+
+
+def verify_signature(parsed: ParsedToken, public_key, algorithms: Iterable[str]):
+    alg = parsed.alg
+    algorithm = get_algorithms().get(alg)
+    if alg not in algorithms or algorithm is None:
+        raise falcon.HTTPUnauthorized(title=f"Token algorithm (alg) must be one of {', '.join(algorithms)} "
+                                            f"but found '{alg}' instead",
+                                      code=UNEXPECTED_TOKEN_ALGORITHM)
+
+    # a key of another type must not be used, whatever the algorithm the token claims
+    if not is_key_for_algorithm(public_key, alg):
+        raise falcon.HTTPUnauthorized(title=f"Token algorithm (alg) '{alg}' doesn't match the type of key "
+                                            f"'{parsed.kid}'",
+                                      code=UNEXPECTED_TOKEN_ALGORITHM)
+
+    if not algorithm.verify(parsed.signing_input, public_key, parsed.signature):
+        raise falcon.HTTPUnauthorized(title="Bad token signature", code=BAD_TOKEN_SIGNATURE)
+
+
+def validate_claims(payload: dict, audience: str, issuer: str, leeway: float = 0, now: float = None):
+    """validate the registered claims of an already decoded payload, as jwt.decode would"""
+    now = time.time() if now is None else now
+
+    exp = payload.get('exp')
+    if exp is not None:
+        if not isinstance(exp, (int, float)):
+            raise falcon.HTTPUnauthorized(title="Token expiration (exp) must be a number", code=BAD_TOKEN_CLAIMS)
+        if exp <= now - leeway:
+            raise falcon.HTTPUnauthorized(title="Token expired (exp)", code=EXPIRED_TOKEN)
+
+    nbf = payload.get('nbf')
+    if nbf is not None:
+        if not isinstance(nbf, (int, float)):
+            raise falcon.HTTPUnauthorized(title="Token not before (nbf) must be a number", code=BAD_TOKEN_CLAIMS)
+        if nbf > now + leeway:
+            raise falcon.HTTPUnauthorized(title="Token not yet valid (nbf)", code=BAD_TOKEN_CLAIMS)
+
+    aud = payload.get('aud')
+    if aud != audience and not (isinstance(aud, list) and audience in aud):
+        raise falcon.HTTPUnauthorized(title=f"Token audience (aud) must be {audience} but found '{aud}' instead",
+                                      code=BAD_TOKEN_CLAIMS)
+
+    iss = payload.get('iss')
+    if iss != issuer:
+        raise falcon.HTTPUnauthorized(title=f"Token issuer (iss) must be '{issuer}' but found '{iss}' instead",
+                                      code=BAD_TOKEN_CLAIMS)
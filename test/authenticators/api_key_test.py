@@ -0,0 +1,120 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+
+import falcon
+
+from python_falcon_authenticator.api_key_store import ApiKeyStore, hash_api_key
+from python_falcon_authenticator.authenticators.api_key import Authenticator, HeaderAuthenticator
+from python_falcon_authenticator.authenticators.error_codes import WRONG_CREDENTIALS, MISSING_AUTHORIZATION_HEADER
+
+
+class Context:
+    pass
+
+
+class Request:
+    def __init__(self, headers):
+        self.headers = {name.upper(): value for name, value in headers.items()}
+        self.context = Context()
+
+
+def write_keys(path, keys):
+    # written aside then renamed, as a deployment would
+    with open(path + ".tmp", 'w', encoding='utf8') as f:
+        json.dump({hash_api_key(key): claims for key, claims in keys.items()}, f)
+    os.replace(path + ".tmp", path)
+
+
+class TestApiKeyStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "api_keys.json")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_lookup(self):
+        keys = ApiKeyStore.from_keys({f"key-{i}": {'sub': f"client-{i}"} for i in range(10000)})
+
+        self.assertEqual(10000, len(keys))
+        self.assertEqual({'sub': "client-4242"}, keys.lookup("key-4242").payload)
+        self.assertIsNone(keys.lookup("unknown"))
+
+    def test_reload(self):
+        write_keys(self.path, {"first": {'sub': "first"}})
+        keys = ApiKeyStore.from_file(self.path)
+        self.assertFalse(keys.reload())
+
+        write_keys(self.path, {"second": {'sub': "second"}})
+        self.assertTrue(keys.reload())
+        self.assertIsNone(keys.lookup("first"))
+        self.assertEqual({'sub': "second"}, keys.lookup("second").payload)
+
+    def test_unreadable_file_keeps_keys(self):
+        write_keys(self.path, {"first": {'sub': "first"}})
+        keys = ApiKeyStore.from_file(self.path)
+
+        with open(self.path, 'w', encoding='utf8') as f:
+            f.write("{not json")
+        with self.assertLogs('python_falcon_authenticator.api_key_store', level='WARNING'):
+            self.assertFalse(keys.reload())
+        self.assertIsNotNone(keys.lookup("first"))
+
+    def test_malformed_digest(self):
+        with self.assertRaises(ValueError):
+            ApiKeyStore({"abcd": {'sub': "client"}})
+
+    def test_watch(self):
+        write_keys(self.path, {"first": {'sub': "first"}})
+        keys = ApiKeyStore.from_file(self.path).watch(interval=0.01)
+        try:
+            write_keys(self.path, {"second": {'sub': "second"}})
+
+            deadline = time.time() + 5
+            while keys.lookup("second") is None and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertIsNotNone(keys.lookup("second"))
+        finally:
+            keys.stop()
+
+
+class TestApiKeyAuthenticator(unittest.TestCase):
+    def setUp(self):
+        self.keys = ApiKeyStore.from_keys({"s3cr3t": {'sub': "billing", 'scope': "invoices:read"}})
+
+    def test_authorization_scheme(self):
+        authenticator = Authenticator(keys=self.keys)
+        req = Request({'Authorization': "ApiKey s3cr3t"})
+
+        self.assertTrue(authenticator.authenticate(req, None, None, None))
+        self.assertEqual("billing", req.context.user_id)
+        self.assertEqual("invoices:read", req.context.auth_claims.payload['scope'])
+
+        with self.assertRaises(falcon.HTTPUnauthorized) as context:
+            authenticator.authenticate(Request({'Authorization': "ApiKey wrong"}), None, None, None)
+        self.assertEqual(WRONG_CREDENTIALS, context.exception.code)
+
+    def test_header(self):
+        authenticator = HeaderAuthenticator(keys=self.keys, header="X-API-Key")
+        req = Request({'X-API-Key': "s3cr3t"})
+
+        self.assertTrue(authenticator.authenticate(req, None, None, None))
+        self.assertEqual("billing", req.context.user_id)
+
+        with self.assertRaises(falcon.HTTPUnauthorized) as context:
+            authenticator.authenticate(Request({}), None, None, None)
+        self.assertEqual(MISSING_AUTHORIZATION_HEADER, context.exception.code)
+
+    def test_empty_store(self):
+        authenticator = Authenticator(keys=ApiKeyStore())
+
+        with self.assertRaises(falcon.HTTPUnauthorized) as context:
+            authenticator.authenticate(Request({'Authorization': "ApiKey s3cr3t"}), None, None, None)
+        self.assertEqual(WRONG_CREDENTIALS, context.exception.code)
+
+    def test_keys_required(self):
+        with self.assertRaises(ValueError):
+            Authenticator()
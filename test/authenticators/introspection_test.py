@@ -0,0 +1,90 @@
+import threading
+import unittest
+
+import falcon
+
+from python_falcon_authenticator.authenticators.error_codes import INACTIVE_TOKEN, BAD_TOKEN_CLAIMS
+from python_falcon_authenticator.authenticators.introspection import Authenticator
+from python_falcon_authenticator.testing import StubIdentityProvider
+
+
+class Context:
+    pass
+
+
+class Request:
+    def __init__(self, token):
+        self.headers = {'AUTHORIZATION': f'Bearer {token}'}
+        self.context = Context()
+
+
+class TestIntrospectionAuthenticator(unittest.TestCase):
+    def setUp(self):
+        self.idp = StubIdentityProvider().start()
+
+    def tearDown(self):
+        self.idp.stop()
+
+    def introspections(self):
+        return self.idp.request_counts[self.idp.INTROSPECTION_PATH]
+
+    def test_active_token_is_cached(self):
+        authenticator = Authenticator(self.idp.introspection_uri, client_id="resource", client_secret="s3cr3t")
+        token = self.idp.issue_opaque_token(sub="user")
+
+        for _ in range(3):
+            req = Request(token)
+            self.assertTrue(authenticator.authenticate(req, None, None, None))
+            self.assertEqual("user", req.context.user_id)
+
+        self.assertEqual(1, self.introspections())
+
+    def test_inactive_token_is_cached(self):
+        authenticator = Authenticator(self.idp.introspection_uri)
+
+        for _ in range(2):
+            with self.assertRaises(falcon.HTTPUnauthorized) as context:
+                authenticator.authenticate(Request("unknown"), None, None, None)
+            self.assertEqual(INACTIVE_TOKEN, context.exception.code)
+
+        self.assertEqual(1, self.introspections())
+
+    def test_expired_token(self):
+        authenticator = Authenticator(self.idp.introspection_uri)
+
+        with self.assertRaises(falcon.HTTPUnauthorized) as context:
+            authenticator.authenticate(Request(self.idp.issue_opaque_token(expires_in=-10)), None, None, None)
+        self.assertEqual(INACTIVE_TOKEN, context.exception.code)
+
+    def test_cache_bounded_by_exp(self):
+        authenticator = Authenticator(self.idp.introspection_uri, cache_max_ttl=300)
+        token = self.idp.issue_opaque_token(expires_in=60)
+        authenticator.authenticate(Request(token), None, None, None)
+
+        _, expires_at = next(iter(authenticator.cache._entries.values()))
+        self.assertEqual(self.idp.opaque_tokens[token]['exp'], expires_at)
+
+    def test_audience(self):
+        authenticator = Authenticator(self.idp.introspection_uri, audience="CliEnTiD")
+        self.assertTrue(authenticator.authenticate(Request(self.idp.issue_opaque_token(audience=["CliEnTiD", "other"])),
+                                                   None, None, None))
+
+        with self.assertRaises(falcon.HTTPUnauthorized) as context:
+            authenticator.authenticate(Request(self.idp.issue_opaque_token(audience="other")), None, None, None)
+        self.assertEqual(BAD_TOKEN_CLAIMS, context.exception.code)
+
+    def test_concurrent_introspections_are_collapsed(self):
+        self.idp.introspection_delay = 0.3
+        authenticator = Authenticator(self.idp.introspection_uri)
+        token = self.idp.issue_opaque_token(sub="user")
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(
+            authenticator.authenticate(Request(token), None, None, None))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([True] * 8, results)
+        self.assertEqual(1, self.introspections())
@@ -0,0 +1,80 @@
+import asyncio
+import unittest
+
+import falcon
+import falcon.asgi
+import falcon.testing
+
+from python_falcon_authenticator import PythonFalconAuthenticator
+from python_falcon_authenticator.authenticators.jwt import AsyncAuthenticator
+from python_falcon_authenticator.testing import StubIdentityProvider
+
+
+class Context:
+    pass
+
+
+class Request:
+    def __init__(self, headers):
+        self.headers = headers
+        self.context = Context()
+
+
+def bearer(token):
+    return Request({'AUTHORIZATION': f'Bearer {token}'})
+
+
+class UsersResource:
+    async def on_get(self, req, resp):
+        resp.media = {'calling_user_id': req.context.user_id}
+
+
+class TestAsyncJwtAuthenticator(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.idp = StubIdentityProvider().start()
+
+    def tearDown(self):
+        self.idp.stop()
+
+    async def test_success(self):
+        authenticator = AsyncAuthenticator(client_id="CliEnTiD", oauth_domain=self.idp.issuer)
+        req = bearer(self.idp.issue_token(audience="CliEnTiD", sub="user"))
+
+        self.assertTrue(await authenticator.authenticate_async(req, None, None, None))
+        self.assertEqual("user", req.context.user_id)
+        await authenticator.key_store.aclose()
+
+    async def test_offloaded_verification(self):
+        authenticator = AsyncAuthenticator(client_id="CliEnTiD", oauth_domain=self.idp.issuer,
+                                           offload_verification=True)
+
+        with self.assertRaises(falcon.HTTPUnauthorized):
+            await authenticator.authenticate_async(bearer(self.idp.issue_token(audience="other")), None, None, None)
+        await authenticator.key_store.aclose()
+
+    async def test_concurrent_fetches_are_collapsed(self):
+        self.idp.jwks_delay = 0.2
+        authenticator = AsyncAuthenticator(client_id="CliEnTiD", oauth_domain=self.idp.issuer)
+        token = self.idp.issue_token(audience="CliEnTiD")
+
+        results = await asyncio.gather(*[authenticator.authenticate_async(bearer(token), None, None, None)
+                                         for _ in range(10)])
+
+        self.assertTrue(all(results))
+        self.assertEqual(1, self.idp.request_counts[StubIdentityProvider.JWKS_PATH])
+        await authenticator.key_store.aclose()
+
+
+class TestAsgiMiddleware(unittest.TestCase):
+    def test_asgi_app(self):
+        with StubIdentityProvider() as idp:
+            app = falcon.asgi.App(middleware=[PythonFalconAuthenticator(
+                AsyncAuthenticator(client_id="CliEnTiD", oauth_domain=idp.issuer))])
+            app.add_route("/users", UsersResource())
+            client = falcon.testing.TestClient(app)
+
+            token = idp.issue_token(audience="CliEnTiD", sub="user")
+            result = client.simulate_get("/users", headers={'Authorization': f'Bearer {token}'})
+            self.assertEqual({'calling_user_id': 'user'}, result.json)
+
+            self.assertEqual(401, client.simulate_get("/users").status_code)
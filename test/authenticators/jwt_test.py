@@ -0,0 +1,141 @@
+import unittest
+from unittest import mock
+
+import falcon
+import jwt as pyjwt
+
+from python_falcon_authenticator.authenticators import jwt as jwt_authenticator
+from python_falcon_authenticator.authenticators.error_codes import EXPIRED_TOKEN, BAD_TOKEN_SIGNATURE, \
+    UNEXPECTED_TOKEN_ALGORITHM
+from python_falcon_authenticator.authenticators.jwt import Authenticator
+from python_falcon_authenticator.testing import StubIdentityProvider
+
+
+class Context:
+    pass
+
+
+class Request:
+    def __init__(self, headers):
+        self.headers = headers
+        self.context = Context()
+
+
+def bearer(token):
+    return Request({'AUTHORIZATION': f'Bearer {token}'})
+
+
+class TestJwtAuthenticator(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.idp = StubIdentityProvider().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.idp.stop()
+
+    def test_success(self):
+        authenticator = Authenticator(client_id="CliEnTiD", oauth_domain=self.idp.issuer)
+        req = bearer(self.idp.issue_token(audience="CliEnTiD", sub="user"))
+
+        self.assertTrue(authenticator.authenticate(req, None, None, None))
+        self.assertEqual("user", req.context.user_id)
+
+    def test_wrong_audience(self):
+        authenticator = Authenticator(client_id="CliEnTiD", oauth_domain=self.idp.issuer)
+
+        with self.assertRaises(falcon.HTTPUnauthorized):
+            authenticator.authenticate(bearer(self.idp.issue_token(audience="other")), None, None, None)
+
+    def test_token_cache_skips_verification(self):
+        authenticator = Authenticator(client_id="CliEnTiD", oauth_domain=self.idp.issuer, token_cache_size=16)
+        token = self.idp.issue_token(audience="CliEnTiD", sub="user")
+
+        self.assertTrue(authenticator.authenticate(bearer(token), None, None, None))
+
+        with mock.patch.object(jwt_authenticator, 'verify_signature') as verify_signature:
+            req = bearer(token)
+            self.assertTrue(authenticator.authenticate(req, None, None, None))
+            verify_signature.assert_not_called()
+
+        self.assertEqual("user", req.context.user_id)
+        self.assertEqual(1, authenticator.token_cache.hits)
+
+    def test_token_cache_bounded_by_token_expiry(self):
+        authenticator = Authenticator(client_id="CliEnTiD", oauth_domain=self.idp.issuer, token_cache_size=16)
+        token = self.idp.issue_token(audience="CliEnTiD", expires_in=60)
+        authenticator.authenticate(bearer(token), None, None, None)
+
+        authenticator.token_cache.clock = lambda: jwt_authenticator.time.time() + 61
+        with mock.patch.object(jwt_authenticator, 'verify_signature') as verify_signature:
+            authenticator.authenticate(bearer(token), None, None, None)
+            verify_signature.assert_called_once()
+
+    def test_urlsafe_unpadded_token(self):
+        authenticator = Authenticator(client_id="CliEnTiD", oauth_domain=self.idp.issuer)
+        # '?>' chars are base64url encoded with '-' and '_'
+        token = self.idp.issue_token(audience="CliEnTiD", sub="???>>>", name="a")
+        self.assertTrue('-' in token.split('.')[1] or '_' in token.split('.')[1])
+
+        req = bearer(token)
+        self.assertTrue(authenticator.authenticate(req, None, None, None))
+        self.assertEqual("???>>>", req.context.user_id)
+
+    def test_expired_token(self):
+        authenticator = Authenticator(client_id="CliEnTiD", oauth_domain=self.idp.issuer)
+
+        with self.assertRaises(falcon.HTTPUnauthorized) as exception:
+            authenticator.authenticate(bearer(self.idp.issue_token(audience="CliEnTiD", expires_in=-10)),
+                                       None, None, None)
+
+        self.assertEqual(EXPIRED_TOKEN, exception.exception.code)
+
+    def test_bad_signature(self):
+        authenticator = Authenticator(client_id="CliEnTiD", oauth_domain=self.idp.issuer)
+        header, payload, signature = self.idp.issue_token(audience="CliEnTiD").split('.')
+        _, other_payload, _ = self.idp.issue_token(audience="CliEnTiD", sub="admin").split('.')
+
+        with self.assertRaises(falcon.HTTPUnauthorized) as exception:
+            authenticator.authenticate(bearer(f"{header}.{other_payload}.{signature}"), None, None, None)
+
+        self.assertEqual(BAD_TOKEN_SIGNATURE, exception.exception.code)
+
+    def test_unexpected_algorithm(self):
+        authenticator = Authenticator(client_id="CliEnTiD", oauth_domain=self.idp.issuer)
+        kid = next(iter(self.idp.private_keys))
+        token = pyjwt.encode({'aud': "CliEnTiD", 'iss': self.idp.issuer}, None, algorithm='none', headers={'kid': kid})
+
+        with self.assertRaises(falcon.HTTPUnauthorized) as exception:
+            authenticator.authenticate(bearer(token), None, None, None)
+
+        self.assertEqual(UNEXPECTED_TOKEN_ALGORITHM, exception.exception.code)
+
+    def test_elliptic_curve_and_edwards_keys(self):
+        kids = {kty: self.idp.add_key(kty=kty) for kty in ('EC', 'OKP')}
+        authenticator = Authenticator(client_id="CliEnTiD", oauth_domain=self.idp.issuer)
+
+        for kty, kid in kids.items():
+            req = bearer(self.idp.issue_token(audience="CliEnTiD", kid=kid, sub=kty))
+            self.assertTrue(authenticator.authenticate(req, None, None, None))
+            self.assertEqual(kty, req.context.user_id)
+
+    def test_algorithm_must_match_key_type(self):
+        authenticator = Authenticator(client_id="CliEnTiD", oauth_domain=self.idp.issuer)
+        rsa_kid = next(iter(self.idp.private_keys))
+        ec_kid = self.idp.add_key(kty='EC')
+        # signed with the EC key, but pointing to the RSA key
+        token = pyjwt.encode({'aud': "CliEnTiD", 'iss': self.idp.issuer}, self.idp.private_keys[ec_kid],
+                             algorithm='ES256', headers={'kid': rsa_kid})
+
+        with self.assertRaises(falcon.HTTPUnauthorized) as exception:
+            authenticator.authenticate(bearer(token), None, None, None)
+
+        self.assertEqual(UNEXPECTED_TOKEN_ALGORITHM, exception.exception.code)
+
+    def test_prewarm(self):
+        kid = self.idp.add_key(kty='OKP')
+        authenticator = Authenticator(client_id="CliEnTiD", oauth_domain=self.idp.issuer)
+
+        authenticator.prewarm()
+        self.assertIn(kid, authenticator.key_store.public_keys)
+        self.assertEqual(set(self.idp.private_keys), set(authenticator.key_store.public_keys))
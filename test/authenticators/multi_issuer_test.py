@@ -0,0 +1,127 @@
+import unittest
+
+import falcon
+
+from python_falcon_authenticator.authenticators.error_codes import UNKNOWN_TOKEN_ISSUER
+from python_falcon_authenticator.authenticators.multi_issuer import Authenticator
+from python_falcon_authenticator.http_client import HttpClient, IdpRequestError
+from python_falcon_authenticator.testing import StubIdentityProvider
+
+
+class Context:
+    pass
+
+
+class Request:
+    def __init__(self, token):
+        self.headers = {'AUTHORIZATION': f'Bearer {token}'}
+        self.context = Context()
+
+
+class TestMultiIssuerAuthenticator(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.first_idp = StubIdentityProvider().start()
+        cls.second_idp = StubIdentityProvider().start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.first_idp.stop()
+        cls.second_idp.stop()
+
+    def test_issuers(self):
+        authenticator = Authenticator(client_id="CliEnTiD", issuers=[self.first_idp.issuer, self.second_idp.issuer])
+
+        for idp in (self.first_idp, self.second_idp):
+            req = Request(idp.issue_token(audience="CliEnTiD", sub=idp.issuer))
+            self.assertTrue(authenticator.authenticate(req, None, None, None))
+            self.assertEqual(idp.issuer, req.context.user_id)
+
+    def test_unknown_issuer(self):
+        authenticator = Authenticator(client_id="CliEnTiD", issuers=[self.first_idp.issuer])
+
+        with self.assertRaises(falcon.HTTPUnauthorized) as context:
+            authenticator.authenticate(Request(self.second_idp.issue_token(audience="CliEnTiD")), None, None, None)
+        self.assertEqual(UNKNOWN_TOKEN_ISSUER, context.exception.code)
+
+    def test_token_of_another_issuer_keys(self):
+        authenticator = Authenticator(client_id="CliEnTiD", issuers=[self.first_idp.issuer, self.second_idp.issuer])
+        # claims to be issued by the first identity provider, but signed by the second one
+        token = self.second_idp.issue_token(audience="CliEnTiD", iss=self.first_idp.issuer)
+
+        with self.assertRaises(falcon.HTTPUnauthorized):
+            authenticator.authenticate(Request(token), None, None, None)
+
+    def test_issuer_templates(self):
+        idp = self.first_idp
+        authenticator = Authenticator(client_id="CliEnTiD", issuer_templates=[idp.issuer + "${TENANT_ID}/v2.0"],
+                                      tenant_filter=lambda tenant_id: tenant_id != "denied", max_tenants=1,
+                                      min_admission_interval=0, oidc_uri=idp.oidc_uri)
+
+        for tenant_id in ("first-tenant", "second-tenant", "first-tenant"):
+            req = Request(idp.issue_token(audience="CliEnTiD", iss=f"{idp.issuer}{tenant_id}/v2.0", sub=tenant_id))
+            self.assertTrue(authenticator.authenticate(req, None, None, None))
+            self.assertEqual(tenant_id, req.context.user_id)
+        self.assertEqual(1, len(authenticator.tenants))
+
+        for iss in (f"{idp.issuer}denied/v2.0", f"{idp.issuer}a/b/v2.0"):
+            with self.assertRaises(falcon.HTTPUnauthorized) as context:
+                authenticator.authenticate(Request(idp.issue_token(audience="CliEnTiD", iss=iss)), None, None, None)
+            self.assertEqual(UNKNOWN_TOKEN_ISSUER, context.exception.code)
+
+    def test_tenant_admitted_once_verified(self):
+        idp = self.first_idp
+        authenticator = Authenticator(client_id="CliEnTiD", issuer_templates=[idp.issuer + "${TENANT_ID}/v2.0"],
+                                      min_admission_interval=60, oidc_uri=idp.oidc_uri)
+        create_issuer_authenticator = authenticator.create_issuer_authenticator
+        created = []
+        authenticator.create_issuer_authenticator = lambda issuer: created.append(issuer) or \
+            create_issuer_authenticator(issuer)
+        # forged: signed by the keys of another identity provider
+        forged = self.second_idp.issue_token(audience="CliEnTiD", iss=f"{idp.issuer}tenant/v2.0")
+
+        for _ in range(2):
+            with self.assertRaises(falcon.HTTPUnauthorized):
+                authenticator.authenticate(Request(forged), None, None, None)
+        self.assertEqual(0, len(authenticator.tenants))
+
+        # the tenant isn't locked out, and its candidate is reused
+        self.assertTrue(authenticator.authenticate(
+            Request(idp.issue_token(audience="CliEnTiD", iss=f"{idp.issuer}tenant/v2.0")), None, None, None))
+        self.assertEqual(1, len(authenticator.tenants))
+        self.assertEqual([f"{idp.issuer}tenant/v2.0"], created)
+
+    def test_tenant_discovery_failure(self):
+        idp = self.first_idp
+        authenticator = Authenticator(client_id="CliEnTiD", issuer_templates=[idp.issuer + "${TENANT_ID}/v2.0"],
+                                      oidc_uri="http://127.0.0.1:1/.well-known/openid-configuration",
+                                      min_admission_interval=0, http_client=HttpClient(retries=0))
+        token = idp.issue_token(audience="CliEnTiD", iss=f"{idp.issuer}tenant/v2.0")
+
+        with self.assertRaises(IdpRequestError):
+            authenticator.authenticate(Request(token), None, None, None)
+        with self.assertRaises(falcon.HTTPUnauthorized) as context:
+            authenticator.authenticate(Request(token), None, None, None)
+        self.assertEqual(UNKNOWN_TOKEN_ISSUER, context.exception.code)
+
+    def test_tenant_admissions_rate_limited_per_tenant(self):
+        idp = self.first_idp
+        authenticator = Authenticator(client_id="CliEnTiD", issuer_templates=[idp.issuer + "${TENANT_ID}/v2.0"],
+                                      oidc_uri="http://127.0.0.1:1/.well-known/openid-configuration",
+                                      min_admission_interval=60, rejected_tenant_ttl=0,
+                                      http_client=HttpClient(retries=0))
+
+        for tenant_id in ("first", "second"):
+            token = idp.issue_token(audience="CliEnTiD", iss=f"{idp.issuer}{tenant_id}/v2.0")
+            with self.assertRaises(IdpRequestError):
+                authenticator.authenticate(Request(token), None, None, None)
+
+            # not rejected, but not tried again before min_admission_interval
+            with self.assertRaises(falcon.HTTPUnauthorized) as context:
+                authenticator.authenticate(Request(token), None, None, None)
+            self.assertEqual(UNKNOWN_TOKEN_ISSUER, context.exception.code)
+
+    def test_issuer_specific_arguments(self):
+        for kwargs in ({'key_store': None}, {'jwks_snapshot_path': "jwks.json"}):
+            with self.assertRaises(AssertionError):
+                Authenticator(client_id="CliEnTiD", issuers=[self.first_idp.issuer], **kwargs)
@@ -1,6 +1,9 @@
 import base64
+import os
+import tempfile
 import unittest
 import uuid
+from unittest import mock
 
 import falcon
 
@@ -8,6 +11,7 @@ from python_falcon_authenticator.authenticators.error_codes import MISSING_AUTHO
     UNEXPECTED_AUTHORIZATION_HEADER_TYPE, EMPTY_AUTHORIZATION_HEADER_CREDENTIALS, WRONG_CREDENTIALS, \
     BAD_AUTHORIZATION_HEADER_CREDENTIALS
 from python_falcon_authenticator.authenticators.static_basic import Authenticator
+from python_falcon_authenticator.credential_store import CredentialStore, SCRYPT, hash_password
 
 
 class Request:
@@ -77,14 +81,17 @@ class TestStaticBasicAuthenticator(unittest.TestCase):
 
         self.assertEqual(BAD_AUTHORIZATION_HEADER_CREDENTIALS, exception.exception.code)
 
-    def test_extra_column(self):
-        with self.assertRaises(falcon.HTTPUnauthorized) as exception:
-            authenticator = Authenticator(username="username", password="Passw0rd")
+    def test_password_with_colon(self):
+        authenticator = Authenticator(username="username", password="pass:w0rd")
 
-            header = base64.b64encode(f"username:password:password".encode("utf8")).decode('ascii')
-            self.assertTrue(authenticator.authenticate(Request({'AUTHORIZATION': f'Basic {header}'}), None, None, None))
+        header = base64.b64encode(f"username:pass:w0rd".encode("utf8")).decode('ascii')
+        self.assertTrue(authenticator.authenticate(Request({'AUTHORIZATION': f'Basic {header}'}), None, None, None))
 
-        self.assertEqual(BAD_AUTHORIZATION_HEADER_CREDENTIALS, exception.exception.code)
+        with self.assertRaises(falcon.HTTPUnauthorized) as exception:
+            header = base64.b64encode(f"username:pass:w0rd:".encode("utf8")).decode('ascii')
+            authenticator.authenticate(Request({'AUTHORIZATION': f'Basic {header}'}), None, None, None)
+
+        self.assertEqual(WRONG_CREDENTIALS, exception.exception.code)
 
     def test_wrong_credentials(self):
         with self.assertRaises(falcon.HTTPUnauthorized) as exception:
@@ -94,3 +101,72 @@ class TestStaticBasicAuthenticator(unittest.TestCase):
             self.assertTrue(authenticator.authenticate(Request({'AUTHORIZATION': f'Basic {header}'}), None, None, None))
 
         self.assertEqual(WRONG_CREDENTIALS, exception.exception.code)
+
+
+class TestStaticBasicAuthenticatorCredentialStore(unittest.TestCase):
+    def setUp(self):
+        self.credentials = CredentialStore.from_passwords({"alice": "Passw0rd", "bob": "s3cret"}, iterations=1000)
+        self.authenticator = Authenticator(credentials=self.credentials)
+
+    @staticmethod
+    def request(username, password):
+        header = base64.b64encode(f"{username}:{password}".encode("utf8")).decode('ascii')
+        return Request({'AUTHORIZATION': f'Basic {header}'})
+
+    def test_success(self):
+        self.assertTrue(self.authenticator.authenticate(self.request("alice", "Passw0rd"), None, None, None))
+        self.assertTrue(self.authenticator.authenticate(self.request("bob", "s3cret"), None, None, None))
+
+    def test_password_with_colon(self):
+        authenticator = Authenticator(credentials=CredentialStore.from_passwords({"carol": "a:b:c"}, iterations=1000))
+        self.assertTrue(authenticator.authenticate(self.request("carol", "a:b:c"), None, None, None))
+
+    def test_wrong_password(self):
+        with self.assertRaises(falcon.HTTPUnauthorized) as exception:
+            self.authenticator.authenticate(self.request("alice", "s3cret"), None, None, None)
+
+        self.assertEqual(WRONG_CREDENTIALS, exception.exception.code)
+
+    def test_unknown_user(self):
+        with self.assertRaises(falcon.HTTPUnauthorized) as exception:
+            self.authenticator.authenticate(self.request("carol", "Passw0rd"), None, None, None)
+
+        self.assertEqual(WRONG_CREDENTIALS, exception.exception.code)
+
+    def test_verification_cache_skips_hashing(self):
+        self.authenticator.authenticate(self.request("alice", "Passw0rd"), None, None, None)
+
+        with mock.patch.object(self.credentials, 'verify') as verify:
+            self.assertTrue(self.authenticator.authenticate(self.request("alice", "Passw0rd"), None, None, None))
+            verify.assert_not_called()
+
+    def test_changed_password_invalidates_cache(self):
+        self.authenticator.authenticate(self.request("alice", "Passw0rd"), None, None, None)
+        self.credentials.set_password("alice", "n3w", iterations=1000)
+
+        with self.assertRaises(falcon.HTTPUnauthorized):
+            self.authenticator.authenticate(self.request("alice", "Passw0rd"), None, None, None)
+
+    def test_scrypt_from_file(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+            f.write(f"# users\nalice:{hash_password('Passw0rd', SCRYPT, n=2 ** 10)}\n")
+
+        try:
+            authenticator = Authenticator(credentials=CredentialStore.from_file(f.name))
+            self.assertTrue(authenticator.authenticate(self.request("alice", "Passw0rd"), None, None, None))
+        finally:
+            os.unlink(f.name)
+
+    def test_malformed_file_lines(self):
+        valid = hash_password('Passw0rd', iterations=1000)
+        for line in ("alice", "bob:plaintext", "bob:pbkdf2_sha256$1000$c2FsdA==", "bob:pbkdf2_sha256$x$c2FsdA==$aGFzaA==",
+                     "bob:" + valid[:-4] + "!!!!"):
+            with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as f:
+                f.write(f"# users\nalice:{valid}\n{line}\n")
+
+            try:
+                with self.assertRaises(ValueError) as context:
+                    CredentialStore.from_file(f.name)
+                self.assertIn(f"{f.name}:3:", str(context.exception))
+            finally:
+                os.unlink(f.name)
@@ -0,0 +1,78 @@
+import unittest
+
+import falcon
+import falcon.testing
+
+from python_falcon_authenticator import PythonFalconAuthenticator, BaseAuthenticator
+from python_falcon_authenticator.claims import CLAIMS_CONTEXT_ATTR, ClaimsView, VerifiedClaims
+from python_falcon_authenticator.decorators import resource_auth_config
+
+VERIFIED = VerifiedClaims({'sub': "user", 'tenant': "acme", 'groups': ["admins", "users"], 'address': {'city': "Liège"}})
+
+
+class VerifiedAuthenticator(BaseAuthenticator):
+    def authenticate(self, req, resp, resource, params) -> bool:
+        setattr(req.context, CLAIMS_CONTEXT_ATTR, VERIFIED)
+        return True
+
+
+class Resource:
+    def on_get(self, req, resp):
+        claims = getattr(req.context, 'claims', None)
+        resp.media = {'claims': None if claims is None else sorted(claims), 'sub': None if claims is None else claims.sub}
+
+
+@resource_auth_config(claims=['sub', 'tenant'])
+class TenantResource(Resource):
+    pass
+
+
+class TestClaimsView(unittest.TestCase):
+    def test_read_only(self):
+        view = ClaimsView(VERIFIED.payload)
+
+        self.assertEqual(("admins", "users"), view.groups)
+        self.assertEqual("Liège", view['address'].city)
+        with self.assertRaises(TypeError):
+            view['sub'] = "other"
+        with self.assertRaises(AttributeError):
+            view.unknown
+
+    def test_projection(self):
+        view = ClaimsView(VERIFIED.payload, frozenset(['sub', 'groups', 'missing']))
+
+        self.assertEqual(['sub', 'groups'], list(view))
+        self.assertEqual(2, len(view))
+        with self.assertRaises(KeyError):
+            view['tenant']
+
+    def test_claims_are_converted_on_access_only(self):
+        view = ClaimsView(VERIFIED.payload)
+        view.sub
+
+        self.assertEqual(['sub'], list(view._converted))
+
+    def test_views_are_shared_by_the_requests_of_a_token(self):
+        projection = frozenset(['sub'])
+        self.assertIs(VERIFIED.view(projection), VERIFIED.view(frozenset(['sub'])))
+        self.assertIsNot(VERIFIED.view(projection), VERIFIED.view())
+
+
+class TestRouteClaims(unittest.TestCase):
+    def create_client(self, **kwargs):
+        app = falcon.App(middleware=[PythonFalconAuthenticator(VerifiedAuthenticator(), **kwargs)])
+        app.add_route("/tenant", TenantResource())
+        app.add_route("/other", Resource())
+        return falcon.testing.TestClient(app)
+
+    def test_projected_claims(self):
+        client = self.create_client()
+
+        self.assertEqual({'claims': ['sub', 'tenant'], 'sub': "user"}, client.simulate_get("/tenant").json)
+        self.assertIsNone(client.simulate_get("/other").json['claims'])
+
+    def test_claims_view_of_every_route(self):
+        client = self.create_client(claims_view=True)
+
+        self.assertEqual(['sub', 'tenant'], client.simulate_get("/tenant").json['claims'])
+        self.assertEqual(['address', 'groups', 'sub', 'tenant'], client.simulate_get("/other").json['claims'])
@@ -0,0 +1,96 @@
+import socket
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from python_falcon_authenticator.http_client import HttpClient, IdpConnectionError, IdpResponseError, \
+    IdpInvalidJsonError
+
+
+class StubServer:
+    """answer each GET with the next (status, body[, headers]) of responses, the last one being repeated"""
+    def __init__(self, responses, delay=0):
+        self.responses = list(responses)
+        self.delay = delay
+        self.request_count = 0
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, body, *headers = stub.responses[min(stub.request_count, len(stub.responses) - 1)]
+                stub.request_count += 1
+                time.sleep(stub.delay)
+
+                payload = body.encode('utf8')
+                self.send_response(status)
+                self.send_header('Content-Length', str(len(payload)))
+                for name, value in (headers[0] if headers else {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.uri = f"http://127.0.0.1:{self.server.server_address[1]}/doc"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestHttpClient(unittest.TestCase):
+    def test_get_json(self):
+        with StubServer([(200, '{"a": 1}')]) as server:
+            body, headers = HttpClient().get_json(server.uri)
+
+        self.assertEqual({'a': 1}, body)
+        self.assertEqual('8', headers['Content-Length'])
+
+    def test_retries_unavailable(self):
+        with StubServer([(503, 'unavailable'), (200, '{"a": 1}')]) as server:
+            body, _ = HttpClient(retries=2, backoff_factor=0).get_json(server.uri)
+
+        self.assertEqual({'a': 1}, body)
+        self.assertEqual(2, server.request_count)
+
+    def test_retry_after_is_not_waited_for(self):
+        with StubServer([(503, 'unavailable', {'Retry-After': '30'}), (200, '{"a": 1}')]) as server:
+            started_at = time.monotonic()
+            body, _ = HttpClient(retries=2, backoff_factor=0).get_json(server.uri)
+
+        self.assertEqual({'a': 1}, body)
+        self.assertLess(time.monotonic() - started_at, 5)
+
+    def test_response_error(self):
+        with StubServer([(404, 'not found')]) as server:
+            with self.assertRaises(IdpResponseError) as context:
+                HttpClient().get_json(server.uri, error_title="Failed to load JWKS")
+
+        self.assertEqual("Failed to load JWKS", context.exception.title)
+        self.assertIn("404", context.exception.description)
+
+    def test_invalid_json(self):
+        with StubServer([(200, '<html>login</html>')]) as server:
+            with self.assertRaises(IdpInvalidJsonError):
+                HttpClient().get_json(server.uri)
+
+    def test_connection_refused(self):
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+
+        with self.assertRaises(IdpConnectionError):
+            HttpClient(retries=0).get_json(f"http://127.0.0.1:{port}/doc")
+
+    def test_read_timeout(self):
+        with StubServer([(200, '{}')], delay=0.5) as server:
+            with self.assertRaises(IdpConnectionError):
+                HttpClient(read_timeout=0.1, retries=0).get_json(server.uri)
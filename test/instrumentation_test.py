@@ -0,0 +1,97 @@
+import base64
+import unittest
+
+import falcon
+import falcon.testing
+
+from python_falcon_authenticator import PythonFalconAuthenticator
+from python_falcon_authenticator.authenticators.error_codes import WRONG_CREDENTIALS
+from python_falcon_authenticator.authenticators.jwt import Authenticator as JwtAuthenticator
+from python_falcon_authenticator.authenticators.static_basic import Authenticator as BasicAuthenticator
+from python_falcon_authenticator.instrumentation import Metrics, PrometheusResource
+from python_falcon_authenticator.testing import StubIdentityProvider
+
+
+def basic(username, password):
+    return {'Authorization': 'Basic ' + base64.b64encode(f"{username}:{password}".encode('utf8')).decode('ascii')}
+
+
+class Resource:
+    def on_get(self, req, resp):
+        resp.media = {"hello": "world"}
+
+
+def create_client(authenticators, **kwargs):
+    app = falcon.App(middleware=[PythonFalconAuthenticator(authenticators, **kwargs)])
+    app.add_route("/resource", Resource())
+    return falcon.testing.TestClient(app)
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_disabled_by_default(self):
+        client = create_client(BasicAuthenticator(username="username", password="Passw0rd"))
+        result = client.simulate_get("/resource", headers=basic("username", "Passw0rd"))
+
+        self.assertEqual(200, result.status_code)
+        self.assertNotIn('Server-Timing', result.headers)
+
+    def test_server_timing_requires_instrumentation(self):
+        with self.assertRaises(AssertionError):
+            PythonFalconAuthenticator(BasicAuthenticator(username="username", password="Passw0rd"), server_timing=True)
+
+    def test_basic_counters(self):
+        metrics = Metrics()
+        client = create_client(BasicAuthenticator(username="username", password="Passw0rd"), instrumentation=metrics,
+                               server_timing=True)
+
+        result = client.simulate_get("/resource", headers=basic("username", "Passw0rd"))
+        self.assertIn('auth-verify;dur=', result.headers['Server-Timing'])
+        self.assertIn('auth-total;dur=', result.headers['Server-Timing'])
+
+        result = client.simulate_get("/resource", headers=basic("username", "wrong"))
+        self.assertEqual(401, result.status_code)
+        self.assertIn('auth-total;dur=', result.headers['Server-Timing'])
+
+        self.assertEqual(1, metrics.get_counter('auth_requests_total', outcome='success'))
+        self.assertEqual(1, metrics.get_counter('auth_requests_total', outcome='failure', code=WRONG_CREDENTIALS))
+        self.assertEqual(2, metrics.get_histogram_count('auth_request_seconds'))
+        self.assertEqual(2, metrics.get_histogram_count('auth_stage_seconds', stage='header'))
+
+    def test_jwt_stages(self):
+        metrics = Metrics()
+        with StubIdentityProvider() as idp:
+            authenticator = JwtAuthenticator(client_id="CliEnTiD", oauth_domain=idp.issuer, token_cache_size=16)
+            client = create_client(authenticator, instrumentation=metrics, server_timing=True)
+            headers = {'Authorization': f'Bearer {idp.issue_token(audience="CliEnTiD", sub="user")}'}
+
+            server_timing = client.simulate_get("/resource", headers=headers).headers['Server-Timing']
+            client.simulate_get("/resource", headers=headers)
+
+        for stage in ('header', 'parse', 'key-lookup', 'verify', 'context-builder', 'total'):
+            self.assertIn(f'auth-{stage};dur=', server_timing)
+
+        self.assertEqual(1, metrics.get_counter('auth_jwks_fetches_total', outcome='success'))
+        self.assertEqual(1, metrics.get_counter('auth_cache_total', cache='token', result='miss'))
+        self.assertEqual(1, metrics.get_counter('auth_cache_total', cache='token', result='hit'))
+        self.assertEqual(1, metrics.get_histogram_count('auth_stage_seconds', stage='verify'))
+
+    def test_prometheus(self):
+        metrics = Metrics(buckets=(0.1, 1))
+        metrics.increment('auth_requests_total', outcome='failure', code='e"1')
+        metrics.observe('auth_request_seconds', 0.5)
+
+        app = falcon.App()
+        app.add_route("/metrics", PrometheusResource(metrics))
+        result = falcon.testing.TestClient(app).simulate_get("/metrics")
+
+        self.assertTrue(result.headers['Content-Type'].startswith('text/plain; version=0.0.4'))
+        self.assertEqual(
+            '# TYPE auth_requests_total counter\n'
+            'auth_requests_total{code="e\\"1",outcome="failure"} 1\n'
+            '# TYPE auth_request_seconds histogram\n'
+            'auth_request_seconds_bucket{le="0.1"} 0\n'
+            'auth_request_seconds_bucket{le="1"} 1\n'
+            'auth_request_seconds_bucket{le="+Inf"} 1\n'
+            'auth_request_seconds_sum 0.5\n'
+            'auth_request_seconds_count 1\n',
+            result.text)
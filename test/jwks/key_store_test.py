@@ -0,0 +1,163 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from python_falcon_authenticator.jwks import JwksKeyStore
+from python_falcon_authenticator.jwks.key_store import http_cache_ttl
+from python_falcon_authenticator.testing import StubIdentityProvider
+
+
+class TestHttpCacheTtl(unittest.TestCase):
+    def test_max_age(self):
+        self.assertEqual(300, http_cache_ttl({'Cache-Control': 'public, max-age=300'}, 0))
+
+    def test_max_age_minus_age(self):
+        self.assertEqual(200, http_cache_ttl({'Cache-Control': 'max-age=300', 'Age': '100'}, 0))
+
+    def test_no_cache(self):
+        self.assertEqual(0, http_cache_ttl({'Cache-Control': 'no-cache, max-age=300'}, 0))
+
+    def test_expires(self):
+        self.assertEqual(60, http_cache_ttl({'Expires': 'Thu, 01 Jan 1970 00:01:00 GMT'}, 0))
+
+    def test_unknown(self):
+        self.assertIsNone(http_cache_ttl({}, 0))
+
+
+class TestJwksKeyStore(unittest.TestCase):
+    def setUp(self):
+        self.idp = StubIdentityProvider().start()
+        self.kid = next(iter(self.idp.private_keys))
+
+    def tearDown(self):
+        self.idp.stop()
+
+    def test_honors_cache_control(self):
+        self.idp.jwks_headers = {'Cache-Control': 'max-age=600'}
+        key_store = JwksKeyStore(oidc_uri=self.idp.oidc_uri, clock=lambda: 1000)
+
+        self.assertIsNotNone(key_store.get_public_key(self.kid))
+        self.assertEqual(1600, key_store.expires_at)
+        self.assertEqual(1540, key_store.refresh_at)
+
+    def test_concurrent_fetches_are_collapsed(self):
+        self.idp.jwks_delay = 0.2
+        key_store = JwksKeyStore(oidc_uri=self.idp.oidc_uri)
+
+        threads = [threading.Thread(target=key_store.get_public_key, args=(self.kid,)) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(1, self.idp.request_counts[StubIdentityProvider.JWKS_PATH])
+        self.assertIn(self.kid, key_store.public_keys)
+
+    def test_serves_stale_keys_while_revalidating(self):
+        now = [1000]
+        key_store = JwksKeyStore(oidc_uri=self.idp.oidc_uri, clock=lambda: now[0])
+        public_key = key_store.get_public_key(self.kid)
+
+        self.idp.jwks_delay = 0.2
+        now[0] = key_store.expires_at + 1
+        self.assertIs(public_key, key_store.get_public_key(self.kid))
+        self.assertIsNotNone(key_store._flight)
+
+        key_store.refresh()
+        self.assertEqual(2, self.idp.request_counts[StubIdentityProvider.JWKS_PATH])
+
+    def test_unknown_kid_is_negatively_cached(self):
+        key_store = JwksKeyStore(oidc_uri=self.idp.oidc_uri, min_refresh_interval=0)
+
+        self.assertIsNone(key_store.get_public_key("unknown"))
+        self.assertIsNone(key_store.get_public_key("unknown"))
+
+        self.assertEqual(1, self.idp.request_counts[StubIdentityProvider.JWKS_PATH])
+        self.assertEqual(1, key_store.unknown_kid_hits)
+        self.assertEqual(1, key_store.unknown_kid_misses)
+
+    def test_unknown_kid_refresh_rate_limited(self):
+        key_store = JwksKeyStore(oidc_uri=self.idp.oidc_uri, min_refresh_interval=60)
+        key_store.get_public_key(self.kid)
+
+        for i in range(10):
+            self.assertIsNone(key_store.get_public_key(f"unknown-{i}"))
+
+        self.assertEqual(1, self.idp.request_counts[StubIdentityProvider.JWKS_PATH])
+        self.assertEqual(10, len(key_store.unknown_kids))
+
+    def test_key_rotated_in_after_refresh_is_fetched_once_allowed(self):
+        now = [1000]
+        key_store = JwksKeyStore(oidc_uri=self.idp.oidc_uri, min_refresh_interval=30, clock=lambda: now[0])
+        key_store.get_public_key(self.kid)
+
+        kid = self.idp.add_key()
+        now[0] = 1010
+        self.assertIsNone(key_store.get_public_key(kid))
+        self.assertEqual(1, self.idp.request_counts[StubIdentityProvider.JWKS_PATH])
+
+        # not checked against any newer key set => not rejected beyond the next refresh allowed
+        now[0] = 1030
+        self.assertIsNotNone(key_store.get_public_key(kid))
+        self.assertEqual(2, self.idp.request_counts[StubIdentityProvider.JWKS_PATH])
+
+        # still unknown after a refresh started once seen => rejected for unknown_kid_ttl
+        now[0] = 1060
+        self.assertIsNone(key_store.get_public_key("unknown"))
+        now[0] = 1300
+        self.assertIsNone(key_store.get_public_key("unknown"))
+        self.assertEqual(3, self.idp.request_counts[StubIdentityProvider.JWKS_PATH])
+
+    def test_rotated_key_is_fetched(self):
+        key_store = JwksKeyStore(oidc_uri=self.idp.oidc_uri, min_refresh_interval=0)
+        key_store.get_public_key(self.kid)
+
+        kid = self.idp.add_key()
+        self.assertIsNotNone(key_store.get_public_key(kid))
+
+    def test_snapshot_cold_start(self):
+        with tempfile.TemporaryDirectory() as directory:
+            snapshot_path = os.path.join(directory, "jwks.json")
+            JwksKeyStore(oidc_uri=self.idp.oidc_uri, snapshot_path=snapshot_path).get_public_key(self.kid)
+
+            key_store = JwksKeyStore(oidc_uri=self.idp.oidc_uri, snapshot_path=snapshot_path)
+            self.assertIsNotNone(key_store.get_public_key(self.kid))
+            self.assertEqual(self.idp.jwks_uri, key_store.jwks_uri)
+
+            self.assertEqual(1, self.idp.request_counts[StubIdentityProvider.OIDC_PATH])
+            self.assertEqual(1, self.idp.request_counts[StubIdentityProvider.JWKS_PATH])
+
+    def test_expired_snapshot_is_revalidated_in_background(self):
+        with tempfile.TemporaryDirectory() as directory:
+            snapshot_path = os.path.join(directory, "jwks.json")
+            JwksKeyStore(oidc_uri=self.idp.oidc_uri, snapshot_path=snapshot_path).get_public_key(self.kid)
+
+            key_store = JwksKeyStore(oidc_uri=self.idp.oidc_uri, snapshot_path=snapshot_path,
+                                     clock=lambda: time.time() + 7200)
+            self.assertIsNotNone(key_store.get_public_key(self.kid))
+            self.assertIsNotNone(key_store._flight)
+
+    def test_too_old_snapshot_is_ignored(self):
+        with tempfile.TemporaryDirectory() as directory:
+            snapshot_path = os.path.join(directory, "jwks.json")
+            JwksKeyStore(oidc_uri=self.idp.oidc_uri, snapshot_path=snapshot_path).get_public_key(self.kid)
+
+            key_store = JwksKeyStore(oidc_uri=self.idp.oidc_uri, snapshot_path=snapshot_path, max_snapshot_age=60,
+                                     clock=lambda: time.time() + 120)
+            self.assertEqual({}, key_store.jwks)
+
+    def test_malformed_snapshot_is_ignored(self):
+        with tempfile.TemporaryDirectory() as directory:
+            snapshot_path = os.path.join(directory, "jwks.json")
+            for snapshot in ({'version': 1}, {'version': 1, 'jwks_uri': self.idp.jwks_uri, 'jwks': {'keys': {}},
+                                              'fetched_at': time.time()}):
+                with open(snapshot_path, 'w', encoding='utf8') as f:
+                    json.dump(snapshot, f)
+
+                with self.assertLogs('python_falcon_authenticator.jwks', level='WARNING'):
+                    key_store = JwksKeyStore(oidc_uri=self.idp.oidc_uri, snapshot_path=snapshot_path)
+                self.assertEqual({}, key_store.jwks)
+                self.assertIsNotNone(key_store.get_public_key(self.kid))
@@ -0,0 +1,172 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from python_falcon_authenticator.jwks import JwksKeyStore, MmapSharedBackend, RedisSharedBackend
+from python_falcon_authenticator.jwks.async_key_store import AsyncJwksKeyStore
+from python_falcon_authenticator.jwks.shared import _HEADER
+from python_falcon_authenticator.testing import StubIdentityProvider
+
+
+class FakeRedis:
+    """in memory stand-in of the redis-py client methods used by RedisSharedBackend"""
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        value = self.values.get(key)
+        return None if value is None else str(value).encode('utf8')
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    def eval(self, script, numkeys, *keys_and_args):
+        # only the script of RedisSharedBackend.store is supported
+        assert script == RedisSharedBackend.STORE_SCRIPT and numkeys == 2
+        version_key, key, state = keys_and_args
+        version = int(self.values.get(version_key, 0)) + 1
+        self.values[version_key] = version
+        self.values[key] = f'{{"version": {version}, "state": {state}}}'
+        return version
+
+    def delete(self, key):
+        self.values.pop(key, None)
+
+
+class TestMmapSharedBackend(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "jwks.shm")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_store_and_load(self):
+        writer, reader = MmapSharedBackend(self.path), MmapSharedBackend(self.path)
+        self.assertEqual(0, reader.get_version())
+        self.assertIsNone(reader.load())
+
+        self.assertEqual(1, writer.store({'a': 1}))
+        self.assertEqual(2, writer.store({'a': 2}))
+
+        self.assertEqual(2, reader.get_version())
+        self.assertEqual((2, {'a': 2}), reader.load())
+
+    def test_writer_died_mid_write(self):
+        writer, reader = MmapSharedBackend(self.path), MmapSharedBackend(self.path, load_timeout=0.05)
+        writer.store({'a': 1})
+        # odd sequence, as left by a writer dying between its two header writes
+        sequence, version, length = _HEADER.unpack_from(writer._mmap, 0)
+        _HEADER.pack_into(writer._mmap, 0, sequence + 1, version, length)
+
+        self.assertIsNone(reader.load())
+        self.assertEqual(2, writer.store({'a': 2}))
+        self.assertEqual((2, {'a': 2}), reader.load())
+
+    def test_too_large(self):
+        with self.assertRaises(ValueError):
+            MmapSharedBackend(self.path, size=64).store({'a': "x" * 100})
+
+    def test_single_refresh(self):
+        first, second = MmapSharedBackend(self.path), MmapSharedBackend(self.path)
+        self.assertTrue(first.acquire_refresh())
+        self.assertFalse(second.acquire_refresh())
+
+        first.release_refresh()
+        self.assertTrue(second.acquire_refresh())
+
+    @unittest.skipUnless(hasattr(os, 'fork'), "requires fork")
+    def test_single_refresh_after_fork(self):
+        backend = MmapSharedBackend(self.path)
+        self.assertTrue(backend.acquire_refresh())
+
+        pid = os.fork()
+        if pid == 0:
+            # the lease of the parent isn't shared with the forked process
+            os._exit(0 if not backend.acquire_refresh() else 1)
+
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(0, os.waitstatus_to_exitcode(status))
+        backend.release_refresh()
+        self.assertTrue(MmapSharedBackend(self.path).acquire_refresh())
+
+
+class TestSharedKeyStore(unittest.TestCase):
+    def setUp(self):
+        self.idp = StubIdentityProvider().start()
+        self.kid = next(iter(self.idp.private_keys))
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "jwks.shm")
+
+    def tearDown(self):
+        self.idp.stop()
+        self.directory.cleanup()
+
+    def create_key_store(self, backend, **kwargs):
+        return JwksKeyStore(oidc_uri=self.idp.oidc_uri, shared_backend=backend, **kwargs)
+
+    def test_single_fetch(self):
+        first = self.create_key_store(MmapSharedBackend(self.path))
+        self.assertIsNotNone(first.get_public_key(self.kid))
+
+        # e.g. a worker started later
+        second = self.create_key_store(MmapSharedBackend(self.path))
+        self.assertIsNotNone(second.get_public_key(self.kid))
+
+        self.assertEqual(1, self.idp.request_counts[self.idp.JWKS_PATH])
+        self.assertEqual(1, self.idp.request_counts[self.idp.OIDC_PATH])
+
+    def test_rotation(self):
+        first = self.create_key_store(MmapSharedBackend(self.path), min_refresh_interval=0)
+        second = self.create_key_store(MmapSharedBackend(self.path), min_refresh_interval=0)
+        self.assertIsNotNone(first.get_public_key(self.kid))
+        self.assertIsNotNone(second.get_public_key(self.kid))
+
+        kid = self.idp.rotate_key()
+        self.assertIsNotNone(first.get_public_key(kid))
+        self.assertIsNotNone(second.get_public_key(kid))
+
+        self.assertEqual(2, self.idp.request_counts[self.idp.JWKS_PATH])
+
+    def test_fetch_when_refreshing_process_is_stuck(self):
+        stuck = MmapSharedBackend(self.path)
+        self.assertTrue(stuck.acquire_refresh())
+
+        key_store = self.create_key_store(MmapSharedBackend(self.path), shared_wait=0.1)
+        self.assertIsNotNone(key_store.get_public_key(self.kid))
+        self.assertEqual(1, self.idp.request_counts[self.idp.JWKS_PATH])
+
+    def test_async_key_store_polls_shared_key_set(self):
+        first = self.create_key_store(MmapSharedBackend(self.path))
+        self.assertIsNotNone(first.get_public_key(self.kid))
+
+        async def run():
+            key_store = AsyncJwksKeyStore(oidc_uri=self.idp.oidc_uri, shared_backend=MmapSharedBackend(self.path),
+                                          shared_poll_interval=0)
+            try:
+                self.assertIsNotNone(await key_store.get_public_key_async(self.kid))
+
+                # published by another worker
+                first.refresh()
+                self.assertIsNotNone(await key_store.get_public_key_async(self.kid))
+                self.assertEqual(first.shared_version, key_store.shared_version)
+            finally:
+                await key_store.aclose()
+
+        asyncio.run(run())
+        self.assertEqual(2, self.idp.request_counts[self.idp.JWKS_PATH])
+
+    def test_redis(self):
+        redis = FakeRedis()
+        first = self.create_key_store(RedisSharedBackend(redis))
+        self.assertIsNotNone(first.get_public_key(self.kid))
+
+        second = self.create_key_store(RedisSharedBackend(redis))
+        self.assertIsNotNone(second.get_public_key(self.kid))
+
+        self.assertEqual(1, self.idp.request_counts[self.idp.JWKS_PATH])
+        self.assertNotIn(RedisSharedBackend(redis).lease_key, redis.values)
@@ -0,0 +1,54 @@
+import importlib.util
+import subprocess
+import sys
+import unittest
+from unittest import mock
+
+from python_falcon_authenticator.authenticators.jwt import Authenticator as JwtAuthenticator
+from python_falcon_authenticator.utils.optional_dependencies import MissingDependencyError, require, import_optional
+
+
+class TestOptionalDependencies(unittest.TestCase):
+    def test_require(self):
+        require('json')
+
+        with self.assertRaises(MissingDependencyError) as context:
+            require('not_installed_module', package='not-installed', feature="Some feature")
+        self.assertIn("Some feature requires the 'not-installed' package", str(context.exception))
+        self.assertIn("pip install not-installed", str(context.exception))
+
+    def test_import_optional(self):
+        self.assertEqual('json', import_optional('json').__name__)
+
+        with self.assertRaises(MissingDependencyError):
+            import_optional('not_installed_module.submodule')
+
+    def test_jwt_authenticator_reports_missing_dependency(self):
+        find_spec = importlib.util.find_spec
+
+        def find_spec_without_jwt(name, *args):
+            return None if name == 'jwt' else find_spec(name, *args)
+
+        with mock.patch('importlib.util.find_spec', find_spec_without_jwt):
+            with self.assertRaises(MissingDependencyError) as context:
+                JwtAuthenticator(client_id="CliEnTiD", oauth_domain="https://oauth.auth.com/")
+        self.assertIn("pip install PyJWT", str(context.exception))
+
+    def test_peer_dependencies_are_imported_lazily(self):
+        code = ("import sys\n"
+                "import python_falcon_authenticator\n"
+                "from python_falcon_authenticator.authenticators.jwt import Authenticator\n"
+                "Authenticator(client_id='CliEnTiD', oauth_domain='https://oauth.auth.com/')\n"
+                "print(','.join(name for name in ('jwt', 'cryptography', 'requests', 'httpx') if name in sys.modules))")
+        output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout
+
+        self.assertEqual("", output.strip())
+
+    def test_lazy_exports(self):
+        import python_falcon_authenticator
+        from python_falcon_authenticator.python_falcon_authenticator import PythonFalconAuthenticator
+
+        self.assertIs(PythonFalconAuthenticator, python_falcon_authenticator.PythonFalconAuthenticator)
+        self.assertIn('PythonFalconAuthenticator', dir(python_falcon_authenticator))
+        with self.assertRaises(AttributeError):
+            python_falcon_authenticator.NotExported
@@ -0,0 +1,109 @@
+import base64
+import unittest
+from unittest import mock
+
+import falcon
+import falcon.testing
+
+from python_falcon_authenticator import PythonFalconAuthenticator
+from python_falcon_authenticator.authenticator_chain import AuthenticatorChain
+from python_falcon_authenticator.authenticators.error_codes import MISSING_AUTHORIZATION_HEADER, \
+    UNEXPECTED_AUTHORIZATION_HEADER_TYPE, WRONG_CREDENTIALS
+from python_falcon_authenticator.authenticators.jwt import Authenticator as JwtAuthenticator
+from python_falcon_authenticator.authenticators.static_basic import Authenticator as BasicAuthenticator
+from python_falcon_authenticator.decorators import resource_auth_config
+from python_falcon_authenticator.utils.route_requests_with_responder import RouterWithRequestResponder
+
+
+def basic(username, password):
+    return {'Authorization': 'Basic ' + base64.b64encode(f"{username}:{password}".encode('utf8')).decode('ascii')}
+
+
+@resource_auth_config(skip_methods=['POST'], skip_responders=['on_get_public'])
+class UsersResource:
+    def on_get(self, req, resp):
+        resp.media = {"hello": "world"}
+
+    def on_post(self, req, resp):
+        resp.media = {"hello": "world"}
+
+    def on_get_public(self, req, resp):
+        resp.media = {"hello": "world"}
+
+
+class TestPythonFalconAuthenticator(unittest.TestCase):
+    def setUp(self):
+        self.middleware = PythonFalconAuthenticator(BasicAuthenticator(username="username", password="Passw0rd"))
+        app = falcon.App(middleware=[self.middleware], router=RouterWithRequestResponder())
+        app.add_route("/users", UsersResource())
+        app.add_route("/users/public", UsersResource(), suffix="public")
+        self.client = falcon.testing.TestClient(app)
+
+    def test_authenticated(self):
+        self.assertEqual(200, self.client.simulate_get("/users", headers=basic("username", "Passw0rd")).status_code)
+
+    def test_unauthenticated(self):
+        self.assertEqual(401, self.client.simulate_get("/users").status_code)
+        self.assertEqual(401, self.client.simulate_get("/users", headers=basic("username", "wrong")).status_code)
+
+    def test_skip_method(self):
+        self.assertEqual(200, self.client.simulate_post("/users").status_code)
+
+    def test_skip_responder(self):
+        self.assertEqual(200, self.client.simulate_get("/users/public").status_code)
+
+    def test_route_decisions_are_compiled_once(self):
+        self.client.simulate_get("/users/public")
+        self.client.simulate_get("/users/public")
+        self.client.simulate_get("/users")
+
+        decisions = list(self.middleware._route_decisions.values())
+        self.assertEqual(2, len(decisions))
+        self.assertIn(None, decisions)
+
+
+class Request:
+    def __init__(self, headers):
+        self.headers = {name.upper(): value for name, value in headers.items()}
+
+
+class TestAuthenticatorChain(unittest.TestCase):
+    def setUp(self):
+        self.first = BasicAuthenticator(username="first", password="Passw0rd")
+        self.second = BasicAuthenticator(username="second", password="Passw0rd")
+        self.bearer = JwtAuthenticator(client_id="CliEnTiD", oauth_domain="http://127.0.0.1:1/")
+
+    def test_fallthrough(self):
+        chain = AuthenticatorChain([self.first, self.second])
+        self.assertTrue(chain.authenticate(Request(basic("second", "Passw0rd")), None, None, None))
+
+    def test_first_error_is_raised(self):
+        chain = AuthenticatorChain([self.first, self.second])
+
+        with self.assertRaises(falcon.HTTPUnauthorized) as exception:
+            chain.authenticate(Request(basic("third", "Passw0rd")), None, None, None)
+
+        self.assertEqual(WRONG_CREDENTIALS, exception.exception.code)
+
+    def test_other_schemes_are_not_tried(self):
+        chain = AuthenticatorChain([self.bearer, self.first])
+
+        with mock.patch.object(self.bearer, 'authenticate_credentials') as authenticate_credentials:
+            self.assertTrue(chain.authenticate(Request(basic("first", "Passw0rd")), None, None, None))
+            authenticate_credentials.assert_not_called()
+
+    def test_error_of_skipped_authenticator_comes_first(self):
+        chain = AuthenticatorChain([self.bearer, self.first])
+
+        with self.assertRaises(falcon.HTTPUnauthorized) as exception:
+            chain.authenticate(Request(basic("third", "Passw0rd")), None, None, None)
+
+        self.assertEqual(UNEXPECTED_AUTHORIZATION_HEADER_TYPE, exception.exception.code)
+
+    def test_missing_header(self):
+        chain = AuthenticatorChain([self.first, self.bearer])
+
+        with self.assertRaises(falcon.HTTPUnauthorized) as exception:
+            chain.authenticate(Request({}), None, None, None)
+
+        self.assertEqual(MISSING_AUTHORIZATION_HEADER, exception.exception.code)
@@ -0,0 +1,75 @@
+import unittest
+
+import falcon
+import falcon.testing
+
+from python_falcon_authenticator.utils.route_requests_with_responder import RouterWithRequestResponder, \
+    with_request_responder
+
+
+class Resource:
+    def on_get(self, req, resp):
+        resp.media = {'responder': req.responder}
+
+    def on_get_item(self, req, resp, item_id):
+        resp.media = {'responder': req.responder}
+
+
+def create_client(router):
+    app = falcon.App(router=router)
+    app.add_route("/items", Resource())
+    app.add_route("/items/{item_id}", Resource(), suffix="item")
+    return falcon.testing.TestClient(app)
+
+
+class TestRouterWithRequestResponder(unittest.TestCase):
+    def test_responder(self):
+        client = create_client(RouterWithRequestResponder())
+
+        self.assertEqual({'responder': "on_get"}, client.simulate_get("/items").json)
+        self.assertEqual({'responder': "on_get_item"}, client.simulate_get("/items/1").json)
+
+    def test_responder_names_are_recorded_with_routes(self):
+        router = RouterWithRequestResponder()
+        router.add_route("/items", Resource())
+
+        _, method_map, _, _ = router.find("/items")
+        self.assertEqual("on_get", method_map.responder_names['GET'])
+        self.assertIn('POST', method_map.responder_names)
+
+
+class TestWithRequestResponder(unittest.TestCase):
+    def test_router_instance(self):
+        router = with_request_responder(falcon.routing.DefaultRouter())
+        client = create_client(router)
+
+        self.assertEqual({'responder': "on_get_item"}, client.simulate_get("/items/1").json)
+        # the class, and its other instances, are left untouched
+        self.assertIsInstance(router, falcon.routing.DefaultRouter)
+        self.assertIs(falcon.routing.DefaultRouter.find, falcon.routing.compiled.CompiledRouter.find)
+        self.assertEqual(falcon.routing.DefaultRouter, type(falcon.routing.DefaultRouter()))
+
+    def test_router_class(self):
+        router_class = with_request_responder(falcon.routing.DefaultRouter)
+        self.assertTrue(issubclass(router_class, falcon.routing.DefaultRouter))
+        self.assertIsNot(router_class, falcon.routing.DefaultRouter)
+
+        client = create_client(router_class())
+        self.assertEqual({'responder': "on_get"}, client.simulate_get("/items").json)
+
+    def test_router_without_map_http_methods(self):
+        class Router:
+            def __init__(self):
+                self.routes = {}
+
+            def add_route(self, uri_template, resource, **kwargs):
+                self.routes[uri_template] = resource
+
+            def find(self, uri, req=None):
+                if uri in self.routes:
+                    return self.routes[uri], {'GET': self.routes[uri].on_get}, {}, uri
+
+        app = falcon.App(router=with_request_responder(Router()))
+        app.add_route("/items", Resource())
+
+        self.assertEqual({'responder': "on_get"}, falcon.testing.TestClient(app).simulate_get("/items").json)
@@ -0,0 +1,114 @@
+import unittest
+
+import falcon
+import falcon.testing
+
+from python_falcon_authenticator import PythonFalconAuthenticator, BaseAuthenticator
+from python_falcon_authenticator.authenticators.error_codes import INSUFFICIENT_SCOPE
+from python_falcon_authenticator.claims import CLAIMS_CONTEXT_ATTR, VerifiedClaims
+from python_falcon_authenticator.decorators import resource_auth_config
+from python_falcon_authenticator.scopes import ScopeVocabulary, ScopeRequirement
+from python_falcon_authenticator.utils.route_requests_with_responder import RouterWithRequestResponder
+
+VOCABULARY = ScopeVocabulary()
+
+
+class ScopeHeaderAuthenticator(BaseAuthenticator):
+    """grant the scopes of the X-Scope header"""
+    def authenticate(self, req, resp, resource, params) -> bool:
+        setattr(req.context, CLAIMS_CONTEXT_ATTR, VerifiedClaims({'scope': req.get_header('X-Scope', default="")}))
+        return True
+
+
+@resource_auth_config(required_scopes=['users:read'], responder_scopes={'on_post': ['users:write']},
+                      scope_vocabulary=VOCABULARY)
+class UsersResource:
+    def on_get(self, req, resp):
+        resp.media = {"hello": "world"}
+
+    def on_post(self, req, resp):
+        resp.media = {"hello": "world"}
+
+
+class Context:
+    pass
+
+
+class Request:
+    def __init__(self, claims=None):
+        self.context = Context()
+        if claims is not None:
+            setattr(self.context, CLAIMS_CONTEXT_ATTR, VerifiedClaims(claims))
+
+
+class TestScopeVocabulary(unittest.TestCase):
+    def test_claims_mask(self):
+        vocabulary = ScopeVocabulary()
+        mask = vocabulary.mask(['read', 'admin', 'write'])
+
+        self.assertEqual(mask, vocabulary.claims_mask({'scope': "read write unknown", 'roles': ['admin']}))
+        self.assertEqual(vocabulary.mask(['write']), vocabulary.claims_mask({'scp': ['write'], 'groups': "bad"}))
+        self.assertEqual(0, vocabulary.claims_mask({'sub': "user"}))
+        self.assertEqual(('read', 'admin'), vocabulary.scopes(vocabulary.mask(['admin', 'read'])))
+
+    def test_scope_mask_is_converted_again_when_vocabulary_grows(self):
+        vocabulary = ScopeVocabulary()
+        ScopeRequirement(['read'], vocabulary)
+        claims = VerifiedClaims({'scope': "read write"})
+        self.assertEqual(0b1, claims.scope_mask(vocabulary))
+
+        requirement = ScopeRequirement(['write'], vocabulary)
+        self.assertEqual(0b11, claims.scope_mask(vocabulary))
+        requirement.check(Request({'scope': "read write"}))
+
+
+    def test_scope_mask_of_several_vocabularies(self):
+        first, second = ScopeVocabulary(), ScopeVocabulary()
+        first.mask(['read', 'write'])
+        second.mask(['write', 'read'])
+        claims = VerifiedClaims({'scope': "write"})
+
+        for _ in range(2):
+            self.assertEqual(0b10, claims.scope_mask(first))
+            self.assertEqual(0b01, claims.scope_mask(second))
+
+
+class TestScopeRequirement(unittest.TestCase):
+    def test_check(self):
+        requirement = ScopeRequirement(['read', 'write'], ScopeVocabulary())
+        requirement.check(Request({'scope': "write other read"}))
+
+        for request in (Request({'scope': "read"}), Request()):
+            with self.assertRaises(falcon.HTTPForbidden) as context:
+                requirement.check(request)
+            self.assertEqual(INSUFFICIENT_SCOPE, context.exception.code)
+        self.assertIn("write", context.exception.title)
+
+
+class TestResourceScopes(unittest.TestCase):
+    def setUp(self):
+        self.middleware = PythonFalconAuthenticator(ScopeHeaderAuthenticator())
+        app = falcon.App(middleware=[self.middleware], router=RouterWithRequestResponder())
+        app.add_route("/users", UsersResource())
+        self.client = falcon.testing.TestClient(app)
+
+    def test_resource_scopes(self):
+        self.assertEqual(200, self.client.simulate_get("/users", headers={'X-Scope': "users:read"}).status_code)
+
+        response = self.client.simulate_get("/users", headers={'X-Scope': "users:write"})
+        self.assertEqual(403, response.status_code)
+        self.assertEqual(INSUFFICIENT_SCOPE, response.json['code'])
+
+    def test_responder_scopes(self):
+        self.assertEqual(403, self.client.simulate_post("/users", headers={'X-Scope': "users:read"}).status_code)
+        self.assertEqual(403, self.client.simulate_post("/users", headers={'X-Scope': "users:write"}).status_code)
+        self.assertEqual(200, self.client.simulate_post("/users",
+                                                        headers={'X-Scope': "users:read users:write"}).status_code)
+
+    def test_responder_scopes_require_responder(self):
+        app = falcon.App(middleware=[self.middleware])
+        app.add_route("/users", UsersResource())
+
+        # unhandled configuration error
+        response = falcon.testing.TestClient(app).simulate_get("/users", headers={'X-Scope': "users:read"})
+        self.assertEqual(500, response.status_code)
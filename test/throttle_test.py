@@ -0,0 +1,99 @@
+import base64
+import unittest
+
+import falcon
+import falcon.testing
+
+from python_falcon_authenticator import PythonFalconAuthenticator
+from python_falcon_authenticator.authenticators.error_codes import TOO_MANY_FAILED_ATTEMPTS
+from python_falcon_authenticator.authenticators.static_basic import Authenticator as BasicAuthenticator
+from python_falcon_authenticator.throttle import FailureThrottle, basic_username
+
+
+def basic(username, password):
+    return {'Authorization': 'Basic ' + base64.b64encode(f"{username}:{password}".encode('utf8')).decode('ascii')}
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class Resource:
+    def on_get(self, req, resp):
+        resp.media = {"hello": "world"}
+
+
+class CountingAuthenticator(BasicAuthenticator):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = 0
+
+    def authenticate_credentials(self, req, resp, resource, params, credentials: str) -> bool:
+        self.calls += 1
+        return super().authenticate_credentials(req, resp, resource, params, credentials)
+
+
+class TestFailureThrottle(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.authenticator = CountingAuthenticator(username="username", password="Passw0rd")
+        self.throttle = FailureThrottle(max_failures=3, window=30, clock=self.clock)
+        app = falcon.App(middleware=[PythonFalconAuthenticator(self.authenticator, throttle=self.throttle)])
+        app.add_route("/users", Resource())
+        self.client = falcon.testing.TestClient(app)
+
+    def get(self, password, remote_addr="10.0.0.1"):
+        return self.client.simulate_get("/users", headers=basic("username", password), remote_addr=remote_addr)
+
+    def test_throttled_before_verification(self):
+        for _ in range(3):
+            self.assertEqual(401, self.get("wrong").status_code)
+
+        response = self.get("Passw0rd")
+        self.assertEqual(429, response.status_code)
+        self.assertEqual(TOO_MANY_FAILED_ATTEMPTS, response.json['code'])
+        self.assertEqual("10", response.headers['Retry-After'])
+        self.assertEqual(3, self.authenticator.calls)
+
+        # other clients aren't throttled
+        self.assertEqual(200, self.get("Passw0rd", remote_addr="10.0.0.2").status_code)
+
+    def test_attempts_are_regained_over_time(self):
+        for _ in range(3):
+            self.get("wrong")
+
+        self.clock.now += 10
+        self.assertEqual(401, self.get("wrong").status_code)
+        self.assertEqual(429, self.get("Passw0rd").status_code)
+
+        self.clock.now += 30
+        self.assertEqual(200, self.get("Passw0rd").status_code)
+
+    def test_successes_are_not_counted(self):
+        for _ in range(5):
+            self.assertEqual(200, self.get("Passw0rd").status_code)
+        self.assertEqual(0, len(self.throttle.buckets))
+
+    def test_memory_is_bounded(self):
+        throttle = FailureThrottle(max_failures=1, key=lambda req: req, max_clients=10, clock=self.clock)
+        for client in range(100):
+            throttle.record_failure(client)
+
+        self.assertEqual(10, len(throttle.buckets))
+        with self.assertRaises(falcon.HTTPTooManyRequests):
+            throttle.check(99)
+        throttle.check(0)
+
+
+class TestThrottleKeys(unittest.TestCase):
+    def test_basic_username(self):
+        class Request:
+            headers = {'AUTHORIZATION': basic("username", "Passw0rd")['Authorization']}
+
+        self.assertEqual("username", basic_username(Request()))
+        Request.headers = {'AUTHORIZATION': "Bearer token"}
+        self.assertIsNone(basic_username(Request()))